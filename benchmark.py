@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool for QGamen_DanmakuShooting
+Measures rendering performance of the game without opening a real window
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+# Run headless unless a driver was chosen explicitly
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+
+def create_benchmark_game():
+    """Create a game instance ready for gameplay benchmarks."""
+    from game import Game, GameState
+
+    game = Game()
+    game.wait_for_loading()
+
+    # Wait for first-run audio generation so it does not skew the timings
+    if game.state == GameState.AUDIO_GENERATION:
+        print("⏳ Waiting for audio generation to finish...")
+        while not game.audio_generation_complete:
+            time.sleep(0.1)
+
+    game.init_game()
+    game.change_state(GameState.PLAYING)
+    return game
+
+
+def populate_scene(game, enemy_count, bullet_count, seed=1234):
+    """Fill the game area with a deterministic set of enemies and bullets."""
+    from enemy import EnemyBullet
+
+    random.seed(seed)
+    game.enemy_manager.enemies.clear()
+    game.bullet_manager.clear_all()
+
+    for i in range(enemy_count):
+        enemy_type = random.choice(game.enemy_manager.enemy_types)
+        x = random.randint(50, game.GAME_AREA_WIDTH - 50)
+        y = random.randint(50, game.SCREEN_HEIGHT // 2)
+        game.enemy_manager.enemies.append(enemy_type(x, y, i % 3))
+
+    for _ in range(bullet_count):
+        x = random.uniform(0, game.GAME_AREA_WIDTH)
+        y = random.uniform(0, game.SCREEN_HEIGHT)
+        game.bullet_manager.add_enemy_bullet(EnemyBullet(x, y, 0, 0))
+
+    for _ in range(10):
+        game.effect_manager.add_explosion(random.uniform(0, game.GAME_AREA_WIDTH),
+                                          random.uniform(0, game.SCREEN_HEIGHT))
+
+
+def time_frames(draw, frames):
+    """Return the average time of draw() in milliseconds."""
+    # Warm up caches before measuring
+    for _ in range(10):
+        draw()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def benchmark_render(args):
+    """Compare game area rendering cost at each internal render scale."""
+    game = create_benchmark_game()
+    populate_scene(game, args.enemies, args.bullets)
+
+    print(f"🎮 Scene: {args.enemies} enemies, {args.bullets} enemy bullets, {args.frames} frames")
+    print(f"{'scale':>6} {'smooth':>7} {'resolution':>11} {'ms/frame':>9} {'speedup':>8}")
+
+    baseline = None
+    for scale in game.RENDER_SCALES:
+        for smooth in (True, False):
+            if scale >= 1.0 and not smooth:
+                continue  # No presentation step at native resolution
+
+            game.set_render_scale(scale)
+            game.smooth_scaling = smooth
+            ms = time_frames(game.draw_game, args.frames)
+            if baseline is None:
+                baseline = ms
+
+            resolution = f"{game.game_surface.get_width()}x{game.game_surface.get_height()}"
+            print(f"{scale:>6.2f} {str(smooth):>7} {resolution:>11} {ms:>9.3f} {baseline / ms:>7.2f}x")
+
+
+def draw_stacked_circles(screen, objects):
+    """Draw glows the old way: three opaque circles per object."""
+    draw_calls = 0
+    for x, y, color, radius in objects:
+        glow_color = tuple(max(0, c - 100) for c in color)
+        bright_color = tuple(min(255, c + 50) for c in color)
+        pygame.draw.circle(screen, glow_color, (x, y), int(radius * 1.5))
+        pygame.draw.circle(screen, color, (x, y), radius)
+        pygame.draw.circle(screen, bright_color, (x, y), max(1, radius // 2))
+        draw_calls += 3
+    return draw_calls
+
+
+def draw_batched_glow(screen, objects):
+    """Draw glows with the additive glow renderer: one sprite per object."""
+    from glow import glow_renderer
+
+    for x, y, color, radius in objects:
+        glow_renderer.add_circle(x, y, color, radius * 2, radius)
+    glow_renderer.flush(screen)
+    return glow_renderer.last_batch_size
+
+
+def benchmark_glow(args):
+    """Compare stacked-circle glows with the batched additive glow pass."""
+    screen = pygame.display.set_mode((1280 * 2 // 3, 720))
+
+    random.seed(1234)
+    colors = [(255, 255, 0), (255, 200, 0), (255, 100, 0), (255, 255, 255), (255, 100, 100)]
+    objects = [(random.uniform(0, 853), random.uniform(0, 720), random.choice(colors), random.randint(2, 5))
+               for _ in range(args.objects)]
+
+    print(f"✨ {args.objects} glowing objects, {args.frames} frames")
+    print(f"{'method':>16} {'draw calls':>11} {'ms/frame':>9}")
+    for name, method in (('stacked circles', draw_stacked_circles), ('batched glow', draw_batched_glow)):
+        draw_calls = method(screen, objects)
+        ms = time_frames(lambda: method(screen, objects), args.frames)
+        print(f"{name:>16} {draw_calls:>11} {ms:>9.3f}")
+
+
+def benchmark_bullets(args):
+    """Compare enemy bullet rendering cost at each level of detail tier."""
+    from bullet import BULLET_LOD_NAMES
+    from glow import glow_renderer
+
+    game = create_benchmark_game()
+    manager = game.bullet_manager
+    manager.lod_exit_ratio = 1.0  # Switch tiers right away when the thresholds move
+    manager.lod_upgrade_delay = 0
+    print(f"🔴 Enemy bullet drawing, {args.frames} frames")
+    print(f"{'bullets':>8} {'tier':>7} {'ms/frame':>9}")
+
+    for count in args.counts:
+        populate_scene(game, 0, count)
+        for lod, name in BULLET_LOD_NAMES.items():
+            # Force the tier by moving both thresholds around the bullet count
+            manager.sprite_lod_threshold = 0 if lod >= 1 else count + 1
+            manager.points_lod_threshold = 0 if lod >= 2 else count + 1
+
+            def draw():
+                game.game_surface.fill(game.BLACK)
+                manager.draw(game.game_surface)
+                glow_renderer.flush(game.game_surface)
+
+            ms = time_frames(draw, args.frames)
+            print(f"{count:>8} {name:>7} {ms:>9.3f}")
+
+
+def benchmark_bgm(args):
+    """Measure the main thread hitch of BGM changes with and without preloading."""
+    from audio_manager import audio_manager
+
+    audio_manager.start(background=False)
+    transitions = ['menu', 'game', 'game_over', 'menu', 'ranking', 'menu', 'game']
+    print(f"🎵 BGM switch time on the main thread, {args.rounds} rounds")
+    print(f"{'transition':>20} {'streamed ms':>12} {'preloaded ms':>13}")
+
+    results = {}
+    for preload in (False, True):
+        audio_manager.preload_bgm_enabled = preload
+        for _ in range(args.rounds):
+            audio_manager.stop_bgm()
+            audio_manager.bgm_sounds.clear()
+            previous = None
+            for track in transitions:
+                # The game spends at least one state's worth of frames on each track
+                audio_manager.wait_for_bgm_preload()
+                audio_manager.play_bgm(track)
+                key = f"{previous} -> {track}"
+                results.setdefault(key, {}).setdefault(preload, []).append(audio_manager.last_bgm_switch_ms)
+                previous = track
+
+    for key, timings in results.items():
+        streamed = sum(timings[False]) / len(timings[False])
+        preloaded = sum(timings[True]) / len(timings[True])
+        print(f"{key:>20} {streamed:>12.3f} {preloaded:>13.3f}")
+
+
+def benchmark_ranking(args):
+    """Measure ranking queries of the SQLite store as the score history grows."""
+    import tempfile
+    from ranking_store import SQLiteRankingStore
+
+    random.seed(1234)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SQLiteRankingStore(os.path.join(temp_dir, 'rankings.db'))
+        store.load()
+
+        print(f"🏆 SQLite ranking store, {args.queries} queries per measurement")
+        print(f"{'scores':>9} {'insert ms':>10} {'cutoff ms':>10} {'page 1 ms':>10} {'page 100 ms':>12} {'best ms':>8}")
+        for count in args.counts:
+            added = count - store.get_score_count()
+            names = [f"P{i % 5000:04d}" for i in range(added)]
+            store.add_scores((name, random.randint(0, 1000000)) for name in names)
+
+            def average_ms(query):
+                start = time.perf_counter()
+                for _ in range(args.queries):
+                    query()
+                return (time.perf_counter() - start) * 1000 / args.queries
+
+            insert_ms = average_ms(lambda: store.add_score("BENCH", random.randint(0, 1000000)))
+            cutoff_ms = average_ms(lambda: store.get_cutoff_score(10))
+            first_page_ms = average_ms(lambda: store.get_rankings(0, 10))
+            page_100_ms = average_ms(lambda: store.get_rankings(990, 10))
+            best_ms = average_ms(lambda: store.get_player_best("P1234"))
+            print(f"{count:>9} {insert_ms:>10.3f} {cutoff_ms:>10.3f} {first_page_ms:>10.3f} "
+                  f"{page_100_ms:>12.3f} {best_ms:>8.3f}")
+        store.close()
+
+
+def benchmark_ranking_save(args):
+    """Measure the main thread cost of saving a score with and without the writer thread."""
+    import tempfile
+    from ranking_store import JsonRankingStore
+
+    random.seed(1234)
+    print(f"💾 JSON ranking saves, {args.scores} scores in bursts of {args.burst}")
+    print(f"{'mode':>11} {'main ms':>8} {'max ms':>7} {'files written':>14} {'write ms':>9}")
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as temp_dir:
+        for background in (False, True):
+            store = JsonRankingStore(os.path.join(temp_dir, f"rankings_{background}.json"),
+                                     background_writes=background)
+            store.load()
+            store.flush()
+
+            timings = []
+            for i in range(args.scores):
+                start = time.perf_counter()
+                store.add_score(f"P{i:04d}", random.randint(0, 100000))
+                timings.append((time.perf_counter() - start) * 1000)
+                if (i + 1) % args.burst == 0:
+                    # Next burst a few frames later
+                    time.sleep(0.05)
+            store.flush()
+
+            name = 'background' if background else 'synchronous'
+            writes = store.writer.writes if background else args.scores
+            write_ms = store.writer.max_write_ms if background else max(timings)
+            print(f"{name:>11} {sum(timings) / len(timings):>8.3f} {max(timings):>7.3f} "
+                  f"{writes:>14} {write_ms:>9.3f}")
+            store.close()
+
+
+def journal_writer(backend, path, worker, scores, compact_every, start_event, results):
+    """Submit scores from one game instance (runs in a separate process)."""
+    from ranking_store import JsonRankingStore, JournalRankingStore
+
+    if backend == 'journal':
+        store = JournalRankingStore(path, compact_every=compact_every)
+    else:
+        store = JsonRankingStore(path, background_writes=False)
+    store.load()
+    start_event.wait()
+
+    start = time.perf_counter()
+    for i in range(scores):
+        # Unique scores, so the expected top 10 is known exactly
+        store.add_score(f"W{worker:02d}", 10000 + i * 1000 + worker)
+    results.put((time.perf_counter() - start, getattr(store, 'compactions', 0)))
+
+
+def benchmark_ranking_journal(args):
+    """Check and time concurrent score submissions from several game processes."""
+    import tempfile
+    import multiprocessing
+    from ranking_store import JsonRankingStore, JournalRankingStore
+
+    total = args.processes * args.scores
+    expected = sorted((10000 + i * 1000 + worker for worker in range(args.processes)
+                       for i in range(args.scores)), reverse=True)[:10]
+    print(f"🏁 {args.processes} processes x {args.scores} scores")
+    print(f"{'backend':>18} {'scores/s':>9} {'compactions':>12} {'journal lines':>14} {'top 10 found':>13}")
+
+    runs = (('json', 0), ('journal', total * 2), ('journal', args.compact_every))
+    for backend, compact_every in runs:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'rankings.journal' if backend == 'journal' else 'rankings.json')
+            store = (JournalRankingStore(path) if backend == 'journal'
+                     else JsonRankingStore(path, background_writes=False))
+            store.load()
+
+            start_event = multiprocessing.Event()
+            results = multiprocessing.Queue()
+            processes = [multiprocessing.Process(target=journal_writer,
+                                                 args=(backend, path, worker, args.scores, compact_every,
+                                                       start_event, results))
+                         for worker in range(args.processes)]
+            for process in processes:
+                process.start()
+            start_event.set()
+            outcomes = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+
+            # What the long-lived instance sees after catching up with the other processes
+            if backend == 'journal':
+                store.reload()
+                with open(path, 'rb') as f:
+                    lines = str(sum(1 for _ in f))
+            else:
+                store.load()
+                lines = "-"
+            found = len(set(expected) & {score for _, score in store.get_rankings(0, 10)})
+
+            elapsed = max(seconds for seconds, _ in outcomes)
+            compactions = sum(count for _, count in outcomes)
+            name = backend if backend == 'json' else f"journal/{compact_every}"
+            print(f"{name:>18} {total / elapsed:>9.0f} {compactions:>12} {lines:>14} {found:>10}/10")
+
+    print(f"   Without compaction the journal should hold {total + 10} lines (10 initial scores)")
+
+
+def main():
+    """Run the selected benchmark."""
+    parser = argparse.ArgumentParser(description="QGamen performance benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    render_parser = subparsers.add_parser('render', help="game area rendering at each render scale")
+    render_parser.add_argument('--frames', type=int, default=300)
+    render_parser.add_argument('--enemies', type=int, default=10)
+    render_parser.add_argument('--bullets', type=int, default=400)
+    render_parser.set_defaults(func=benchmark_render)
+
+    glow_parser = subparsers.add_parser('glow', help="stacked-circle glows vs the batched additive glow pass")
+    glow_parser.add_argument('--frames', type=int, default=300)
+    glow_parser.add_argument('--objects', type=int, default=600)
+    glow_parser.set_defaults(func=benchmark_glow)
+
+    bullets_parser = subparsers.add_parser('bullets', help="enemy bullet drawing at each level of detail tier")
+    bullets_parser.add_argument('--frames', type=int, default=200)
+    bullets_parser.add_argument('--counts', type=int, nargs='+', default=[200, 500, 1000, 2000])
+    bullets_parser.set_defaults(func=benchmark_bullets)
+
+    bgm_parser = subparsers.add_parser('bgm', help="BGM switch hitch with and without preloading")
+    bgm_parser.add_argument('--rounds', type=int, default=3)
+    bgm_parser.set_defaults(func=benchmark_bgm)
+
+    ranking_parser = subparsers.add_parser('ranking', help="SQLite ranking queries as the score history grows")
+    ranking_parser.add_argument('--queries', type=int, default=200)
+    ranking_parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000, 100000, 300000])
+    ranking_parser.set_defaults(func=benchmark_ranking)
+
+    save_parser = subparsers.add_parser('ranking-save', help="main thread cost of JSON ranking saves")
+    save_parser.add_argument('--scores', type=int, default=100)
+    save_parser.add_argument('--burst', type=int, default=5)
+    save_parser.add_argument('--dir', help="directory on the storage to test (default: the temp directory)")
+    save_parser.set_defaults(func=benchmark_ranking_save)
+
+    journal_parser = subparsers.add_parser('ranking-journal',
+                                           help="concurrent score submissions from several game processes")
+    journal_parser.add_argument('--processes', type=int, default=8)
+    journal_parser.add_argument('--scores', type=int, default=500)
+    journal_parser.add_argument('--compact-every', type=int, default=200)
+    journal_parser.set_defaults(func=benchmark_ranking_journal)
+
+    args = parser.parse_args()
+
+    pygame.init()
+    try:
+        args.func(args)
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Glyph atlas build step for QGamen_DanmakuShooting
+Collects the UI strings passed to render_text(), rasterizes their glyphs with
+the font the game resolves on this machine and stores the atlas in cache/
+"""
+
+import os
+import sys
+import time
+
+# Rasterizing needs no window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+# Add src directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+def main():
+    """Build the glyph atlas."""
+    pygame.font.init()
+    from font_manager import font_manager
+    from glyph_atlas import collect_ui_text
+    
+    charsets = collect_ui_text(font_manager.glyph_atlas.source_dir)
+    for size, chars in sorted(charsets.items()):
+        print(f"  {size:>3}px: {len(chars)} glyphs")
+    
+    font_manager.get_font(16)  # Resolves the default font
+    start_time = time.perf_counter()
+    font_manager.glyph_atlas.load_or_build(font_manager.default_font_path, force=True)
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    
+    sheet = font_manager.glyph_atlas.sheet
+    print(f"✅ Glyph atlas {sheet.get_width()}x{sheet.get_height()} built in {elapsed_ms:.0f} ms "
+          f"({font_manager.default_font or 'default font'})")
+    print(f"📁 {font_manager.glyph_atlas.cache_dir}")
+
+if __name__ == "__main__":
+    main()
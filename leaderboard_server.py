@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Leaderboard server for QGamen_DanmakuShooting
+A small asyncio HTTP service that stands in for the online leaderboard:
+  POST /scores      {"scores": [{"id": ..., "name": ..., "score": ...}, ...]}
+  GET  /top?limit=N {"rankings": [[name, score], ...]}
+"""
+
+import json
+import random
+import asyncio
+import argparse
+from urllib.parse import urlsplit, parse_qs
+
+class LeaderboardServer:
+    """Keeps the submitted scores in memory and serves them over HTTP/1.1 keep-alive."""
+    
+    def __init__(self, max_scores=1000, drop_rate=0.0):
+        """Initialize the leaderboard server."""
+        self.scores = []          # (name, score) pairs, best first
+        self.seen_ids = set()     # Submission ids already counted, so client retries are harmless
+        self.max_scores = max_scores
+        self.drop_rate = drop_rate  # Share of requests answered by closing the connection (retry testing)
+        self.requests = 0
+    
+    def submit(self, entries):
+        """Add submitted scores, ignoring ids seen before; returns the number added."""
+        added = 0
+        for entry in entries:
+            if entry['id'] in self.seen_ids:
+                continue
+            score = (str(entry['name'])[:10], int(entry['score']))  # Validate before marking the id as seen
+            self.seen_ids.add(entry['id'])
+            self.scores.append(score)
+            added += 1
+        
+        if added:
+            # Stable sort: ties keep submission order
+            self.scores.sort(key=lambda x: x[1], reverse=True)
+            del self.scores[self.max_scores:]
+        return added
+    
+    def route(self, method, target, body):
+        """Handle one request; returns (status line, JSON payload)."""
+        url = urlsplit(target)
+        try:
+            if method == 'POST' and url.path == '/scores':
+                added = self.submit(json.loads(body)['scores'])
+                return "200 OK", {'added': added}
+            if method == 'GET' and url.path == '/top':
+                limit = int(parse_qs(url.query).get('limit', ['10'])[0])
+                return "200 OK", {'rankings': self.scores[:max(0, min(limit, 100))]}
+        except (ValueError, KeyError, TypeError) as e:
+            return "400 Bad Request", {'error': str(e)}
+        return "404 Not Found", {'error': f"no route for {method} {url.path}"}
+    
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                
+                self.requests += 1
+                status, payload = self.route(method, target, body)
+                if random.random() < self.drop_rate:
+                    break  # Simulated network failure: applied, but the reply is lost
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write((f"HTTP/1.1 {status}\r\n"
+                              f"Content-Type: application/json\r\n"
+                              f"Content-Length: {len(data)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(args):
+    """Run the server until interrupted."""
+    leaderboard = LeaderboardServer(drop_rate=args.drop_rate)
+    server = await asyncio.start_server(leaderboard.handle_connection, args.host, args.port)
+    print(f"🌐 Leaderboard server on http://{args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Start the leaderboard server."""
+    parser = argparse.ArgumentParser(description="QGamen leaderboard server (local stand-in)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help="share of requests dropped without a reply, to exercise client retries")
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
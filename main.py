@@ -4,24 +4,58 @@ QGamen_DanmakuShooting - Main Entry Point
 A bullet hell shooting game developed with Pygame.
 """
 
+import time
+START_TIME = time.perf_counter()  # Before the heavy imports, for --startup-profile
+
 import sys
 import os
+import argparse
 import pygame
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from game import Game
+from telemetry import telemetry, startup_profiler
+from ranking import RANKING_BACKENDS
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="QGame - スペースサバイバル")
+    parser.add_argument('--render-scale', type=float, default=1.0,
+                        help="internal render resolution of the game area (e.g. 0.5, 0.75)")
+    parser.add_argument('--telemetry', metavar='PATH',
+                        help="write performance telemetry to a JSON file on exit")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print time-to-first-frame broken down by startup phase")
+    parser.add_argument('--ranking-backend', choices=RANKING_BACKENDS, default='json',
+                        help="where scores are kept: rankings.json (top 10), an SQLite database with every score, "
+                             "or a journal shared by several game instances")
+    parser.add_argument('--leaderboard-url', metavar='URL',
+                        help="also send scores to an online leaderboard (see leaderboard_server.py)")
+    return parser.parse_args()
 
 def main():
     """Main function to start the game."""
+    args = parse_args()
+    startup_profiler.begin(START_TIME)
+    startup_profiler.enabled = args.startup_profile
+    startup_profiler.mark('import pygame')
+    
     try:
-        # Initialize Pygame
-        pygame.init()
-        pygame.mixer.init()  # Initialize sound mixer
+        # Imported here so the profile separates it from pygame's own import
+        from game import Game
+        startup_profiler.mark('import game modules')
+        
+        # Initialize Pygame; the audio manager opens the mixer after the first frame
+        pygame.display.init()
+        pygame.font.init()
+        startup_profiler.mark('pygame.init')
+        
+        telemetry.output_path = args.telemetry
         
         # Create and run the game
-        game = Game()
+        game = Game(render_scale=args.render_scale, ranking_backend=args.ranking_backend,
+                    leaderboard_url=args.leaderboard_url)
         game.run()
         
     except Exception as e:
@@ -0,0 +1,69 @@
+"""
+Asset loader for QGamen_DanmakuShooting
+Runs loading jobs on a thread pool while the window shows a loading screen
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from telemetry import startup_profiler
+
+class AssetLoader:
+    """Runs named loading jobs on worker threads and tracks their progress."""
+    
+    def __init__(self, max_workers=2):
+        """Initialize the asset loader."""
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asset-loader')
+        self.futures = {}         # job name -> Future
+        self.completed = []       # Job names in the order they finished
+        self.errors = {}          # job name -> exception
+        self.lock = threading.Lock()
+        self.start_time = time.perf_counter()
+    
+    def add(self, name, function, *args):
+        """Start a loading job right away."""
+        with self.lock:
+            self.futures[name] = self.executor.submit(self._run, name, function, *args)
+    
+    def _run(self, name, function, *args):
+        """Run one job, recording its time and any failure (runs on a worker thread)."""
+        start_time = time.perf_counter()
+        try:
+            return function(*args)
+        except Exception as e:
+            print(f"⚠️ Loading {name} failed: {e}")
+            with self.lock:
+                self.errors[name] = e
+        finally:
+            startup_profiler.record_background(name, (time.perf_counter() - start_time) * 1000)
+            with self.lock:
+                self.completed.append(name)
+    
+    def get_progress(self):
+        """Get (finished jobs, total jobs, name of the last finished job)."""
+        with self.lock:
+            last = self.completed[-1] if self.completed else ""
+            return len(self.completed), len(self.futures), last
+    
+    def is_done(self):
+        """Check whether every job added so far has finished."""
+        with self.lock:
+            return len(self.completed) == len(self.futures)
+    
+    def get_result(self, name):
+        """Get the return value of a finished job, or None if it failed."""
+        future = self.futures.get(name)
+        if future is None or not future.done():
+            return None
+        return future.result()
+    
+    def wait(self, timeout=None):
+        """Block until every job added so far has finished (for benchmarks and tests)."""
+        with self.lock:
+            pending = list(self.futures.values())
+        for future in pending:
+            future.result(timeout)
+    
+    def shutdown(self):
+        """Stop the worker threads once loading is over."""
+        self.executor.shutdown(wait=False)
@@ -6,22 +6,114 @@ Generates BGM and sound effects as WAV files
 import os
 import sys
 import math
-import pygame
-import struct
+import time
+import json
+import hashlib
 import wave
+from array import array
+
+# Bump when the synthesis code changes so cached audio files are regenerated
+AUDIO_CODE_VERSION = 1
+MANIFEST_FILENAME = 'manifest.json'
+
+# Files are baked in the runtime mixer's format (see AudioManager) so SDL never converts them on load
+SAMPLE_RATE = 44100
+SAMPLE_SIZE = -16  # Signed 16-bit
+CHANNELS = 2
+AUDIO_FORMAT = {'sample_rate': SAMPLE_RATE, 'sample_size': SAMPLE_SIZE, 'channels': CHANNELS}
+
+# Layers of the in-game music, mixed live by the layered music engine
+ACTION_STEMS = ('drone', 'bass', 'rhythm', 'arpeggio')
+ACTION_LOOP_SECONDS = 4  # Common period of the beat, the vibrato and the arpeggio sweep
+
+# Audio files to generate: filename -> duration (seconds), generator method name and parameters
+BGM_SPECS = {
+    'menu_bgm.wav': {
+        'duration': 60,
+        'generator': '_generate_ambient_bgm',
+        'params': {'base_freq': 220, 'style': 'space_ambient'}
+    },
+    'game_bgm.wav': {
+        # Fallback without NumPy, only generated then; normally the stems are mixed live (see music_engine)
+        'duration': 8,
+        'generator': '_generate_action_bgm',
+        'params': {'base_freq': 440, 'style': 'battle_action'}
+    },
+    'game_over_bgm.wav': {
+        'duration': 20,
+        'generator': '_generate_dramatic_bgm',
+        'params': {'base_freq': 330, 'style': 'dramatic_defeat'}
+    },
+    'ranking_bgm.wav': {
+        'duration': 30,
+        'generator': '_generate_victory_bgm',
+        'params': {'base_freq': 550, 'style': 'triumphant_victory'}
+    }
+}
+
+SFX_SPECS = {
+    'shoot.wav': {
+        'duration': 0.2,
+        'generator': '_generate_laser_shoot',
+        'params': {'freq': 800, 'style': 'laser_pulse'}
+    },
+    'explosion.wav': {
+        'duration': 1.0,
+        'generator': '_generate_explosion',
+        'params': {'style': 'enemy_destruction'}
+    },
+    'bomb.wav': {
+        'duration': 2.0,
+        'generator': '_generate_bomb_explosion',
+        'params': {'style': 'massive_explosion'}
+    },
+    'item_collect.wav': {
+        'duration': 0.3,
+        'generator': '_generate_item_collect',
+        'params': {'freq': 1200, 'style': 'pickup_chime'}
+    },
+    'player_hit.wav': {
+        'duration': 0.8,
+        'generator': '_generate_player_hit',
+        'params': {'style': 'damage_alert'}
+    },
+    'enemy_spawn.wav': {
+        'duration': 0.5,
+        'generator': '_generate_enemy_spawn',
+        'params': {'style': 'warp_in'}
+    },
+    'menu_select.wav': {
+        'duration': 0.2,
+        'generator': '_generate_menu_select',
+        'params': {'freq': 600, 'style': 'ui_confirm'}
+    },
+    'menu_move.wav': {
+        'duration': 0.1,
+        'generator': '_generate_menu_move',
+        'params': {'freq': 400, 'style': 'ui_navigate'}
+    }
+}
 
 class AudioGenerator:
     """Generates audio files for the game."""
     
-    def __init__(self, callback=None):
-        """Initialize the audio file generator."""
-        self.sample_rate = 44100  # Higher quality for file output
+    def __init__(self, callback=None, max_workers=None, synthesis_only=False):
+        """Initialize the audio file generator.
+        
+        synthesis_only=True creates an instance that only renders samples,
+        for pool worker processes and in-memory sound effects: no
+        directories, no mixer and no log output.
+        """
+        self.sample_rate = SAMPLE_RATE  # Higher quality for file output
+        self.channels = CHANNELS
         self.assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'audio')
         self.callback = callback  # Progress callback function
+        self.generation_timings = {}  # filename -> seconds spent rendering the file
         
-        # Create assets directory structure
-        os.makedirs(os.path.join(self.assets_dir, 'bgm'), exist_ok=True)
-        os.makedirs(os.path.join(self.assets_dir, 'sfx'), exist_ok=True)
+        # Parallel generation: long tracks are split into chunks rendered on separate cores
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_seconds = 10
+        self.synthesis_block_size = 16384  # Samples synthesized at once, bounds peak memory
         
         # Try to import numpy for high-quality generation
         self.numpy_available = False
@@ -29,143 +121,257 @@ class AudioGenerator:
             import numpy as np
             self.numpy_available = True
             self.np = np
-            print("✅ NumPy available - High quality audio generation enabled")
+            if synthesis_only:
+                # Forked workers inherit the parent's RNG state; give each its own noise
+                np.random.seed()
+            else:
+                print("✅ NumPy available - High quality audio generation enabled")
         except ImportError:
-            print("⚠️ NumPy not available - Using fallback audio generation")
+            if not synthesis_only:
+                print("⚠️ NumPy not available - Using fallback audio generation")
         
-        # Initialize pygame mixer for audio processing
-        try:
-            pygame.mixer.pre_init(frequency=self.sample_rate, size=-16, channels=1, buffer=512)
-            pygame.mixer.init()
-            print("✅ Pygame mixer initialized")
-        except Exception as e:
-            print(f"⚠️ Pygame mixer initialization failed: {e}")
+        if synthesis_only:
+            return
+        
+        # Create assets directory structure
+        os.makedirs(os.path.join(self.assets_dir, 'bgm'), exist_ok=True)
+        os.makedirs(os.path.join(self.assets_dir, 'sfx'), exist_ok=True)
+        
+        # Spec hash, size and mtime of every generated file
+        self.manifest = load_audio_manifest(self.assets_dir)
     
-    def generate_all_audio(self):
-        """Generate all BGM and sound effects."""
-        total_files = 12  # 4 BGM + 8 SFX
-        current_file = 0
+    def get_generation_jobs(self, only_stale=True, include_sfx=True, include_game_bgm=True):
+        """Get the audio files to generate as (subdirectory, filename, spec)."""
+        jobs = get_audio_jobs(include_sfx, include_game_bgm)
+        if only_stale:
+            stale_files = set(get_stale_audio_files(self.assets_dir, self.manifest, include_sfx, include_game_bgm))
+            jobs = [job for job in jobs if f"{job[0]}/{job[1]}" in stale_files]
+        return jobs
+    
+    def _get_sample_window(self, duration, start, stop):
+        """Clamp a sample window to a track, returning (total frames, start, stop)."""
+        frames = int(duration * self.sample_rate)
+        if stop is None or stop > frames:
+            stop = frames
+        return frames, min(start, stop), stop
+    
+    def _split_into_chunks(self, duration):
+        """Split a track into sample windows of at most chunk_seconds."""
+        frames = int(duration * self.sample_rate)
+        chunk_frames = int(self.chunk_seconds * self.sample_rate)
+        return [(start, min(start + chunk_frames, frames)) for start in range(0, frames, chunk_frames)] or [(0, 0)]
+    
+    def generate_blocks(self, generator_name, duration, params, start=0, stop=None, channels=None):
+        """Yield a sample window of a track as interleaved 16-bit PCM blocks of synthesis_block_size frames.
+        
+        Every generator is a closed-form function of the absolute sample
+        position, so consecutive blocks join with continuous phase and peak
+        memory is bounded by the block size instead of the track length.
+        """
+        generator = getattr(self, generator_name)
+        channels = channels or self.channels
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        for block_start in range(start, stop, self.synthesis_block_size):
+            block_stop = min(block_start + self.synthesis_block_size, stop)
+            audio_bytes = self._encode_samples(generator(duration, start=block_start, stop=block_stop, **params))
+            yield self._interleave_channels(audio_bytes, channels)
+    
+    def synthesize_pcm(self, spec, channels=None):
+        """Synthesize a whole file as interleaved 16-bit PCM with the given channel count."""
+        return b''.join(self.generate_blocks(spec['generator'], spec['duration'], spec['params'], channels=channels))
+    
+    def _interleave_channels(self, audio_bytes, channels):
+        """Duplicate mono 16-bit PCM into every channel of interleaved frames."""
+        if channels == 1:
+            return audio_bytes
+        if self.numpy_available:
+            return self.np.repeat(self.np.frombuffer(audio_bytes, dtype=self.np.int16), channels).tobytes()
+        samples = array('h')
+        samples.frombytes(audio_bytes)
+        return array('h', [sample for sample in samples for _ in range(channels)]).tobytes()
+    
+    def render_chunk(self, generator_name, duration, params, start, stop):
+        """Render a sample window of a track as 16-bit PCM bytes, with its render time."""
+        start_time = time.perf_counter()
+        audio_bytes = b''.join(self.generate_blocks(generator_name, duration, params, start, stop))
+        return audio_bytes, time.perf_counter() - start_time
+    
+    def generate_all_audio(self, only_stale=True, include_sfx=True, include_game_bgm=True):
+        """Generate all missing or outdated BGM and sound effects.
+        
+        include_sfx=False skips the sound effects, for when they are
+        synthesized in memory at startup instead of loaded from disk, and
+        include_game_bgm=False skips the baked game BGM, for when the
+        layered music engine mixes it from stems.
+        """
+        jobs = self.get_generation_jobs(only_stale, include_sfx, include_game_bgm)
+        total_files = len(jobs)
+        self.files_done = 0
+        
+        if total_files == 0:
+            print("✅ All audio files are up to date")
+            if self.callback:
+                self.callback("音声ファイル生成完了！", 1, 1)
+            return True
         
         if self.callback:
             self.callback("音声ファイルを生成中...", 0, total_files)
         
         try:
-            # Generate BGM files
-            bgm_specs = {
-                'menu_bgm.wav': {
-                    'duration': 60,
-                    'generator': self._generate_ambient_bgm,
-                    'params': {'base_freq': 220, 'style': 'space_ambient'}
-                },
-                'game_bgm.wav': {
-                    'duration': 120,
-                    'generator': self._generate_action_bgm,
-                    'params': {'base_freq': 440, 'style': 'battle_action'}
-                },
-                'game_over_bgm.wav': {
-                    'duration': 20,
-                    'generator': self._generate_dramatic_bgm,
-                    'params': {'base_freq': 330, 'style': 'dramatic_defeat'}
-                },
-                'ranking_bgm.wav': {
-                    'duration': 30,
-                    'generator': self._generate_victory_bgm,
-                    'params': {'base_freq': 550, 'style': 'triumphant_victory'}
-                }
-            }
+            start_time = time.perf_counter()
             
-            for filename, spec in bgm_specs.items():
-                current_file += 1
-                if self.callback:
-                    self.callback(f"BGM生成中: {filename}", current_file, total_files)
-                
+            pool = None
+            if self.max_workers > 1:
                 try:
-                    audio_data = spec['generator'](spec['duration'], **spec['params'])
-                    filepath = os.path.join(self.assets_dir, 'bgm', filename)
-                    self._save_audio_file(audio_data, filepath)
-                    print(f"✅ Generated: {filename}")
-                except Exception as e:
-                    print(f"❌ Failed to generate {filename}: {e}")
-            
-            # Generate SFX files
-            sfx_specs = {
-                'shoot.wav': {
-                    'duration': 0.2,
-                    'generator': self._generate_laser_shoot,
-                    'params': {'freq': 800, 'style': 'laser_pulse'}
-                },
-                'explosion.wav': {
-                    'duration': 1.0,
-                    'generator': self._generate_explosion,
-                    'params': {'style': 'enemy_destruction'}
-                },
-                'bomb.wav': {
-                    'duration': 2.0,
-                    'generator': self._generate_bomb_explosion,
-                    'params': {'style': 'massive_explosion'}
-                },
-                'item_collect.wav': {
-                    'duration': 0.3,
-                    'generator': self._generate_item_collect,
-                    'params': {'freq': 1200, 'style': 'pickup_chime'}
-                },
-                'player_hit.wav': {
-                    'duration': 0.8,
-                    'generator': self._generate_player_hit,
-                    'params': {'style': 'damage_alert'}
-                },
-                'enemy_spawn.wav': {
-                    'duration': 0.5,
-                    'generator': self._generate_enemy_spawn,
-                    'params': {'style': 'warp_in'}
-                },
-                'menu_select.wav': {
-                    'duration': 0.2,
-                    'generator': self._generate_menu_select,
-                    'params': {'freq': 600, 'style': 'ui_confirm'}
-                },
-                'menu_move.wav': {
-                    'duration': 0.1,
-                    'generator': self._generate_menu_move,
-                    'params': {'freq': 400, 'style': 'ui_navigate'}
-                }
-            }
-            
-            for filename, spec in sfx_specs.items():
-                current_file += 1
-                if self.callback:
-                    self.callback(f"効果音生成中: {filename}", current_file, total_files)
-                
-                try:
-                    audio_data = spec['generator'](spec['duration'], **spec['params'])
-                    filepath = os.path.join(self.assets_dir, 'sfx', filename)
-                    self._save_audio_file(audio_data, filepath)
-                    print(f"✅ Generated: {filename}")
-                except Exception as e:
-                    print(f"❌ Failed to generate {filename}: {e}")
+                    # Imported here: multiprocessing is only needed when files are actually generated
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    
+                    # Spawn, not fork: this runs on a loader thread of a process with SDL and other
+                    # threads, whose held locks and state a forked child would inherit
+                    pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+                except (OSError, NotImplementedError, ImportError) as e:
+                    print(f"⚠️ Process pool unavailable, generating sequentially: {e}")
+            
+            if pool is not None:
+                print(f"🎵 Generating {total_files} audio files on {self.max_workers} processes")
+                with pool:
+                    self._generate_parallel(pool, jobs)
+            else:
+                self._generate_sequential(jobs)
             
+            total_time = time.perf_counter() - start_time
+            print(f"⏱️ Audio generation took {total_time:.2f}s")
             if self.callback:
-                self.callback("音声ファイル生成完了！", total_files, total_files)
+                self.callback(f"音声ファイル生成完了！ ({total_time:.1f}秒)", total_files, total_files)
             
             return True
-            
+        
         except Exception as e:
             print(f"❌ Audio generation failed: {e}")
             if self.callback:
-                self.callback(f"生成エラー: {str(e)}", current_file, total_files)
+                self.callback(f"生成エラー: {str(e)}", self.files_done, total_files)
             return False
+        
+        finally:
+            # Keep the entries of every file that did finish, even after a failure
+            save_audio_manifest(self.assets_dir, self.manifest)
+    
+    def _generate_parallel(self, pool, jobs):
+        """Render all chunks of all files on a process pool and stream them to disk in order."""
+        from concurrent.futures import as_completed
+        
+        chunk_counts = []
+        futures = {}
+        for job_index, (subdir, filename, spec) in enumerate(jobs):
+            windows = self._split_into_chunks(spec['duration'])
+            chunk_counts.append(len(windows))
+            for chunk_index, (start, stop) in enumerate(windows):
+                future = pool.submit(render_audio_chunk, spec['generator'], spec['duration'],
+                                     spec['params'], start, stop)
+                futures[future] = (job_index, chunk_index)
+        
+        # Per file: open WAV writer, next chunk index to write, chunks that arrived early
+        writers = {}
+        next_chunk = [0] * len(jobs)
+        early_chunks = [{} for _ in jobs]
+        render_times = [0.0] * len(jobs)
+        failed = set()
+        
+        for future in as_completed(futures):
+            job_index, chunk_index = futures[future]
+            subdir, filename, spec = jobs[job_index]
+            if job_index in failed:
+                continue
+            
+            try:
+                audio_bytes, render_time = future.result()
+                render_times[job_index] += render_time
+                early_chunks[job_index][chunk_index] = audio_bytes
+                
+                if job_index not in writers:
+                    writers[job_index] = self._open_wav_writer(os.path.join(self.assets_dir, subdir, filename))
+                
+                # Write every chunk that is now contiguous with what is already on disk
+                while next_chunk[job_index] in early_chunks[job_index]:
+                    writers[job_index].writeframes(early_chunks[job_index].pop(next_chunk[job_index]))
+                    next_chunk[job_index] += 1
+                
+                if next_chunk[job_index] == chunk_counts[job_index]:
+                    writers.pop(job_index).close()
+                    self._finish_file(subdir, filename, render_times[job_index], len(jobs))
+            except Exception as e:
+                print(f"❌ Failed to generate {filename}: {e}")
+                failed.add(job_index)
+                early_chunks[job_index].clear()
+                if job_index in writers:
+                    writers.pop(job_index).close()
+                self._remove_partial_file(os.path.join(self.assets_dir, subdir, filename))
+                self._report_file_done(subdir, filename, None, len(jobs))
+    
+    def _generate_sequential(self, jobs):
+        """Render every file in this process, streaming each block to disk as it is rendered."""
+        for subdir, filename, spec in jobs:
+            try:
+                start_time = time.perf_counter()
+                with self._open_wav_writer(os.path.join(self.assets_dir, subdir, filename)) as wav_file:
+                    for block in self.generate_blocks(spec['generator'], spec['duration'], spec['params']):
+                        wav_file.writeframes(block)
+                render_time = time.perf_counter() - start_time
+            except Exception as e:
+                print(f"❌ Failed to generate {filename}: {e}")
+                self._remove_partial_file(os.path.join(self.assets_dir, subdir, filename))
+                self._report_file_done(subdir, filename, None, len(jobs))
+                continue
+            
+            self._finish_file(subdir, filename, render_time, len(jobs))
+    
+    def _remove_partial_file(self, filepath):
+        """Delete a partially written file so it is regenerated on the next launch."""
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
+    
+    def _finish_file(self, subdir, filename, render_time, total_files):
+        """Record a completed file in the manifest and report progress."""
+        spec = (BGM_SPECS if subdir == 'bgm' else SFX_SPECS)[filename]
+        stat = os.stat(os.path.join(self.assets_dir, subdir, filename))
+        self.manifest[f"{subdir}/{filename}"] = {
+            'spec_hash': get_spec_hash(spec),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        }
+        self.generation_timings[filename] = render_time
+        print(f"✅ Generated: {filename} ({render_time:.2f}s)")
+        self._report_file_done(subdir, filename, render_time, total_files)
     
-    def _generate_ambient_bgm(self, duration, base_freq, style):
+    def _report_file_done(self, subdir, filename, render_time, total_files):
+        """Send a progress update for a finished (or failed) file."""
+        self.files_done += 1
+        if render_time is None:
+            self.manifest.pop(f"{subdir}/{filename}", None)
+        if not self.callback:
+            return
+        
+        kind = "BGM" if subdir == 'bgm' else "効果音"
+        if render_time is None:
+            self.callback(f"{kind}生成失敗: {filename}", self.files_done, total_files)
+        else:
+            self.callback(f"{kind}生成完了: {filename} ({render_time:.2f}秒)", self.files_done, total_files)
+    
+    def _generate_ambient_bgm(self, duration, base_freq, style, start=0, stop=None):
         """Generate ambient space BGM."""
         if self.numpy_available:
-            return self._generate_ambient_bgm_numpy(duration, base_freq)
+            return self._generate_ambient_bgm_numpy(duration, base_freq, start, stop)
         else:
-            return self._generate_ambient_bgm_simple(duration, base_freq)
+            return self._generate_ambient_bgm_simple(duration, base_freq, start, stop)
     
-    def _generate_ambient_bgm_numpy(self, duration, base_freq):
+    def _generate_ambient_bgm_numpy(self, duration, base_freq, start=0, stop=None):
         """Generate ambient BGM using numpy."""
-        frames = int(duration * self.sample_rate)
-        t = self.np.linspace(0, duration, frames)
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
         
         # Base drone with slow modulation
         drone1 = self.np.sin(2 * self.np.pi * base_freq * t) * 0.3
@@ -180,19 +386,19 @@ class AudioGenerator:
         # Combine and apply envelope
         combined = (drone1 + drone2) * lfo + sparkle
         
-        # Apply fade in/out
+        # Apply fade in/out (position-based so any window of the track can be rendered)
         fade_samples = int(0.5 * self.sample_rate)
-        combined[:fade_samples] *= self.np.linspace(0, 1, fade_samples)
-        combined[-fade_samples:] *= self.np.linspace(1, 0, fade_samples)
+        i = self.np.arange(start, stop)
+        combined *= self.np.clip(self.np.minimum(i, frames - i) / fade_samples, 0, 1)
         
         return combined * 0.6
     
-    def _generate_ambient_bgm_simple(self, duration, base_freq):
+    def _generate_ambient_bgm_simple(self, duration, base_freq, start=0, stop=None):
         """Generate ambient BGM using simple math."""
-        frames = int(duration * self.sample_rate)
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Base drone
@@ -218,69 +424,114 @@ class AudioGenerator:
         
         return audio_data
     
-    def _generate_action_bgm(self, duration, base_freq, style):
-        """Generate action battle BGM."""
+    def _generate_action_bgm(self, duration, base_freq, style, start=0, stop=None):
+        """Generate action battle BGM as the full mix of the action stems."""
         if self.numpy_available:
-            return self._generate_action_bgm_numpy(duration, base_freq)
+            return self._generate_action_bgm_numpy(duration, base_freq, start, stop)
         else:
-            return self._generate_action_bgm_simple(duration, base_freq)
+            return self._generate_action_bgm_simple(duration, base_freq, start, stop)
     
-    def _generate_action_bgm_numpy(self, duration, base_freq):
+    def _generate_action_bgm_numpy(self, duration, base_freq, start=0, stop=None):
         """Generate action BGM using numpy."""
-        frames = int(duration * self.sample_rate)
-        t = self.np.linspace(0, duration, frames)
+        combined = sum(self._generate_action_stem_numpy(duration, base_freq, stem, start, stop)
+                       for stem in ACTION_STEMS)
+        return combined * 0.7
+    
+    def _generate_action_stem_numpy(self, duration, base_freq, stem, start=0, stop=None):
+        """Generate one layer of the action BGM using numpy.
+        
+        Every component repeats exactly every ACTION_LOOP_SECONDS, so a
+        stem rendered for that long loops without a click.
+        """
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
         
         # Rhythmic pattern (4/4 beat at 120 BPM)
         beat_freq = 2.0  # 2 Hz = 120 BPM
-        rhythm = self.np.sin(2 * self.np.pi * beat_freq * t)
-        rhythm = self.np.where(rhythm > 0, 1, 0.3)
-        
-        # Main melody line
-        melody_freq = base_freq * (1 + 0.1 * self.np.sin(2 * self.np.pi * 0.25 * t))
-        melody = self.np.sin(2 * self.np.pi * melody_freq * t) * 0.4
-        
-        # Bass line
-        bass_freq = base_freq * 0.5
-        bass = self.np.sin(2 * self.np.pi * bass_freq * t) * 0.3
-        
-        # High frequency arpeggios
-        arp_freq = base_freq * 2 * (1 + 0.2 * self.np.sin(2 * self.np.pi * 4 * t))
-        arpeggio = self.np.sin(2 * self.np.pi * arp_freq * t) * 0.15
-        
-        # Combine with rhythm
-        combined = (melody + bass + arpeggio) * rhythm
-        
-        return combined * 0.7
+        rhythm = self.np.where(self.np.sin(2 * self.np.pi * beat_freq * t) > 0, 1, 0.3)
+        
+        if stem == 'drone':
+            # Main melody line, vibrato integrated into the phase so it stays periodic
+            phase = base_freq * (t - 0.1 / (2 * self.np.pi * 0.25) * self.np.cos(2 * self.np.pi * 0.25 * t))
+            return self.np.sin(2 * self.np.pi * phase) * 0.4
+        elif stem == 'bass':
+            # Bass line pulsing with the beat
+            return self.np.sin(2 * self.np.pi * base_freq * 0.5 * t) * 0.3 * rhythm
+        elif stem == 'rhythm':
+            # Kick drum on every beat
+            beat_t = t % (1.0 / beat_freq)
+            return self.np.sin(2 * self.np.pi * 55 * beat_t) * self.np.exp(-beat_t * 20) * 0.5
+        elif stem == 'arpeggio':
+            # High frequency arpeggios
+            phase = base_freq * 2 * (t - 0.2 / (2 * self.np.pi * 4) * self.np.cos(2 * self.np.pi * 4 * t))
+            return self.np.sin(2 * self.np.pi * phase) * 0.15 * rhythm
+        raise ValueError(f"Unknown action stem: {stem}")
     
-    def _generate_action_bgm_simple(self, duration, base_freq):
+    def _generate_action_bgm_simple(self, duration, base_freq, start=0, stop=None):
         """Generate action BGM using simple math."""
-        frames = int(duration * self.sample_rate)
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Rhythmic pattern
             rhythm = 1 if math.sin(2 * math.pi * 2 * t) > 0 else 0.3
             
             # Main melody
-            melody = math.sin(2 * math.pi * base_freq * t) * 0.4
+            phase = base_freq * (t - 0.1 / (2 * math.pi * 0.25) * math.cos(2 * math.pi * 0.25 * t))
+            drone = math.sin(2 * math.pi * phase) * 0.4
             
             # Bass line
-            bass = math.sin(2 * math.pi * base_freq * 0.5 * t) * 0.3
+            bass = math.sin(2 * math.pi * base_freq * 0.5 * t) * 0.3 * rhythm
+            
+            # Kick drum
+            beat_t = t % 0.5
+            kick = math.sin(2 * math.pi * 55 * beat_t) * math.exp(-beat_t * 20) * 0.5
+            
+            # Arpeggios
+            phase = base_freq * 2 * (t - 0.2 / (2 * math.pi * 4) * math.cos(2 * math.pi * 4 * t))
+            arpeggio = math.sin(2 * math.pi * phase) * 0.15 * rhythm
             
             # Combine
-            sample = (melody + bass) * rhythm * 0.7
+            sample = (drone + bass + kick + arpeggio) * 0.7
             audio_data.append(sample)
         
         return audio_data
     
-    def _generate_dramatic_bgm(self, duration, base_freq, style):
+    def _generate_dramatic_bgm(self, duration, base_freq, style, start=0, stop=None):
         """Generate dramatic game over BGM."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_dramatic_bgm_numpy(duration, base_freq, start, stop)
+        else:
+            return self._generate_dramatic_bgm_simple(duration, base_freq, start, stop)
+    
+    def _generate_dramatic_bgm_numpy(self, duration, base_freq, start=0, stop=None):
+        """Generate dramatic BGM using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        progress = t / duration
+        
+        # Descending chord progression
+        freq1 = base_freq * (1 - progress * 0.4)
+        freq2 = base_freq * 0.75 * (1 - progress * 0.3)
+        freq3 = base_freq * 0.6 * (1 - progress * 0.2)
+        
+        chord1 = self.np.sin(2 * self.np.pi * freq1 * t) * 0.3
+        chord2 = self.np.sin(2 * self.np.pi * freq2 * t) * 0.25
+        chord3 = self.np.sin(2 * self.np.pi * freq3 * t) * 0.2
+        
+        # Dramatic fade out
+        fade = (1 - progress) ** 2
+        
+        return (chord1 + chord2 + chord3) * fade * 0.8
+    
+    def _generate_dramatic_bgm_simple(self, duration, base_freq, start=0, stop=None):
+        """Generate dramatic BGM using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             progress = t / duration
             
@@ -301,12 +552,39 @@ class AudioGenerator:
         
         return audio_data
     
-    def _generate_victory_bgm(self, duration, base_freq, style):
+    def _generate_victory_bgm(self, duration, base_freq, style, start=0, stop=None):
         """Generate victory ranking BGM."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_victory_bgm_numpy(duration, base_freq, start, stop)
+        else:
+            return self._generate_victory_bgm_simple(duration, base_freq, start, stop)
+    
+    def _generate_victory_bgm_numpy(self, duration, base_freq, start=0, stop=None):
+        """Generate victory BGM using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        progress = t / duration
+        
+        # Ascending triumphant melody
+        melody_freq = base_freq * (1 + progress * 0.5)
+        melody = self.np.sin(2 * self.np.pi * melody_freq * t) * 0.4
+        
+        # Harmony
+        harmony_freq = base_freq * 1.25 * (1 + progress * 0.3)
+        harmony = self.np.sin(2 * self.np.pi * harmony_freq * t) * 0.3
+        
+        # Triumphant brass-like sound
+        brass_freq = base_freq * 2
+        brass = self.np.sin(2 * self.np.pi * brass_freq * t) * 0.2 * (1 + self.np.sin(2 * self.np.pi * 8 * t) * 0.1)
+        
+        return (melody + harmony + brass) * 0.7
+    
+    def _generate_victory_bgm_simple(self, duration, base_freq, start=0, stop=None):
+        """Generate victory BGM using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             progress = t / duration
             
@@ -327,12 +605,36 @@ class AudioGenerator:
         
         return audio_data
     
-    def _generate_laser_shoot(self, duration, freq, style):
+    def _generate_laser_shoot(self, duration, freq, style, start=0, stop=None):
         """Generate laser shooting sound."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_laser_shoot_numpy(duration, freq, start, stop)
+        else:
+            return self._generate_laser_shoot_simple(duration, freq, start, stop)
+    
+    def _generate_laser_shoot_numpy(self, duration, freq, start=0, stop=None):
+        """Generate laser shooting sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        
+        # Laser sweep effect
+        sweep_freq = freq * (1 - t / duration * 0.3)
+        laser = self.np.sin(2 * self.np.pi * sweep_freq * t)
+        
+        # Add harmonics for richness
+        harmonic = self.np.sin(2 * self.np.pi * sweep_freq * 2 * t) * 0.3
+        
+        # Sharp attack, quick decay
+        envelope = self.np.exp(-t * 8)
+        
+        return (laser + harmonic) * envelope * 0.6
+    
+    def _generate_laser_shoot_simple(self, duration, freq, start=0, stop=None):
+        """Generate laser shooting sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Laser sweep effect
@@ -350,14 +652,41 @@ class AudioGenerator:
         
         return audio_data
     
-    def _generate_explosion(self, duration, style):
+    def _generate_explosion(self, duration, style, start=0, stop=None):
         """Generate explosion sound."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_explosion_numpy(duration, start, stop)
+        else:
+            return self._generate_explosion_simple(duration, start, stop)
+    
+    def _generate_explosion_numpy(self, duration, start=0, stop=None):
+        """Generate explosion sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        
+        # Noise burst
+        noise = (self.np.random.random(len(t)) - 0.5) * 2
+        
+        # Low frequency rumble
+        rumble = self.np.sin(2 * self.np.pi * 60 * t) * 0.5
+        
+        # Mid frequency crack
+        crack_freq = 200 * (1 - t / duration * 0.8)
+        crack = self.np.sin(2 * self.np.pi * crack_freq * t) * 0.3
+        
+        # Explosion envelope
+        envelope = self.np.exp(-t * 3) * (1 + self.np.exp(-t * 20) * 2)
+        
+        return (noise * 0.3 + rumble + crack) * envelope * 0.5
+    
+    def _generate_explosion_simple(self, duration, start=0, stop=None):
+        """Generate explosion sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
         import random
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Noise burst
@@ -378,525 +707,46 @@ class AudioGenerator:
         
         return audio_data
     
-    def _generate_bomb_explosion(self, duration, style):
+    def _generate_bomb_explosion(self, duration, style, start=0, stop=None):
         """Generate massive bomb explosion sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        import random
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Deep rumble
-            rumble = math.sin(2 * math.pi * 40 * t) * 0.6
-            
-            # Noise burst
-            noise = (random.random() - 0.5) * 2 * 0.4
-            
-            # Shockwave effect
-            shockwave = math.sin(2 * math.pi * 80 * t * (1 - t / duration)) * 0.4
-            
-            # Long decay envelope
-            envelope = math.exp(-t * 1.5) * (1 + math.exp(-t * 10) * 3)
-            
-            sample = (rumble + noise + shockwave) * envelope * 0.7
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _generate_item_collect(self, duration, freq, style):
-        """Generate item collection sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Rising chime
-            chime_freq = freq * (1 + t / duration * 0.5)
-            chime = math.sin(2 * math.pi * chime_freq * t)
-            
-            # Bell-like harmonics
-            harmonic1 = math.sin(2 * math.pi * chime_freq * 2 * t) * 0.3
-            harmonic2 = math.sin(2 * math.pi * chime_freq * 3 * t) * 0.1
-            
-            # Pleasant decay
-            envelope = math.exp(-t * 4)
-            
-            sample = (chime + harmonic1 + harmonic2) * envelope * 0.5
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _generate_player_hit(self, duration, style):
-        """Generate player hit/damage sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Alarm-like sound
-            alarm_freq = 800 * (1 + 0.2 * math.sin(2 * math.pi * 10 * t))
-            alarm = math.sin(2 * math.pi * alarm_freq * t)
-            
-            # Distortion effect
-            distortion = math.sin(2 * math.pi * 200 * t) * 0.3
-            
-            # Warning envelope
-            envelope = math.exp(-t * 2) * (1 + math.sin(2 * math.pi * 5 * t) * 0.3)
-            
-            sample = (alarm + distortion) * envelope * 0.6
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _generate_enemy_spawn(self, duration, style):
-        """Generate enemy spawn/warp sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Warp effect
-            warp_freq = 400 * (1 + t / duration * 2)
-            warp = math.sin(2 * math.pi * warp_freq * t)
-            
-            # Modulation
-            mod = math.sin(2 * math.pi * 20 * t) * 0.2 + 1
-            
-            # Build-up envelope
-            envelope = t / duration * math.exp(-t * 2)
-            
-            sample = warp * mod * envelope * 0.4
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _generate_menu_select(self, duration, freq, style):
-        """Generate menu selection sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Clean beep
-            beep = math.sin(2 * math.pi * freq * t)
-            
-            # Quick envelope
-            envelope = math.exp(-t * 10)
-            
-            sample = beep * envelope * 0.4
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _generate_menu_move(self, duration, freq, style):
-        """Generate menu navigation sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Soft click
-            click = math.sin(2 * math.pi * freq * t)
-            
-            # Very quick envelope
-            envelope = math.exp(-t * 20)
-            
-            sample = click * envelope * 0.3
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _save_audio_file(self, audio_data, filepath):
-        """Save audio data to WAV file using built-in wave module."""
-        try:
-            # Normalize and convert audio data
-            if self.numpy_available and hasattr(audio_data, 'dtype'):
-                # NumPy array
-                audio_data = self.np.clip(audio_data, -1, 1)
-                audio_int16 = (audio_data * 32767).astype(self.np.int16)
-                audio_bytes = audio_int16.tobytes()
-            else:
-                # Python list
-                audio_bytes = b''
-                for sample in audio_data:
-                    # Clamp sample to [-1, 1]
-                    sample = max(-1, min(1, sample))
-                    # Convert to 16-bit integer
-                    int_sample = int(sample * 32767)
-                    # Pack as little-endian 16-bit signed integer
-                    audio_bytes += struct.pack('<h', int_sample)
-            
-            # Write WAV file
-            with wave.open(filepath, 'wb') as wav_file:
-                wav_file.setnchannels(1)  # Mono
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(self.sample_rate)
-                wav_file.writeframes(audio_bytes)
-            
-            print(f"    ✅ Saved: {os.path.basename(filepath)}")
-            
-        except Exception as e:
-            print(f"    ❌ Failed to save {os.path.basename(filepath)}: {e}")
-            raise
-
-def check_audio_files_exist():
-    """Check if all required audio files exist."""
-    assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'audio')
-    
-    required_files = [
-        'bgm/menu_bgm.wav',
-        'bgm/game_bgm.wav', 
-        'bgm/game_over_bgm.wav',
-        'bgm/ranking_bgm.wav',
-        'sfx/shoot.wav',
-        'sfx/explosion.wav',
-        'sfx/bomb.wav',
-        'sfx/item_collect.wav',
-        'sfx/player_hit.wav',
-        'sfx/enemy_spawn.wav',
-        'sfx/menu_select.wav',
-        'sfx/menu_move.wav'
-    ]
-    
-    missing_files = []
-    for file_path in required_files:
-        full_path = os.path.join(assets_dir, file_path)
-        if not os.path.exists(full_path):
-            missing_files.append(file_path)
-    
-    return len(missing_files) == 0, missing_files
-    
-    def generate_all_audio(self):
-        """Generate all BGM and sound effects."""
-        total_files = 12  # 4 BGM + 8 SFX
-        current_file = 0
-        
-        if self.callback:
-            self.callback("音声ファイルを生成中...", 0, total_files)
-        
-        # Generate BGM files
-        bgm_specs = {
-            'menu_bgm.wav': {
-                'duration': 60,
-                'generator': self._generate_ambient_bgm,
-                'params': {'base_freq': 220, 'style': 'space_ambient'}
-            },
-            'game_bgm.wav': {
-                'duration': 120,
-                'generator': self._generate_action_bgm,
-                'params': {'base_freq': 440, 'style': 'battle_action'}
-            },
-            'game_over_bgm.wav': {
-                'duration': 20,
-                'generator': self._generate_dramatic_bgm,
-                'params': {'base_freq': 330, 'style': 'dramatic_defeat'}
-            },
-            'ranking_bgm.wav': {
-                'duration': 30,
-                'generator': self._generate_victory_bgm,
-                'params': {'base_freq': 550, 'style': 'triumphant_victory'}
-            }
-        }
-        
-        for filename, spec in bgm_specs.items():
-            current_file += 1
-            if self.callback:
-                self.callback(f"BGM生成中: {filename}", current_file, total_files)
-            
-            audio_data = spec['generator'](spec['duration'], **spec['params'])
-            filepath = os.path.join(self.assets_dir, 'bgm', filename)
-            self._save_audio_file(audio_data, filepath)
-        
-        # Generate SFX files
-        sfx_specs = {
-            'shoot.wav': {
-                'duration': 0.2,
-                'generator': self._generate_laser_shoot,
-                'params': {'freq': 800, 'style': 'laser_pulse'}
-            },
-            'explosion.wav': {
-                'duration': 1.0,
-                'generator': self._generate_explosion,
-                'params': {'style': 'enemy_destruction'}
-            },
-            'bomb.wav': {
-                'duration': 2.0,
-                'generator': self._generate_bomb_explosion,
-                'params': {'style': 'massive_explosion'}
-            },
-            'item_collect.wav': {
-                'duration': 0.3,
-                'generator': self._generate_item_collect,
-                'params': {'freq': 1200, 'style': 'pickup_chime'}
-            },
-            'player_hit.wav': {
-                'duration': 0.8,
-                'generator': self._generate_player_hit,
-                'params': {'style': 'damage_alert'}
-            },
-            'enemy_spawn.wav': {
-                'duration': 0.5,
-                'generator': self._generate_enemy_spawn,
-                'params': {'style': 'warp_in'}
-            },
-            'menu_select.wav': {
-                'duration': 0.2,
-                'generator': self._generate_menu_select,
-                'params': {'freq': 600, 'style': 'ui_confirm'}
-            },
-            'menu_move.wav': {
-                'duration': 0.1,
-                'generator': self._generate_menu_move,
-                'params': {'freq': 400, 'style': 'ui_navigate'}
-            }
-        }
-        
-        for filename, spec in sfx_specs.items():
-            current_file += 1
-            if self.callback:
-                self.callback(f"効果音生成中: {filename}", current_file, total_files)
-            
-            audio_data = spec['generator'](spec['duration'], **spec['params'])
-            filepath = os.path.join(self.assets_dir, 'sfx', filename)
-            self._save_audio_file(audio_data, filepath)
-        
-        if self.callback:
-            self.callback("音声ファイル生成完了！", total_files, total_files)
-        
-        return True
-    
-    def _generate_ambient_bgm(self, duration, base_freq, style):
-        """Generate ambient space BGM."""
-        if self.numpy_available:
-            return self._generate_ambient_bgm_numpy(duration, base_freq)
-        else:
-            return self._generate_ambient_bgm_simple(duration, base_freq)
-    
-    def _generate_ambient_bgm_numpy(self, duration, base_freq):
-        """Generate ambient BGM using numpy."""
-        frames = int(duration * self.sample_rate)
-        t = self.np.linspace(0, duration, frames)
-        
-        # Base drone with slow modulation
-        drone1 = self.np.sin(2 * self.np.pi * base_freq * t) * 0.3
-        drone2 = self.np.sin(2 * self.np.pi * base_freq * 1.5 * t) * 0.2
-        
-        # Slow LFO modulation
-        lfo = self.np.sin(2 * self.np.pi * 0.05 * t) * 0.1 + 1
-        
-        # Ethereal high frequencies
-        sparkle = self.np.sin(2 * self.np.pi * base_freq * 4 * t) * 0.05 * self.np.sin(2 * self.np.pi * 0.2 * t)
-        
-        # Combine and apply envelope
-        combined = (drone1 + drone2) * lfo + sparkle
-        
-        # Apply fade in/out
-        fade_samples = int(0.5 * self.sample_rate)
-        combined[:fade_samples] *= self.np.linspace(0, 1, fade_samples)
-        combined[-fade_samples:] *= self.np.linspace(1, 0, fade_samples)
-        
-        return combined * 0.6
-    
-    def _generate_ambient_bgm_simple(self, duration, base_freq):
-        """Generate ambient BGM using simple math."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Base drone
-            drone1 = math.sin(2 * math.pi * base_freq * t) * 0.3
-            drone2 = math.sin(2 * math.pi * base_freq * 1.5 * t) * 0.2
-            
-            # Slow modulation
-            lfo = math.sin(2 * math.pi * 0.05 * t) * 0.1 + 1
-            
-            # Combine
-            sample = (drone1 + drone2) * lfo * 0.6
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _generate_action_bgm(self, duration, base_freq, style):
-        """Generate action battle BGM."""
         if self.numpy_available:
-            return self._generate_action_bgm_numpy(duration, base_freq)
+            return self._generate_bomb_explosion_numpy(duration, start, stop)
         else:
-            return self._generate_action_bgm_simple(duration, base_freq)
-    
-    def _generate_action_bgm_numpy(self, duration, base_freq):
-        """Generate action BGM using numpy."""
-        frames = int(duration * self.sample_rate)
-        t = self.np.linspace(0, duration, frames)
-        
-        # Rhythmic pattern (4/4 beat at 120 BPM)
-        beat_freq = 2.0  # 2 Hz = 120 BPM
-        rhythm = self.np.sin(2 * self.np.pi * beat_freq * t)
-        rhythm = self.np.where(rhythm > 0, 1, 0.3)
-        
-        # Main melody line
-        melody_freq = base_freq * (1 + 0.1 * self.np.sin(2 * self.np.pi * 0.25 * t))
-        melody = self.np.sin(2 * self.np.pi * melody_freq * t) * 0.4
-        
-        # Bass line
-        bass_freq = base_freq * 0.5
-        bass = self.np.sin(2 * self.np.pi * bass_freq * t) * 0.3
-        
-        # High frequency arpeggios
-        arp_freq = base_freq * 2 * (1 + 0.2 * self.np.sin(2 * self.np.pi * 4 * t))
-        arpeggio = self.np.sin(2 * self.np.pi * arp_freq * t) * 0.15
-        
-        # Combine with rhythm
-        combined = (melody + bass + arpeggio) * rhythm
-        
-        return combined * 0.7
-    
-    def _generate_action_bgm_simple(self, duration, base_freq):
-        """Generate action BGM using simple math."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Rhythmic pattern
-            rhythm = 1 if math.sin(2 * math.pi * 2 * t) > 0 else 0.3
-            
-            # Main melody
-            melody = math.sin(2 * math.pi * base_freq * t) * 0.4
-            
-            # Bass line
-            bass = math.sin(2 * math.pi * base_freq * 0.5 * t) * 0.3
-            
-            # Combine
-            sample = (melody + bass) * rhythm * 0.7
-            audio_data.append(sample)
-        
-        return audio_data
+            return self._generate_bomb_explosion_simple(duration, start, stop)
     
-    def _generate_dramatic_bgm(self, duration, base_freq, style):
-        """Generate dramatic game over BGM."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
-        
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            progress = t / duration
-            
-            # Descending chord progression
-            freq1 = base_freq * (1 - progress * 0.4)
-            freq2 = base_freq * 0.75 * (1 - progress * 0.3)
-            freq3 = base_freq * 0.6 * (1 - progress * 0.2)
-            
-            chord1 = math.sin(2 * math.pi * freq1 * t) * 0.3
-            chord2 = math.sin(2 * math.pi * freq2 * t) * 0.25
-            chord3 = math.sin(2 * math.pi * freq3 * t) * 0.2
-            
-            # Dramatic fade out
-            fade = (1 - progress) ** 2
-            
-            sample = (chord1 + chord2 + chord3) * fade * 0.8
-            audio_data.append(sample)
+    def _generate_bomb_explosion_numpy(self, duration, start=0, stop=None):
+        """Generate bomb explosion sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
         
-        return audio_data
-    
-    def _generate_victory_bgm(self, duration, base_freq, style):
-        """Generate victory ranking BGM."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
+        # Deep rumble
+        rumble = self.np.sin(2 * self.np.pi * 40 * t) * 0.6
         
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            progress = t / duration
-            
-            # Ascending triumphant melody
-            melody_freq = base_freq * (1 + progress * 0.5)
-            melody = math.sin(2 * math.pi * melody_freq * t) * 0.4
-            
-            # Harmony
-            harmony_freq = base_freq * 1.25 * (1 + progress * 0.3)
-            harmony = math.sin(2 * math.pi * harmony_freq * t) * 0.3
-            
-            # Triumphant brass-like sound
-            brass_freq = base_freq * 2
-            brass = math.sin(2 * math.pi * brass_freq * t) * 0.2 * (1 + math.sin(2 * math.pi * 8 * t) * 0.1)
-            
-            sample = (melody + harmony + brass) * 0.7
-            audio_data.append(sample)
+        # Noise burst
+        noise = (self.np.random.random(len(t)) - 0.5) * 2 * 0.4
         
-        return audio_data
-    
-    def _generate_laser_shoot(self, duration, freq, style):
-        """Generate laser shooting sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
+        # Shockwave effect
+        shockwave = self.np.sin(2 * self.np.pi * 80 * t * (1 - t / duration)) * 0.4
         
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Laser sweep effect
-            sweep_freq = freq * (1 - t / duration * 0.3)
-            laser = math.sin(2 * math.pi * sweep_freq * t)
-            
-            # Add harmonics for richness
-            harmonic = math.sin(2 * math.pi * sweep_freq * 2 * t) * 0.3
-            
-            # Sharp attack, quick decay
-            envelope = math.exp(-t * 8)
-            
-            sample = (laser + harmonic) * envelope * 0.6
-            audio_data.append(sample)
+        # Long decay envelope
+        envelope = self.np.exp(-t * 1.5) * (1 + self.np.exp(-t * 10) * 3)
         
-        return audio_data
+        return (rumble + noise + shockwave) * envelope * 0.7
     
-    def _generate_explosion(self, duration, style):
-        """Generate explosion sound."""
-        frames = int(duration * self.sample_rate)
+    def _generate_bomb_explosion_simple(self, duration, start=0, stop=None):
+        """Generate bomb explosion sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
-            t = float(i) / self.sample_rate
-            
-            # Noise burst (simplified)
-            import random
-            noise = (random.random() - 0.5) * 2
-            
-            # Low frequency rumble
-            rumble = math.sin(2 * math.pi * 60 * t) * 0.5
-            
-            # Mid frequency crack
-            crack_freq = 200 * (1 - t / duration * 0.8)
-            crack = math.sin(2 * math.pi * crack_freq * t) * 0.3
-            
-            # Explosion envelope
-            envelope = math.exp(-t * 3) * (1 + math.exp(-t * 20) * 2)
-            
-            sample = (noise * 0.3 + rumble + crack) * envelope * 0.5
-            audio_data.append(sample)
-        
-        return audio_data
-    
-    def _generate_bomb_explosion(self, duration, style):
-        """Generate massive bomb explosion sound."""
-        frames = int(duration * self.sample_rate)
-        audio_data = []
+        import random
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Deep rumble
             rumble = math.sin(2 * math.pi * 40 * t) * 0.6
             
             # Noise burst
-            import random
             noise = (random.random() - 0.5) * 2 * 0.4
             
             # Shockwave effect
@@ -910,12 +760,37 @@ def check_audio_files_exist():
         
         return audio_data
     
-    def _generate_item_collect(self, duration, freq, style):
+    def _generate_item_collect(self, duration, freq, style, start=0, stop=None):
         """Generate item collection sound."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_item_collect_numpy(duration, freq, start, stop)
+        else:
+            return self._generate_item_collect_simple(duration, freq, start, stop)
+    
+    def _generate_item_collect_numpy(self, duration, freq, start=0, stop=None):
+        """Generate item collection sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        
+        # Rising chime
+        chime_freq = freq * (1 + t / duration * 0.5)
+        chime = self.np.sin(2 * self.np.pi * chime_freq * t)
+        
+        # Bell-like harmonics
+        harmonic1 = self.np.sin(2 * self.np.pi * chime_freq * 2 * t) * 0.3
+        harmonic2 = self.np.sin(2 * self.np.pi * chime_freq * 3 * t) * 0.1
+        
+        # Pleasant decay
+        envelope = self.np.exp(-t * 4)
+        
+        return (chime + harmonic1 + harmonic2) * envelope * 0.5
+    
+    def _generate_item_collect_simple(self, duration, freq, start=0, stop=None):
+        """Generate item collection sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Rising chime
@@ -934,12 +809,36 @@ def check_audio_files_exist():
         
         return audio_data
     
-    def _generate_player_hit(self, duration, style):
+    def _generate_player_hit(self, duration, style, start=0, stop=None):
         """Generate player hit/damage sound."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_player_hit_numpy(duration, start, stop)
+        else:
+            return self._generate_player_hit_simple(duration, start, stop)
+    
+    def _generate_player_hit_numpy(self, duration, start=0, stop=None):
+        """Generate player hit sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        
+        # Alarm-like sound
+        alarm_freq = 800 * (1 + 0.2 * self.np.sin(2 * self.np.pi * 10 * t))
+        alarm = self.np.sin(2 * self.np.pi * alarm_freq * t)
+        
+        # Distortion effect
+        distortion = self.np.sin(2 * self.np.pi * 200 * t) * 0.3
+        
+        # Warning envelope
+        envelope = self.np.exp(-t * 2) * (1 + self.np.sin(2 * self.np.pi * 5 * t) * 0.3)
+        
+        return (alarm + distortion) * envelope * 0.6
+    
+    def _generate_player_hit_simple(self, duration, start=0, stop=None):
+        """Generate player hit sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Alarm-like sound
@@ -957,12 +856,36 @@ def check_audio_files_exist():
         
         return audio_data
     
-    def _generate_enemy_spawn(self, duration, style):
+    def _generate_enemy_spawn(self, duration, style, start=0, stop=None):
         """Generate enemy spawn/warp sound."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_enemy_spawn_numpy(duration, start, stop)
+        else:
+            return self._generate_enemy_spawn_simple(duration, start, stop)
+    
+    def _generate_enemy_spawn_numpy(self, duration, start=0, stop=None):
+        """Generate enemy spawn sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        
+        # Warp effect
+        warp_freq = 400 * (1 + t / duration * 2)
+        warp = self.np.sin(2 * self.np.pi * warp_freq * t)
+        
+        # Modulation
+        mod = self.np.sin(2 * self.np.pi * 20 * t) * 0.2 + 1
+        
+        # Build-up envelope
+        envelope = t / duration * self.np.exp(-t * 2)
+        
+        return warp * mod * envelope * 0.4
+    
+    def _generate_enemy_spawn_simple(self, duration, start=0, stop=None):
+        """Generate enemy spawn sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Warp effect
@@ -980,12 +903,32 @@ def check_audio_files_exist():
         
         return audio_data
     
-    def _generate_menu_select(self, duration, freq, style):
+    def _generate_menu_select(self, duration, freq, style, start=0, stop=None):
         """Generate menu selection sound."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_menu_select_numpy(duration, freq, start, stop)
+        else:
+            return self._generate_menu_select_simple(duration, freq, start, stop)
+    
+    def _generate_menu_select_numpy(self, duration, freq, start=0, stop=None):
+        """Generate menu selection sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        
+        # Clean beep
+        beep = self.np.sin(2 * self.np.pi * freq * t)
+        
+        # Quick envelope
+        envelope = self.np.exp(-t * 10)
+        
+        return beep * envelope * 0.4
+    
+    def _generate_menu_select_simple(self, duration, freq, start=0, stop=None):
+        """Generate menu selection sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Clean beep
@@ -999,12 +942,32 @@ def check_audio_files_exist():
         
         return audio_data
     
-    def _generate_menu_move(self, duration, freq, style):
+    def _generate_menu_move(self, duration, freq, style, start=0, stop=None):
         """Generate menu navigation sound."""
-        frames = int(duration * self.sample_rate)
+        if self.numpy_available:
+            return self._generate_menu_move_numpy(duration, freq, start, stop)
+        else:
+            return self._generate_menu_move_simple(duration, freq, start, stop)
+    
+    def _generate_menu_move_numpy(self, duration, freq, start=0, stop=None):
+        """Generate menu navigation sound using numpy."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
+        t = self.np.arange(start, stop) / self.sample_rate
+        
+        # Soft click
+        click = self.np.sin(2 * self.np.pi * freq * t)
+        
+        # Very quick envelope
+        envelope = self.np.exp(-t * 20)
+        
+        return click * envelope * 0.3
+    
+    def _generate_menu_move_simple(self, duration, freq, start=0, stop=None):
+        """Generate menu navigation sound using simple math."""
+        frames, start, stop = self._get_sample_window(duration, start, stop)
         audio_data = []
         
-        for i in range(frames):
+        for i in range(start, stop):
             t = float(i) / self.sample_rate
             
             # Soft click
@@ -1018,81 +981,108 @@ def check_audio_files_exist():
         
         return audio_data
     
-    def _save_audio_file(self, audio_data, filepath):
-        """Save audio data to WAV file."""
-        try:
-            if self.scipy_available and self.numpy_available:
-                # Use scipy for high-quality WAV writing
-                if isinstance(audio_data, list):
-                    audio_data = self.np.array(audio_data)
-                
-                # Normalize audio data
-                audio_data = self.np.clip(audio_data, -1, 1)
-                
-                # Convert to 16-bit integers
-                audio_int16 = (audio_data * 32767).astype(self.np.int16)
-                
-                # Save as WAV file
-                self.wavfile.write(filepath, self.sample_rate, audio_int16)
-            else:
-                # Fallback: use pygame for WAV writing
-                self._save_audio_file_pygame(audio_data, filepath)
-                
-        except Exception as e:
-            print(f"Failed to save {os.path.basename(filepath)}: {e}")
+    def _encode_samples(self, audio_data):
+        """Convert float samples in [-1, 1] to native-order 16-bit PCM bytes for wave."""
+        if self.numpy_available and hasattr(audio_data, 'dtype'):
+            # NumPy array
+            audio_data = self.np.clip(audio_data, -1, 1)
+            audio_int16 = (audio_data * 32767).astype(self.np.int16)
+            return audio_int16.tobytes()
+        
+        # Python list: pack a whole block at once, linear in the number of samples
+        samples = array('h', [int(max(-1, min(1, sample)) * 32767) for sample in audio_data])
+        return samples.tobytes()
     
-    def _save_audio_file_pygame(self, audio_data, filepath):
-        """Save audio file using pygame (fallback method)."""
-        try:
-            # Convert to pygame sound format
-            if isinstance(audio_data, list):
-                # Convert to 16-bit integers
-                sound_data = []
-                for sample in audio_data:
-                    sample = max(-1, min(1, sample))  # Clamp
-                    int_sample = int(sample * 32767)
-                    sound_data.append([int_sample, int_sample])  # Stereo
-            else:
-                # Assume numpy array
-                audio_data = audio_data.clip(-1, 1)
-                sound_data = []
-                for sample in audio_data:
-                    int_sample = int(sample * 32767)
-                    sound_data.append([int_sample, int_sample])
-            
-            # Create pygame sound and save
-            sound = pygame.sndarray.make_sound(sound_data)
-            
-            # Note: pygame doesn't have direct WAV export
-            # This is a simplified approach
-            print(f"Saved (pygame method): {os.path.basename(filepath)}")
-            
-        except Exception as e:
-            print(f"Failed to save with pygame: {e}")
+    def _open_wav_writer(self, filepath):
+        """Open a 16-bit WAV file in the mixer's format for incremental writeframes() calls."""
+        wav_file = wave.open(filepath, 'wb')
+        wav_file.setnchannels(self.channels)
+        wav_file.setsampwidth(2)  # 16-bit
+        wav_file.setframerate(self.sample_rate)
+        return wav_file
 
-def check_audio_files_exist():
-    """Check if all required audio files exist."""
-    assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'audio')
+# Synthesis-only generator of a pool worker process, created on first use
+_worker_generator = None
+
+def render_audio_chunk(generator_name, duration, params, start, stop):
+    """Render one chunk of a track in a pool worker process."""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = AudioGenerator(synthesis_only=True)
+    return _worker_generator.render_chunk(generator_name, duration, params, start, stop)
+
+def get_audio_jobs(include_sfx=True, include_game_bgm=True):
+    """Get every audio file of the game as (subdirectory, filename, spec)."""
+    jobs = [('bgm', filename, spec) for filename, spec in BGM_SPECS.items()
+            if include_game_bgm or filename != 'game_bgm.wav']
+    if include_sfx:
+        jobs += [('sfx', filename, spec) for filename, spec in SFX_SPECS.items()]
+    return jobs
+
+def get_spec_hash(spec):
+    """Hash everything that determines the content of a generated file."""
+    data = {
+        'generator': spec['generator'],
+        'duration': spec['duration'],
+        'params': spec['params'],
+        'format': AUDIO_FORMAT,
+        'code_version': AUDIO_CODE_VERSION
+    }
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+def read_audio_manifest(assets_dir):
+    """Read the whole audio manifest, or an empty dict."""
+    try:
+        with open(os.path.join(assets_dir, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_audio_manifest(assets_dir):
+    """Load the file entries of the audio manifest, or an empty dict."""
+    return read_audio_manifest(assets_dir).get('files', {})
+
+def get_baked_audio_format(assets_dir):
+    """Get the sample format the audio files were baked in, or None if unknown."""
+    return read_audio_manifest(assets_dir).get('format')
+
+def save_audio_manifest(assets_dir, files):
+    """Atomically write the audio manifest."""
+    path = os.path.join(assets_dir, MANIFEST_FILENAME)
+    try:
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'code_version': AUDIO_CODE_VERSION, 'format': AUDIO_FORMAT, 'files': files},
+                      f, indent=2, sort_keys=True)
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        print(f"⚠️ Failed to save audio manifest: {e}")
+
+def get_stale_audio_files(assets_dir, manifest=None, include_sfx=True, include_game_bgm=True):
+    """List audio files that are missing, changed on disk or generated from an older spec.
     
-    required_files = [
-        'bgm/menu_bgm.wav',
-        'bgm/game_bgm.wav', 
-        'bgm/game_over_bgm.wav',
-        'bgm/ranking_bgm.wav',
-        'sfx/shoot.wav',
-        'sfx/explosion.wav',
-        'sfx/bomb.wav',
-        'sfx/item_collect.wav',
-        'sfx/player_hit.wav',
-        'sfx/enemy_spawn.wav',
-        'sfx/menu_select.wav',
-        'sfx/menu_move.wav'
-    ]
+    Only stat() is used, so the check stays cheap however large the files are.
+    """
+    if manifest is None:
+        manifest = load_audio_manifest(assets_dir)
     
-    missing_files = []
-    for file_path in required_files:
-        full_path = os.path.join(assets_dir, file_path)
-        if not os.path.exists(full_path):
-            missing_files.append(file_path)
+    stale_files = []
+    for subdir, filename, spec in get_audio_jobs(include_sfx, include_game_bgm):
+        file_path = f"{subdir}/{filename}"
+        entry = manifest.get(file_path)
+        try:
+            stat = os.stat(os.path.join(assets_dir, subdir, filename))
+        except OSError:
+            stale_files.append(file_path)
+            continue
+        
+        if (entry is None or entry.get('spec_hash') != get_spec_hash(spec)
+                or entry.get('size') != stat.st_size or entry.get('mtime_ns') != stat.st_mtime_ns):
+            stale_files.append(file_path)
     
-    return len(missing_files) == 0, missing_files
+    return stale_files
+
+def check_audio_files_exist(include_sfx=True, include_game_bgm=True):
+    """Check if all required audio files exist and are up to date."""
+    assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'audio')
+    stale_files = get_stale_audio_files(assets_dir, include_sfx=include_sfx, include_game_bgm=include_game_bgm)
+    return len(stale_files) == 0, stale_files
@@ -5,20 +5,62 @@ Handles BGM and sound effects using audio files
 
 import pygame
 import os
+import time
+import math
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from telemetry import telemetry, startup_profiler
+from music_engine import LayeredMusicEngine
+from audio_generator import (AudioGenerator, SFX_SPECS, SAMPLE_RATE, SAMPLE_SIZE, CHANNELS,
+                             AUDIO_FORMAT, get_baked_audio_format)
+
+# SFX scheduling: higher priority sounds may use reserved channels and steal busy ones
+SFX_PRIORITIES = {
+    'player_hit': 3,
+    'bomb': 3,
+    'explosion': 2,
+    'menu_select': 2,
+    'item': 1,
+    'enemy_spawn': 1,
+    'menu_move': 1,
+    'shoot': 0
+}
+
+# Maximum voices of the same sound playing at once
+SFX_MAX_VOICES = {
+    'shoot': 2,
+    'explosion': 4,
+    'item': 3,
+    'enemy_spawn': 2
+}
+
+# BGM tracks likely to follow each track; preloaded while it plays
+BGM_NEXT_TRACKS = {
+    'menu': ['game', 'ranking'],
+    'game': ['game_over', 'menu'],
+    'game_over': ['menu', 'ranking'],
+    'ranking': ['menu']
+}
 
 class AudioManager:
     """Manages all audio including BGM and sound effects."""
     
-    def __init__(self):
-        """Initialize the audio manager."""
-        try:
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-            self.audio_enabled = True
-            print("✅ Audio system initialized")
-        except pygame.error as e:
-            print(f"⚠️ Audio initialization failed: {e}")
-            self.audio_enabled = False
+    def __init__(self, sfx_in_memory=True):
+        """Initialize the audio manager.
+        
+        Nothing is opened or loaded here; start() does that once the first
+        frame is on screen. With sfx_in_memory the short sound effects are
+        synthesized straight into mixer buffers instead of loaded from WAV files.
+        """
+        # Same format the audio files are baked in, so they load without conversion;
+        # pre_init also makes pygame.init() open the mixer in this format
+        pygame.mixer.pre_init(frequency=SAMPLE_RATE, size=SAMPLE_SIZE, channels=CHANNELS, buffer=512)
+        self.audio_enabled = False
+        self.started = False
+        self.assets_ready = threading.Event()  # Set once sound effects and music stems are loaded
+        self.pending_bgm = None                # BGM requested before start(): (play method, arguments)
+        self.sfx_in_memory = sfx_in_memory
         
         self.current_bgm = None
         self.current_bgm_name = None
@@ -53,11 +95,120 @@ class AudioManager:
         # Loaded sound effects cache
         self.sfx_cache = {}
         
-        # Load sound effects
-        self._load_sound_effects()
+        # SFX requests of the current frame (name -> count), played by flush_sfx()
+        self.pending_sfx = {}
+        self.sfx_stats = {'requested': 0, 'played': 0, 'coalesced': 0, 'dropped': 0}
+        # Channel volume can't exceed 1.0, so single voices play at sfx_volume / max_coalesced_gain
+        # and coalesced ones are boosted up to the full sfx_volume
+        self.max_coalesced_gain = 1.5
+        self.default_max_voices = 3
+        self.priority_channel_ids = ()
+        
+        # Pitch-shifted variants of each SFX, resampled once for play_sfx_with_variation()
+        self.variant_banks = {}              # sfx name -> list of Sounds, lowest pitch first
+        self.variant_count = 5               # Variants per bank (odd keeps the original pitch in the middle)
+        self.max_pitch_variation = 0.15      # Pitch range covered by a bank (+-15%)
+        self.variant_memory_budget = 8 * 1024 * 1024  # Bytes of sample data for all banks
+        self.variant_memory_used = 0
+        self.lazy_variant_banks = False      # True builds a bank on first use (on the main thread) instead of while loading
+        self.pending_variation = {}          # sfx name -> pitch variation requested this frame
+        
+        # BGM decoded on a worker thread and played on two channels that crossfade
+        self.preload_bgm_enabled = True
+        self.bgm_crossfade_ms = 600
+        self.bgm_sounds = {}                 # track name -> decoded Sound
+        self.bgm_loads = {}                  # track name -> Future of a load in progress
+        self.bgm_lock = threading.Lock()
+        self.bgm_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bgm-loader')
+        self.bgm_channel = None              # Channel of the current BGM, None when streaming
+        self.bgm_started_at = 0
+        self.last_bgm_switch_ms = 0.0        # Main thread time spent in the last play_bgm()
+        
+        # In-game music mixed live from stems; None until first used, game_bgm.wav without NumPy
+        self.layered_music_enabled = True
+        self.music_engine = None
+        self.music_channel_id = 4
+    
+    def start(self, background=True, loader=None):
+        """Open the mixer and load sound effects and music stems, by default on a loader thread.
+        
+        Given an AssetLoader, the loading runs as one of its jobs instead.
+        Sound effects requested before the loader finishes are skipped;
+        BGM requested before start() begins once the mixer is open.
+        """
+        if self.started:
+            return
+        self.started = True
+        
+        start_time = time.perf_counter()
+        self._init_mixer()
+        startup_profiler.record_background('mixer', (time.perf_counter() - start_time) * 1000)
         
-        # Check for audio files
-        self._check_audio_files()
+        if loader is not None:
+            loader.add('sounds', self._load_assets)
+        elif background and self.audio_enabled:
+            threading.Thread(target=self._load_assets, name='audio-loader', daemon=True).start()
+        else:
+            self._load_assets()
+        
+        # After the loader started: entering the game waits for the music stems
+        if self.pending_bgm is not None:
+            play, args = self.pending_bgm
+            self.pending_bgm = None
+            play(*args)
+    
+    def _init_mixer(self):
+        """Open the mixer and reserve the BGM and priority channels."""
+        try:
+            pygame.mixer.init(frequency=SAMPLE_RATE, size=SAMPLE_SIZE, channels=CHANNELS, buffer=512)
+            self.audio_enabled = True
+            print("✅ Audio system initialized")
+        except pygame.error as e:
+            print(f"⚠️ Audio initialization failed: {e}")
+            self.audio_enabled = False
+            return
+        
+        pygame.mixer.set_num_channels(16)
+        # Channels 0-1 alternate for BGM crossfades; 2-3 are for high priority SFX (player hit, bomb);
+        # 4 carries the layered music
+        pygame.mixer.set_reserved(5)
+        self.bgm_channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+        self.priority_channel_ids = (2, 3)
+    
+    def _load_assets(self):
+        """Load sound effects and synthesize the music stems (runs on the loader thread)."""
+        try:
+            if not self.audio_enabled:
+                return
+            
+            # Synthesize or load sound effects
+            start_time = time.perf_counter()
+            if self.sfx_in_memory:
+                self._synthesize_sound_effects()
+            else:
+                self._load_sound_effects()
+            
+            if not self.lazy_variant_banks:
+                self.build_variant_banks()
+            startup_profiler.record_background('sfx', (time.perf_counter() - start_time) * 1000)
+            
+            # Synthesize the music stems now so entering the game does not hitch
+            start_time = time.perf_counter()
+            self._create_music_engine()
+            startup_profiler.record_background('music', (time.perf_counter() - start_time) * 1000)
+            
+            # Check for audio files
+            self._check_audio_files()
+        except Exception as e:
+            print(f"⚠️ Failed to load audio assets: {e}")
+        finally:
+            self.assets_ready.set()
+    
+    def wait_for_assets(self, timeout=None):
+        """Block until the loader thread has finished; False on timeout."""
+        if not self.started:
+            return False
+        return self.assets_ready.wait(timeout)
     
     def _check_audio_files(self):
         """Check if audio files exist."""
@@ -70,16 +221,19 @@ class AudioManager:
         # Check BGM files
         missing_bgm = []
         for name, filename in self.bgm_files.items():
+            if name == 'game' and self.music_engine is not None:
+                continue  # Mixed live from stems
             filepath = os.path.join(self.bgm_dir, filename)
             if not os.path.exists(filepath):
                 missing_bgm.append(filename)
         
-        # Check SFX files
+        # Check SFX files (not needed when they are synthesized in memory)
         missing_sfx = []
-        for name, filename in self.sfx_files.items():
-            filepath = os.path.join(self.sfx_dir, filename)
-            if not os.path.exists(filepath):
-                missing_sfx.append(filename)
+        if not self.sfx_in_memory:
+            for name, filename in self.sfx_files.items():
+                filepath = os.path.join(self.sfx_dir, filename)
+                if not os.path.exists(filepath):
+                    missing_sfx.append(filename)
         
         if missing_bgm or missing_sfx:
             print("⚠️ Some audio files are missing:")
@@ -91,17 +245,55 @@ class AudioManager:
         else:
             print("✅ All audio files found")
     
+    def _synthesize_sound_effects(self):
+        """Synthesize sound effects in the mixer's native format, without disk I/O."""
+        if not self.audio_enabled:
+            return
+        
+        frequency, size, channels = pygame.mixer.get_init()
+        if size != -16:
+            print(f"⚠️ Unsupported mixer sample size {size}, loading SFX files instead")
+            self.sfx_in_memory = False
+            self._load_sound_effects()
+            return
+        
+        start_time = time.perf_counter()
+        generator = AudioGenerator(synthesis_only=True)
+        generator.sample_rate = frequency  # Render at the mixer rate so SDL never resamples
+        
+        for sfx_name, filename in self.sfx_files.items():
+            try:
+                buffer = generator.synthesize_pcm(SFX_SPECS[filename], channels)
+                sound = pygame.mixer.Sound(buffer=buffer)
+                self.sfx_cache[sfx_name] = sound
+            except Exception as e:
+                print(f"⚠️ Failed to synthesize SFX {sfx_name}: {e}")
+        
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        print(f"✅ Synthesized {len(self.sfx_cache)} SFX in memory ({elapsed_ms:.0f} ms)")
+    
+    def is_native_format(self):
+        """Check if the baked audio files match the mixer's format."""
+        mixer_format = pygame.mixer.get_init()
+        baked_format = get_baked_audio_format(self.assets_dir)
+        if not mixer_format or baked_format != AUDIO_FORMAT:
+            return False
+        return mixer_format == (AUDIO_FORMAT['sample_rate'], AUDIO_FORMAT['sample_size'], AUDIO_FORMAT['channels'])
+    
     def _load_sound_effects(self):
         """Load sound effects into cache."""
         if not self.audio_enabled:
             return
         
+        # SDL skips conversion entirely for files baked in the mixer's format
+        if not self.is_native_format():
+            print("⚠️ Audio files are not in the mixer format and will be converted on load")
+        
         for sfx_name, filename in self.sfx_files.items():
             filepath = os.path.join(self.sfx_dir, filename)
             try:
                 if os.path.exists(filepath):
                     sound = pygame.mixer.Sound(filepath)
-                    sound.set_volume(self.sfx_volume)
                     self.sfx_cache[sfx_name] = sound
                     print(f"✅ Loaded SFX: {sfx_name}")
                 else:
@@ -109,43 +301,240 @@ class AudioManager:
             except Exception as e:
                 print(f"⚠️ Failed to load SFX {sfx_name}: {e}")
     
-    def play_bgm(self, track_name, loops=-1):
-        """Play background music."""
+    def reload_sound_effects(self):
+        """Load the SFX files again after they were generated (file playback mode only)."""
+        if self.sfx_in_memory:
+            return
+        self._load_sound_effects()
+        if not self.lazy_variant_banks:
+            self.build_variant_banks()
+    
+    def play_bgm(self, track_name, loops=-1, fade_ms=None):
+        """Play background music, crossfading from the current track when it was preloaded."""
+        if not self.started:
+            self.pending_bgm = (self.play_bgm, (track_name, loops, fade_ms))
+            return
         if not self.audio_enabled:
             return
         
         # Don't restart the same BGM
-        if self.current_bgm_name == track_name and pygame.mixer.music.get_busy():
+        if self.current_bgm_name == track_name and self.is_bgm_playing():
             return
         
+        if fade_ms is None:
+            fade_ms = self.bgm_crossfade_ms
+        
+        start_time = time.perf_counter()
+        sound = None
         try:
             if track_name in self.bgm_files:
-                filepath = os.path.join(self.bgm_dir, self.bgm_files[track_name])
-                
-                if os.path.exists(filepath):
-                    # Stop current BGM
-                    pygame.mixer.music.stop()
-                    
-                    # Load and play new BGM
-                    pygame.mixer.music.load(filepath)
-                    pygame.mixer.music.set_volume(self.bgm_volume)
-                    pygame.mixer.music.play(loops=loops)
-                    
+                self._stop_layered_music(fade_ms)
+                sound = self.get_preloaded_bgm(track_name)
+                if sound is not None:
+                    self._crossfade_to(sound, loops, fade_ms)
                     self.current_bgm_name = track_name
                     print(f"🎵 Playing BGM: {track_name}")
                 else:
-                    print(f"⚠️ BGM file not found: {self.bgm_files[track_name]}")
+                    self._stream_bgm(track_name, loops)
+                
+                self.preload_next_bgm(track_name)
             else:
                 print(f"⚠️ BGM track not found: {track_name}")
         except Exception as e:
             print(f"⚠️ Failed to play BGM {track_name}: {e}")
+        
+        # Main thread time of the switch, i.e. the hitch a state change causes
+        self.last_bgm_switch_ms = (time.perf_counter() - start_time) * 1000
+        telemetry.record_event('bgm_switch', track=track_name, preloaded=sound is not None,
+                               main_thread_ms=round(self.last_bgm_switch_ms, 2))
+    
+    def play_layered_music(self, fade_ms=None):
+        """Play the in-game music mixed live from stems, or the game BGM file as a fallback."""
+        if not self.started:
+            self.pending_bgm = (self.play_layered_music, (fade_ms,))
+            return
+        if not self.audio_enabled:
+            return
+        
+        engine = self.get_music_engine()
+        if engine is None:
+            self.play_bgm('game', fade_ms=fade_ms)
+            return
+        if engine.active:
+            return
+        
+        if fade_ms is None:
+            fade_ms = self.bgm_crossfade_ms
+        
+        start_time = time.perf_counter()
+        try:
+            # Fade the previous track out while the stems fade in
+            pygame.mixer.music.fadeout(fade_ms)
+            if self.bgm_channel is not None:
+                self.bgm_channel.fadeout(fade_ms)
+                self.bgm_channel = None
+            
+            engine.set_intensity(0.0)
+            engine.start(self.bgm_volume, fade_ms)
+            self.current_bgm_name = 'game'
+            self.preload_next_bgm('game')
+            print("🎵 Playing layered BGM: game")
+        except Exception as e:
+            print(f"⚠️ Failed to play layered BGM: {e}")
+        
+        self.last_bgm_switch_ms = (time.perf_counter() - start_time) * 1000
+        telemetry.record_event('bgm_switch', track='game', layered=True,
+                               main_thread_ms=round(self.last_bgm_switch_ms, 2))
+    
+    def get_music_engine(self):
+        """Get the layered music engine; None if unavailable."""
+        if not self.audio_enabled or not self.layered_music_enabled:
+            return None
+        
+        # Entering the game before the loader thread finished waits for the stems
+        self.wait_for_assets()
+        return self.music_engine
+    
+    def _create_music_engine(self):
+        """Synthesize the stems of the layered music engine."""
+        if not self.layered_music_enabled:
+            return
+        
+        try:
+            engine = LayeredMusicEngine(self.music_channel_id)
+        except Exception as e:
+            print(f"⚠️ Failed to initialize layered music: {e}")
+            self.layered_music_enabled = False
+            return
+        if not engine.available:
+            print("⚠️ Layered music unavailable - Using game BGM file")
+            self.layered_music_enabled = False
+            return
+        self.music_engine = engine
+    
+    def set_music_intensity(self, intensity):
+        """Set the battle intensity (0.0 to 1.0) that drives the layered music."""
+        if self.music_engine is not None:
+            self.music_engine.set_intensity(intensity)
+    
+    def update_music(self):
+        """Keep the layered music's buffer queue filled; call once per frame."""
+        if self.music_engine is not None and self.music_engine.active:
+            try:
+                self.music_engine.update()
+            except Exception as e:
+                print(f"⚠️ Layered music error: {e}")
+                self.music_engine.stop()
+    
+    def _stop_layered_music(self, fade_ms=0):
+        """Stop the layered music if it is playing."""
+        if self.music_engine is not None and self.music_engine.active:
+            self.music_engine.stop(fade_ms)
+            self.current_bgm_name = None
+    
+    def crossfade_bgm(self, track_name, duration_ms=1000, loops=-1):
+        """Crossfade from the current BGM to another track."""
+        self.play_bgm(track_name, loops=loops, fade_ms=duration_ms)
+    
+    def _crossfade_to(self, sound, loops, fade_ms):
+        """Fade the current BGM out while a preloaded track fades in on the other channel."""
+        pygame.mixer.music.stop()
+        
+        old_channel = self.bgm_channel
+        new_channel = self.bgm_channels[1] if old_channel is self.bgm_channels[0] else self.bgm_channels[0]
+        if old_channel is not None and old_channel.get_busy():
+            if fade_ms > 0:
+                old_channel.fadeout(fade_ms)
+            else:
+                old_channel.stop()
+        
+        new_channel.set_volume(self.bgm_volume)
+        new_channel.play(sound, loops=loops, fade_ms=fade_ms)
+        self.bgm_channel = new_channel
+        self.bgm_started_at = time.perf_counter()
+    
+    def _stream_bgm(self, track_name, loops):
+        """Stream a BGM file with pygame.mixer.music (blocks while the file is opened)."""
+        filepath = os.path.join(self.bgm_dir, self.bgm_files[track_name])
+        if not os.path.exists(filepath):
+            print(f"⚠️ BGM file not found: {self.bgm_files[track_name]}")
+            return
+        
+        # Stop current BGM
+        self._stop_bgm_channels()
+        pygame.mixer.music.stop()
+        
+        # Load and play new BGM
+        pygame.mixer.music.load(filepath)
+        pygame.mixer.music.set_volume(self.bgm_volume)
+        pygame.mixer.music.play(loops=loops)
+        
+        self.current_bgm_name = track_name
+        print(f"🎵 Playing BGM: {track_name}")
+    
+    def _stop_bgm_channels(self):
+        """Stop BGM playing on the crossfade channels."""
+        if self.bgm_channel is not None:
+            for channel in self.bgm_channels:
+                channel.stop()
+            self.bgm_channel = None
+    
+    def preload_bgm(self, track_name):
+        """Start decoding a BGM track on the loader thread."""
+        if not self.audio_enabled or not self.preload_bgm_enabled or track_name not in self.bgm_files:
+            return
+        
+        with self.bgm_lock:
+            if track_name in self.bgm_sounds or track_name in self.bgm_loads:
+                return
+            filepath = os.path.join(self.bgm_dir, self.bgm_files[track_name])
+            self.bgm_loads[track_name] = self.bgm_loader.submit(self._load_bgm_sound, track_name, filepath)
+    
+    def _load_bgm_sound(self, track_name, filepath):
+        """Decode a BGM file into a Sound (runs on the loader thread)."""
+        try:
+            if os.path.exists(filepath):
+                sound = pygame.mixer.Sound(filepath)
+                with self.bgm_lock:
+                    self.bgm_sounds[track_name] = sound
+        except Exception as e:
+            print(f"⚠️ Failed to preload BGM {track_name}: {e}")
+        finally:
+            with self.bgm_lock:
+                self.bgm_loads.pop(track_name, None)
+    
+    def get_preloaded_bgm(self, track_name):
+        """Get a decoded BGM track, or None if it is not ready yet."""
+        with self.bgm_lock:
+            return self.bgm_sounds.get(track_name)
+    
+    def preload_next_bgm(self, track_name):
+        """Preload the tracks likely to follow and drop decoded tracks that are not."""
+        next_tracks = BGM_NEXT_TRACKS.get(track_name, [])
+        with self.bgm_lock:
+            for name in list(self.bgm_sounds):
+                if name != track_name and name not in next_tracks:
+                    del self.bgm_sounds[name]  # A fading-out channel keeps its own reference
+        
+        for name in next_tracks:
+            self.preload_bgm(name)
+    
+    def wait_for_bgm_preload(self, timeout=None):
+        """Block until queued BGM preloads have finished (for benchmarks and tests)."""
+        with self.bgm_lock:
+            pending = list(self.bgm_loads.values())
+        for future in pending:
+            future.result(timeout)
     
     def stop_bgm(self):
         """Stop background music."""
+        self.pending_bgm = None
         if not self.audio_enabled:
             return
         
         try:
+            self._stop_layered_music()
+            self._stop_bgm_channels()
             pygame.mixer.music.stop()
             self.current_bgm_name = None
             print("🔇 BGM stopped")
@@ -158,29 +547,159 @@ class AudioManager:
         
         try:
             pygame.mixer.music.set_volume(self.bgm_volume)
+            if self.bgm_channel is not None:
+                self.bgm_channel.set_volume(self.bgm_volume)
+            if self.music_engine is not None:
+                self.music_engine.set_volume(self.bgm_volume)
         except Exception as e:
             print(f"⚠️ Failed to set BGM volume: {e}")
     
     def set_sfx_volume(self, volume):
         """Set sound effects volume (0.0 to 1.0)."""
+        # Applied per channel when each sound effect starts
         self.sfx_volume = max(0.0, min(1.0, volume))
-        
-        # Update volume for all cached sound effects
-        for sound in self.sfx_cache.values():
-            sound.set_volume(self.sfx_volume)
     
     def play_sfx(self, sfx_name):
-        """Play sound effect."""
-        if not self.audio_enabled:
+        """Request a sound effect; requests are played once per frame by flush_sfx()."""
+        if not self.audio_enabled or not self.assets_ready.is_set():
+            return  # Still loading, see start()
+        
+        if sfx_name not in self.sfx_cache:
+            print(f"⚠️ SFX not found: {sfx_name}")
+            return
+        
+        self.sfx_stats['requested'] += 1
+        if sfx_name in self.pending_sfx:
+            self.sfx_stats['coalesced'] += 1
+        self.pending_sfx[sfx_name] = self.pending_sfx.get(sfx_name, 0) + 1
+    
+    def flush_sfx(self):
+        """Play this frame's sound effect requests, one voice per distinct sound."""
+        if not self.pending_sfx:
+            return
+        
+        requests = sorted(self.pending_sfx.items(), key=lambda item: SFX_PRIORITIES.get(item[0], 1), reverse=True)
+        variations = self.pending_variation
+        self.pending_sfx = {}
+        self.pending_variation = {}
+        
+        for sfx_name, count in requests:
+            try:
+                self._start_voice(sfx_name, count, variations.get(sfx_name, 0))
+            except Exception as e:
+                print(f"⚠️ Failed to play SFX {sfx_name}: {e}")
+    
+    def _start_voice(self, sfx_name, count, pitch_variation=0):
+        """Start one voice for a coalesced request, respecting voice caps and priorities."""
+        sound = self.sfx_cache[sfx_name]
+        if pitch_variation > 0:
+            sound = self._pick_variant(sfx_name, pitch_variation)
+        priority = SFX_PRIORITIES.get(sfx_name, 1)
+        
+        # Variants of a sound count towards the same voice cap
+        variants = self.variant_banks.get(sfx_name) or [self.sfx_cache[sfx_name]]
+        voices = sum(variant.get_num_channels() for variant in variants)
+        if voices >= SFX_MAX_VOICES.get(sfx_name, self.default_max_voices):
+            self.sfx_stats['dropped'] += 1
             return
         
+        channel = None
+        if priority >= 3:
+            # Reserved channels first, then steal the oldest voice
+            for channel_id in self.priority_channel_ids:
+                if not pygame.mixer.Channel(channel_id).get_busy():
+                    channel = pygame.mixer.Channel(channel_id)
+                    break
+            if channel is None:
+                channel = pygame.mixer.find_channel(True)
+        else:
+            # Only important sounds may cut off another voice
+            channel = pygame.mixer.find_channel(priority >= 2)
+        
+        if channel is None:
+            self.sfx_stats['dropped'] += 1
+            return
+        
+        # Several identical requests in one frame play as one louder voice
+        gain = min(self.max_coalesced_gain, 1 + 0.3 * math.log2(count))
+        channel.set_volume(self.sfx_volume * gain / self.max_coalesced_gain)
+        channel.play(sound)
+        self.sfx_stats['played'] += 1
+    
+    def build_variant_banks(self):
+        """Build the pitch-variant banks of all sound effects up front."""
+        start_time = time.perf_counter()
+        for sfx_name in self.sfx_cache:
+            self._get_variant_bank(sfx_name)
+        
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        print(f"✅ Built SFX pitch variants ({self.variant_memory_used // 1024} KB, {elapsed_ms:.0f} ms)")
+    
+    def _get_variant_bank(self, sfx_name):
+        """Get the pitch-variant bank of a sound, building it on first use.
+        
+        Returns None when NumPy is missing or the bank would exceed the
+        memory budget; the original sound is played instead.
+        """
+        if sfx_name in self.variant_banks:
+            return self.variant_banks[sfx_name]
+        
+        bank = None
         try:
-            if sfx_name in self.sfx_cache:
-                self.sfx_cache[sfx_name].play()
+            import numpy as np
+            samples = pygame.sndarray.array(self.sfx_cache[sfx_name])
+            offsets = np.linspace(-self.max_pitch_variation, self.max_pitch_variation, self.variant_count)
+            
+            # Resampled length shrinks as pitch rises, so estimate the bank size first
+            bank_bytes = sum(int(len(samples) / (1 + offset)) for offset in offsets if offset != 0) * samples[0].nbytes
+            if self.variant_memory_used + bank_bytes > self.variant_memory_budget:
+                print(f"⚠️ SFX variant budget exceeded, {sfx_name} plays without pitch variation")
             else:
-                print(f"⚠️ SFX not found: {sfx_name}")
+                # The unshifted variant is the original sound itself
+                bank = [self.sfx_cache[sfx_name] if offset == 0
+                        else pygame.sndarray.make_sound(self._resample(np, samples, 1 + offset))
+                        for offset in offsets]
+                self.variant_memory_used += bank_bytes
+        except ImportError:
+            print("⚠️ NumPy not available - SFX pitch variation disabled")
         except Exception as e:
-            print(f"⚠️ Failed to play SFX {sfx_name}: {e}")
+            print(f"⚠️ Failed to build SFX variants for {sfx_name}: {e}")
+        
+        self.variant_banks[sfx_name] = bank
+        return bank
+    
+    def _resample(self, np, samples, pitch):
+        """Pitch-shift int16 samples by linear-interpolation resampling."""
+        length = max(1, int(len(samples) / pitch))
+        positions = np.arange(length) * pitch
+        source = np.arange(len(samples))
+        if samples.ndim == 1:
+            return np.interp(positions, source, samples).astype(np.int16)
+        
+        channels = [np.interp(positions, source, samples[:, channel]) for channel in range(samples.shape[1])]
+        return np.ascontiguousarray(np.stack(channels, axis=1).astype(np.int16))
+    
+    def _pick_variant(self, sfx_name, pitch_variation):
+        """Pick a random variant within +-pitch_variation in O(1)."""
+        bank = self._get_variant_bank(sfx_name)
+        if not bank:
+            return self.sfx_cache[sfx_name]
+        
+        # Variants are evenly spaced, so the allowed ones form a range around the middle
+        center = len(bank) // 2
+        step = 2 * self.max_pitch_variation / max(1, len(bank) - 1)
+        
+        # A variation between two steps picks the wider range in proportion, so small ones still vary
+        spread = pitch_variation / step
+        whole_steps = int(spread)
+        if random.random() < spread - whole_steps:
+            whole_steps += 1
+        spread = min(center, whole_steps)
+        return bank[random.randint(center - spread, center + spread)]
+    
+    def get_sfx_stats(self):
+        """Get counters of requested, played, coalesced and dropped sound effects."""
+        return dict(self.sfx_stats)
     
     def play_sfx_with_variation(self, sfx_name, pitch_variation=0.1):
         """Play sound effect with pitch variation."""
@@ -188,17 +707,10 @@ class AudioManager:
             return
         
         try:
-            if sfx_name in self.sfx_cache:
-                # Create a copy of the sound for pitch variation
-                sound = self.sfx_cache[sfx_name]
-                
-                # Play with slight pitch variation (if supported)
-                sound.play()
-                
-                # Note: pygame doesn't support real-time pitch shifting
-                # This is a placeholder for potential future enhancement
-            else:
-                print(f"⚠️ SFX not found: {sfx_name}")
+            # pygame can't pitch-shift in real time; a pre-resampled variant is picked at flush
+            self.play_sfx(sfx_name)
+            if sfx_name in self.pending_sfx:
+                self.pending_variation[sfx_name] = max(pitch_variation, self.pending_variation.get(sfx_name, 0))
         except Exception as e:
             print(f"⚠️ Failed to play SFX {sfx_name}: {e}")
     
@@ -208,6 +720,10 @@ class AudioManager:
             return False
         
         try:
+            if self.music_engine is not None and self.music_engine.active:
+                return True
+            if self.bgm_channel is not None:
+                return self.bgm_channel.get_busy()
             return pygame.mixer.music.get_busy()
         except:
             return False
@@ -218,6 +734,8 @@ class AudioManager:
             return 0
         
         try:
+            if self.bgm_channel is not None:
+                return int((time.perf_counter() - self.bgm_started_at) * 1000)
             return pygame.mixer.music.get_pos()
         except:
             return 0
@@ -229,6 +747,9 @@ class AudioManager:
         
         try:
             pygame.mixer.music.fadeout(fade_time_ms)
+            if self.bgm_channel is not None:
+                self.bgm_channel.fadeout(fade_time_ms)
+            self._stop_layered_music(fade_time_ms)
             print(f"🔉 BGM fading out over {fade_time_ms}ms")
         except Exception as e:
             print(f"⚠️ Failed to fade out BGM: {e}")
@@ -240,6 +761,10 @@ class AudioManager:
         
         try:
             pygame.mixer.music.pause()
+            if self.bgm_channel is not None:
+                self.bgm_channel.pause()
+            if self.music_engine is not None:
+                self.music_engine.pause()
             print("⏸️ BGM paused")
         except Exception as e:
             print(f"⚠️ Failed to pause BGM: {e}")
@@ -251,6 +776,10 @@ class AudioManager:
         
         try:
             pygame.mixer.music.unpause()
+            if self.bgm_channel is not None:
+                self.bgm_channel.unpause()
+            if self.music_engine is not None:
+                self.music_engine.resume()
             print("▶️ BGM resumed")
         except Exception as e:
             print(f"⚠️ Failed to resume BGM: {e}")
@@ -3,6 +3,20 @@ Bullet manager for QGamen_DanmakuShooting
 """
 
 import pygame
+from sprite_atlas import sprite_atlas
+from quality import quality_governor
+from telemetry import telemetry
+
+# Enemy bullet level of detail tiers, from most to least expensive
+BULLET_LOD_FULL = 0     # Per-bullet glow sprite (respects the quality level)
+BULLET_LOD_SPRITE = 1   # Plain atlas sprite, drawn with one blits() call
+BULLET_LOD_POINTS = 2   # Solid hitbox squares, drawn with one blits() call
+
+BULLET_LOD_NAMES = {
+    BULLET_LOD_FULL: 'FULL',
+    BULLET_LOD_SPRITE: 'SPRITE',
+    BULLET_LOD_POINTS: 'POINTS'
+}
 
 class BulletManager:
     """Manages all bullets in the game."""
@@ -13,6 +27,17 @@ class BulletManager:
         self.enemy_bullets = []
         self.game_area_width = 1280 * 2 // 3  # 修正: 新しい画面サイズに対応
         self.screen_height = 720  # 修正: 新しい画面サイズに対応
+        
+        # Enemy bullet counts at which cheaper tiers take over
+        self.sprite_lod_threshold = 300
+        self.points_lod_threshold = 800
+        self.enemy_bullet_lod = BULLET_LOD_FULL
+        
+        # Hysteresis: drop detail right away, recover only well below the threshold
+        self.lod_exit_ratio = 0.8        # Leave a cheaper tier below 80% of its threshold
+        self.lod_upgrade_delay = 60      # Frames to wait after a change before adding detail
+        self.frames_since_lod_change = 0
+        self.hitbox_squares = {}  # (color, width, height, scale) -> solid surface
     
     def add_player_bullet(self, bullet):
         """Add a player bullet."""
@@ -38,13 +63,78 @@ class BulletManager:
             if bullet.is_off_screen(self.game_area_width, self.screen_height):
                 self.enemy_bullets.remove(bullet)
     
-    def draw(self, screen):
+    def select_enemy_bullet_lod(self):
+        """Pick the enemy bullet detail tier from the bullet count and frame budget."""
+        count = len(self.enemy_bullets)
+        sprite_threshold = self.sprite_lod_threshold
+        points_threshold = self.points_lod_threshold
+        self.frames_since_lod_change += 1
+        
+        # Over budget: fall back to cheaper tiers at half the bullet count
+        if quality_governor.get_average_frame_time() > quality_governor.frame_budget_ms:
+            sprite_threshold //= 2
+            points_threshold //= 2
+        
+        lod = self._get_lod_for_count(count, sprite_threshold, points_threshold)
+        if lod < self.enemy_bullet_lod:
+            # Only add detail back once the count is clearly below the thresholds for a while
+            if self.frames_since_lod_change < self.lod_upgrade_delay:
+                lod = self.enemy_bullet_lod
+            else:
+                lod = max(lod, self._get_lod_for_count(count, sprite_threshold * self.lod_exit_ratio,
+                                                       points_threshold * self.lod_exit_ratio))
+        
+        if lod != self.enemy_bullet_lod:
+            self.enemy_bullet_lod = lod
+            self.frames_since_lod_change = 0
+            telemetry.set_gauge('bullet_lod', BULLET_LOD_NAMES[lod])
+            telemetry.increment('bullet_lod_changes')
+        return lod
+    
+    def _get_lod_for_count(self, count, sprite_threshold, points_threshold):
+        """Get the detail tier a bullet count calls for."""
+        if count >= points_threshold:
+            return BULLET_LOD_POINTS
+        if count >= sprite_threshold:
+            return BULLET_LOD_SPRITE
+        return BULLET_LOD_FULL
+    
+    def get_enemy_bullet_lod_name(self):
+        """Get the name of the current enemy bullet detail tier."""
+        return BULLET_LOD_NAMES[self.enemy_bullet_lod]
+    
+    def draw(self, screen, scale=1.0):
         """Draw all bullets."""
+        # Bullets queue their glow sprites; they are drawn in the batched glow pass
         for bullet in self.player_bullets:
-            bullet.draw(screen)
+            bullet.draw(screen, scale)
         
-        for bullet in self.enemy_bullets:
-            bullet.draw(screen)
+        lod = self.select_enemy_bullet_lod()
+        if lod == BULLET_LOD_FULL:
+            for bullet in self.enemy_bullets:
+                bullet.draw(screen, scale)
+        elif lod == BULLET_LOD_SPRITE:
+            sprite_atlas.blit_many(screen, 'enemy_bullet',
+                                   [(bullet.x * scale, bullet.y * scale) for bullet in self.enemy_bullets],
+                                   scale)
+        else:
+            # Solid hitbox-sized squares so the dodgeable area stays exact
+            batch = []
+            for bullet in self.enemy_bullets:
+                rect = bullet.rect
+                square = self.get_hitbox_square(bullet.color, rect.width, rect.height, scale)
+                batch.append((square, (int(rect.x * scale), int(rect.y * scale))))
+            screen.blits(batch, doreturn=False)
+    
+    def get_hitbox_square(self, color, width, height, scale):
+        """Get an opaque surface covering a bullet hitbox at a render scale."""
+        key = (color, width, height, scale)
+        square = self.hitbox_squares.get(key)
+        if square is None:
+            square = pygame.Surface((max(1, int(width * scale)), max(1, int(height * scale))))
+            square.fill(color)
+            self.hitbox_squares[key] = square
+        return square
     
     def clear_all(self):
         """Clear all bullets."""
@@ -5,6 +5,8 @@ Visual effects for QGamen_DanmakuShooting
 import pygame
 import random
 import math
+from glow import glow_renderer
+from quality import quality_governor
 
 class Explosion:
     """Explosion effect when enemies are destroyed."""
@@ -17,8 +19,8 @@ class Explosion:
         self.lifetime = 30  # frames
         self.timer = 0
         
-        # Create particles
-        for _ in range(15):
+        # Create particles (count follows the current quality level)
+        for _ in range(quality_governor.get('explosion_particles')):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(2, 8)
             dx = math.cos(angle) * speed
@@ -54,30 +56,14 @@ class Explosion:
         """Check if explosion is finished."""
         return self.timer >= self.lifetime
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the explosion."""
         for particle in self.particles:
             if particle['size'] > 0:
-                # Draw particle with glow effect
-                # Outer glow
-                glow_color = tuple(max(0, c - 100) for c in particle['color'])
-                glow_size = int(particle['size'] * 1.5)
-                if glow_size > 0:
-                    pygame.draw.circle(screen, glow_color, 
-                                     (int(particle['x']), int(particle['y'])), 
-                                     glow_size)
-                
-                # Main particle
-                pygame.draw.circle(screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), 
-                                 int(particle['size']))
-                
-                # Bright core
-                core_color = tuple(min(255, c + 50) for c in particle['color'])
-                core_size = max(1, int(particle['size'] * 0.5))
-                pygame.draw.circle(screen, core_color, 
-                                 (int(particle['x']), int(particle['y'])), 
-                                 core_size)
+                # Particle with glow effect, drawn in the batched glow pass
+                size = particle['size'] * scale
+                glow_renderer.add_circle(particle['x'] * scale, particle['y'] * scale,
+                                         particle['color'], size * 2, size)
 
 class BombExplosion:
     """Large bomb explosion effect for special attacks."""
@@ -116,8 +102,8 @@ class BombExplosion:
                 'life': random.randint(30, 60)
             })
         
-        # Create shockwave rings
-        for i in range(3):
+        # Create shockwave rings (count follows the current quality level)
+        for i in range(quality_governor.get('shockwave_rings')):
             self.shockwave_rings.append({
                 'radius': 0,
                 'max_radius': max_radius + i * 50,
@@ -160,48 +146,53 @@ class BombExplosion:
         """Check if explosion is finished."""
         return self.timer >= self.lifetime
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the bomb explosion."""
+        x = self.x * scale
+        y = self.y * scale
+        
         # Draw shockwave rings
         for ring in self.shockwave_rings:
-            if ring['radius'] > 0 and ring['alpha'] > 0:
+            radius = ring['radius'] * scale
+            if radius > 0 and ring['alpha'] > 0:
                 # Create a surface for alpha blending
-                ring_surface = pygame.Surface((ring['radius'] * 2, ring['radius'] * 2), pygame.SRCALPHA)
+                ring_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
                 color_with_alpha = (255, 255, 255, int(ring['alpha']))
                 pygame.draw.circle(ring_surface, color_with_alpha, 
-                                 (int(ring['radius']), int(ring['radius'])), 
-                                 int(ring['radius']), 3)
-                screen.blit(ring_surface, (self.x - ring['radius'], self.y - ring['radius']))
+                                 (int(radius), int(radius)), 
+                                 int(radius), max(1, int(3 * scale)))
+                screen.blit(ring_surface, (x - radius, y - radius))
         
         # Draw main explosion circle
-        if self.current_radius > 0:
+        current_radius = self.current_radius * scale
+        if current_radius > 0:
             # Outer glow
             glow_alpha = max(0, 100 * (1.0 - self.timer / self.lifetime))
             if glow_alpha > 0:
-                glow_surface = pygame.Surface((self.current_radius * 2, self.current_radius * 2), pygame.SRCALPHA)
+                glow_surface = pygame.Surface((current_radius * 2, current_radius * 2), pygame.SRCALPHA)
                 glow_color = (255, 255, 200, int(glow_alpha))
                 pygame.draw.circle(glow_surface, glow_color,
-                                 (int(self.current_radius), int(self.current_radius)),
-                                 int(self.current_radius))
-                screen.blit(glow_surface, (self.x - self.current_radius, self.y - self.current_radius))
+                                 (int(current_radius), int(current_radius)),
+                                 int(current_radius))
+                screen.blit(glow_surface, (x - current_radius, y - current_radius))
             
             # Inner bright circle
             inner_alpha = max(0, 200 * (1.0 - self.timer / 30.0))
             if inner_alpha > 0:
-                inner_radius = self.current_radius * 0.6
+                inner_radius = current_radius * 0.6
                 inner_surface = pygame.Surface((inner_radius * 2, inner_radius * 2), pygame.SRCALPHA)
                 inner_color = (255, 255, 255, int(inner_alpha))
                 pygame.draw.circle(inner_surface, inner_color,
                                  (int(inner_radius), int(inner_radius)),
                                  int(inner_radius))
-                screen.blit(inner_surface, (self.x - inner_radius, self.y - inner_radius))
+                screen.blit(inner_surface, (x - inner_radius, y - inner_radius))
         
         # Draw particles
         for particle in self.particles:
             if particle['size'] > 0:
                 pygame.draw.circle(screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), 
-                                 int(particle['size']))
+                                 (particle['x'] * scale, particle['y'] * scale), 
+                                 max(1, int(particle['size'] * scale)))
 
 class EffectManager:
     """Manages all visual effects."""
@@ -237,10 +228,10 @@ class EffectManager:
             if bomb.is_finished():
                 self.bomb_explosions.remove(bomb)
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw all effects."""
         for explosion in self.explosions:
-            explosion.draw(screen)
+            explosion.draw(screen, scale)
         
         for bomb in self.bomb_explosions:
-            bomb.draw(screen)
+            bomb.draw(screen, scale)
@@ -5,6 +5,10 @@ Enemy classes for QGamen_DanmakuShooting
 import pygame
 import math
 import random
+from functools import partial
+from sprite_atlas import sprite_atlas
+from glow import glow_renderer
+from quality import quality_governor
 
 class EnemyStrength:
     """Enemy strength levels."""
@@ -79,46 +83,10 @@ class Enemy:
         """Check if enemy is off screen."""
         return self.y > screen_height + self.height
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the enemy."""
-        # Color based on strength
-        if self.strength == EnemyStrength.WEAK:
-            hull_color = (255, 150, 150)  # Light red
-            engine_color = (200, 100, 100)
-        elif self.strength == EnemyStrength.NORMAL:
-            hull_color = (255, 100, 100)  # Red
-            engine_color = (200, 50, 50)
-        else:  # STRONG
-            hull_color = (200, 50, 50)    # Dark red
-            engine_color = (150, 25, 25)
-        
-        # Draw enemy spaceship (inverted triangle)
-        center_x = self.rect.centerx
-        center_y = self.rect.centery
-        
-        # Main hull
-        hull_points = [
-            (center_x, center_y + 10),      # Bottom point
-            (center_x - 8, center_y - 8),   # Top left
-            (center_x + 8, center_y - 8)    # Top right
-        ]
-        pygame.draw.polygon(screen, hull_color, hull_points)
-        
-        # Engine glow at the back (top)
-        pygame.draw.circle(screen, engine_color, (center_x - 4, center_y - 10), 2)
-        pygame.draw.circle(screen, engine_color, (center_x + 4, center_y - 10), 2)
-        
-        # Cockpit/core
-        cockpit_color = tuple(min(255, c + 30) for c in hull_color)
-        pygame.draw.circle(screen, cockpit_color, (center_x, center_y), 3)
-        
-        # Strength indicator
-        if self.strength == EnemyStrength.STRONG:
-            # Draw energy shield effect
-            shield_color = (255, 255, 100, 100)  # Yellow with alpha
-            shield_surface = pygame.Surface((self.rect.width + 6, self.rect.height + 6), pygame.SRCALPHA)
-            pygame.draw.rect(shield_surface, shield_color, shield_surface.get_rect(), 2)
-            screen.blit(shield_surface, (self.rect.x - 3, self.rect.y - 3))
+        sprite_atlas.blit(screen, f"enemy_{self.strength}",
+                          self.rect.centerx * scale, self.rect.centery * scale, scale)
 
 class RadialEnemy(Enemy):
     """Enemy that shoots bullets in a radial pattern."""
@@ -289,10 +257,10 @@ class EnemyManager:
             bullets.extend(enemy.get_bullets())
         return bullets
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw all enemies."""
         for enemy in self.enemies:
-            enemy.draw(screen)
+            enemy.draw(screen, scale)
 
 class EnemyBullet:
     """Enemy bullet class."""
@@ -320,18 +288,81 @@ class EnemyBullet:
         return (self.x < 0 or self.x > game_area_width or 
                 self.y < 0 or self.y > screen_height)
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the bullet."""
-        # Enemy plasma bolt
-        # Draw outer glow
-        glow_radius = self.width // 2 + 2
-        glow_color = tuple(max(0, c - 100) for c in self.color)
-        pygame.draw.circle(screen, glow_color, (int(self.x), int(self.y)), glow_radius)
-        
-        # Draw main bolt
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.width // 2)
-        
-        # Draw bright center
-        bright_color = tuple(min(255, c + 50) for c in self.color)
-        center_radius = max(1, self.width // 4)
-        pygame.draw.circle(screen, bright_color, (int(self.x), int(self.y)), center_radius)
+        # Enemy plasma bolt: one additive glow sprite with a solid core
+        glow_layers = quality_governor.get('glow_layers')
+        if glow_layers > 0:
+            glow_renderer.add_circle(self.x * scale, self.y * scale, self.color,
+                                     (self.width // 2 + 2 * glow_layers) * scale, self.width // 2 * scale)
+        else:
+            sprite_atlas.blit(screen, 'enemy_bullet', self.x * scale, self.y * scale, scale)
+
+# Procedural art parameters, baked into the sprite atlas
+ENEMY_COLORS = {
+    EnemyStrength.WEAK: {'hull': (255, 150, 150), 'engine': (200, 100, 100)},    # Light red
+    EnemyStrength.NORMAL: {'hull': (255, 100, 100), 'engine': (200, 50, 50)},    # Red
+    EnemyStrength.STRONG: {'hull': (200, 50, 50), 'engine': (150, 25, 25),       # Dark red
+                           'shield': (255, 255, 100, 100), 'shield_size': 46}    # Yellow with alpha
+}
+
+ENEMY_BULLET_ART = {'color': (255, 100, 100), 'size': int(6 * 1.5)}  # Light red
+
+def draw_enemy_ship(screen, x, y, scale, colors):
+    """Draw an enemy spaceship (inverted triangle) centered on (x, y)."""
+    hull_color = colors['hull']
+    engine_color = colors['engine']
+    
+    def point(dx, dy):
+        return (x + dx * scale, y + dy * scale)
+    
+    def radius(r):
+        return max(1, int(r * scale))
+    
+    # Main hull
+    hull_points = [
+        point(0, 10),    # Bottom point
+        point(-8, -8),   # Top left
+        point(8, -8)     # Top right
+    ]
+    pygame.draw.polygon(screen, hull_color, hull_points)
+    
+    # Engine glow at the back (top)
+    pygame.draw.circle(screen, engine_color, point(-4, -10), radius(2))
+    pygame.draw.circle(screen, engine_color, point(4, -10), radius(2))
+    
+    # Cockpit/core
+    cockpit_color = tuple(min(255, c + 30) for c in hull_color)
+    pygame.draw.circle(screen, cockpit_color, (x, y), radius(3))
+    
+    # Strength indicator: energy shield effect
+    if 'shield' in colors:
+        shield_size = int(colors['shield_size'] * scale)
+        shield_surface = pygame.Surface((shield_size, shield_size), pygame.SRCALPHA)
+        pygame.draw.rect(shield_surface, colors['shield'], shield_surface.get_rect(), radius(2))
+        screen.blit(shield_surface, (x - shield_size / 2, y - shield_size / 2))
+
+def draw_enemy_bullet(screen, x, y, scale, art):
+    """Draw an enemy plasma bolt centered on (x, y)."""
+    color = art['color']
+    size = art['size']
+    
+    # Draw outer glow
+    glow_radius = max(1, int((size // 2 + 2) * scale))
+    glow_color = tuple(max(0, c - 100) for c in color)
+    pygame.draw.circle(screen, glow_color, (x, y), glow_radius)
+    
+    # Draw main bolt
+    pygame.draw.circle(screen, color, (x, y), max(1, int(size // 2 * scale)))
+    
+    # Draw bright center
+    bright_color = tuple(min(255, c + 50) for c in color)
+    center_radius = max(1, int(size // 4 * scale))
+    pygame.draw.circle(screen, bright_color, (x, y), center_radius)
+
+for strength, colors in ENEMY_COLORS.items():
+    sprite_atlas.register(f"enemy_{strength}", (-23, -23, 23, 23),
+                          partial(draw_enemy_ship, colors=colors), colors)
+# Used by the sprite level of detail and when glows are off; bullets normally draw as glows
+sprite_atlas.register('enemy_bullet', (-7, -7, 7, 7),
+                      partial(draw_enemy_bullet, art=ENEMY_BULLET_ART), ENEMY_BULLET_ART)
@@ -5,55 +5,170 @@ Font manager for Japanese text support in QGamen_DanmakuShooting
 import pygame
 import os
 import sys
+import json
+import time
+import hashlib
+from collections import OrderedDict
+from glyph_atlas import GlyphAtlas
+
+# Bump when the font resolution logic changes
+FONT_CACHE_VERSION = 1
+FONT_CACHE_FILENAME = 'font_cache.json'
+
+# Candidate fonts, tried in order
+JAPANESE_FONT_NAMES = [
+    # Windows fonts
+    "msgothic",
+    "msmincho",
+    "meiryo",
+    "yugothm",
+    # macOS fonts
+    "hiragino sans gb",
+    "hiragino kaku gothic pron",
+    # Linux fonts
+    "noto sans cjk jp",
+    "takao gothic",
+    "ipaexgothic",
+    # Fallback fonts
+    "dejavu sans",
+    "liberation sans",
+    "arial unicode ms"
+]
+
+def get_font_directories():
+    """Get the directories fonts are installed into on this platform."""
+    home = os.path.expanduser('~')
+    if sys.platform.startswith('win'):
+        windir = os.environ.get('WINDIR', 'C:\\Windows')
+        local_app_data = os.environ.get('LOCALAPPDATA', os.path.join(home, 'AppData', 'Local'))
+        return [os.path.join(windir, 'Fonts'), os.path.join(local_app_data, 'Microsoft', 'Windows', 'Fonts')]
+    if sys.platform == 'darwin':
+        return ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library', 'Fonts')]
+    return ['/usr/share/fonts', '/usr/local/share/fonts',
+            os.path.join(home, '.fonts'), os.path.join(home, '.local', 'share', 'fonts')]
+
+def get_font_cache_key():
+    """Hash the platform and font directory mtimes, so installing or removing fonts invalidates the cache."""
+    mtimes = []
+    for directory in get_font_directories():
+        try:
+            mtimes.append([directory, os.stat(directory).st_mtime_ns])
+            # Package managers install into subdirectories, which leaves the top-level mtime alone
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        mtimes.append([entry.path, entry.stat().st_mtime_ns])
+        except OSError:
+            continue
+    mtimes.sort()
+    
+    data = json.dumps([FONT_CACHE_VERSION, sys.platform, pygame.version.ver, JAPANESE_FONT_NAMES, mtimes])
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
 
 class FontManager:
     """Manages fonts with Japanese text support."""
     
-    def __init__(self):
-        """Initialize the font manager."""
+    def __init__(self, cache_dir=None):
+        """Initialize the font manager; the default font is resolved on first use."""
         pygame.font.init()
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache')
+        self.cache_path = os.path.join(cache_dir, FONT_CACHE_FILENAME)
         self.fonts = {}
-        self.default_font = None
-        self._init_default_font()
+        self.default_font = None         # Name of the resolved font
+        self.default_font_path = None    # Its file; None uses pygame's built-in font
+        self.supports_japanese = False
+        self.default_font_resolved = False
+        
+        # Static UI text is assembled from pre-rasterized glyphs; anything else goes through TrueType
+        self.glyph_atlas = GlyphAtlas(cache_dir)
+        self.use_glyph_atlas = True
+        self.text_cache = OrderedDict()  # (text, size, color) -> assembled surface, least recent first
+        self.text_cache_size = 256
     
     def _init_default_font(self):
-        """Initialize the default font with Japanese support."""
-        # Try to find a Japanese font
-        japanese_font_names = [
-            # Windows fonts
-            "msgothic",
-            "msmincho", 
-            "meiryo",
-            "yugothm",
-            # macOS fonts
-            "hiragino sans gb",
-            "hiragino kaku gothic pron",
-            # Linux fonts
-            "noto sans cjk jp",
-            "takao gothic",
-            "ipaexgothic",
-            # Fallback fonts
-            "dejavu sans",
-            "liberation sans",
-            "arial unicode ms"
-        ]
+        """Initialize the default font with Japanese support, from the cache when possible."""
+        self.default_font_resolved = True
+        start_time = time.perf_counter()
         
-        # Try each font
-        for font_name in japanese_font_names:
+        cache_key = get_font_cache_key()
+        if self._load_cached(cache_key):
+            source = "cached"
+        else:
+            self._resolve_default_font()
+            self._save_cached(cache_key)
+            source = "resolved"
+        
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if self.default_font_path is None:
+            print(f"No Japanese font found, using default font ({source}, {elapsed_ms:.0f} ms)")
+        elif not self.supports_japanese:
+            print(f"Using font: {self.default_font} - no Japanese glyphs ({source}, {elapsed_ms:.0f} ms)")
+        else:
+            print(f"Using font: {self.default_font} ({source}, {elapsed_ms:.0f} ms)")
+    
+    def _resolve_default_font(self):
+        """Find the first candidate font file that has Japanese glyphs."""
+        fallback = None
+        for font_name in JAPANESE_FONT_NAMES:
             try:
-                test_font = pygame.font.SysFont(font_name, 24)
-                # Test if it can render Japanese characters
-                test_surface = test_font.render("テスト", True, (255, 255, 255))
-                if test_surface.get_width() > 0:
+                # match_font returns None for missing fonts, where SysFont would quietly use the default font
+                path = pygame.font.match_font(font_name)
+                if not path:
+                    continue
+                
+                test_font = pygame.font.Font(path, 24)
+                if self._supports_japanese(test_font):
                     self.default_font = font_name
-                    print(f"Using font: {font_name}")
+                    self.default_font_path = path
+                    self.supports_japanese = True
                     return
-            except:
+                if fallback is None:
+                    fallback = (font_name, path)
+            except Exception:
                 continue
         
-        # If no Japanese font found, use default
-        print("No Japanese font found, using default font")
-        self.default_font = None
+        # No Japanese font: prefer an installed fallback font over pygame's default
+        if fallback is not None:
+            self.default_font, self.default_font_path = fallback
+    
+    def _supports_japanese(self, font):
+        """Check that the font draws テスト with real glyphs rather than the missing-glyph box."""
+        missing = font.metrics("\uffff")[0]
+        return all(metric is not None and metric != missing for metric in font.metrics("テスト"))
+    
+    def _load_cached(self, cache_key):
+        """Load the resolved font from the cache if it matches the cache key."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        path = data.get('path')
+        if data.get('key') != cache_key or (path is not None and not os.path.exists(path)):
+            return False
+        
+        self.default_font = data.get('font_name')
+        self.default_font_path = path
+        self.supports_japanese = bool(data.get('japanese'))
+        return True
+    
+    def _save_cached(self, cache_key):
+        """Persist the resolved font for later launches."""
+        data = {
+            'key': cache_key,
+            'font_name': self.default_font,
+            'path': self.default_font_path,
+            'japanese': self.supports_japanese
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            # A read-only install still works, the font is just resolved every launch
+            print(f"⚠️ Failed to save font cache: {e}")
     
     def get_font(self, size, font_type="default"):
         """Get a font with the specified size."""
@@ -62,10 +177,13 @@ class FontManager:
         if cache_key in self.fonts:
             return self.fonts[cache_key]
         
-        # Create font
-        if self.default_font:
+        if not self.default_font_resolved:
+            self._init_default_font()
+        
+        # Create font straight from the resolved file, skipping the system font lookup
+        if self.default_font_path:
             try:
-                font = pygame.font.SysFont(self.default_font, size)
+                font = pygame.font.Font(self.default_font_path, size)
             except:
                 font = pygame.font.Font(None, size)
         else:
@@ -77,6 +195,11 @@ class FontManager:
     
     def render_text(self, text, size, color, font_type="default"):
         """Render text with Japanese support."""
+        if self.use_glyph_atlas and font_type == "default":
+            surface = self._render_from_atlas(text, size, color)
+            if surface is not None:
+                return surface
+        
         font = self.get_font(size, font_type)
         
         try:
@@ -106,6 +229,39 @@ class FontManager:
                 # Ultimate fallback
                 surface = fallback_font.render("???", True, color)
                 return surface
+    
+    def load_glyph_atlas(self):
+        """Load or build the glyph atlas ahead of the first text (asset loader job)."""
+        if not self.default_font_resolved:
+            self._init_default_font()
+        self.glyph_atlas.load_or_build(self.default_font_path)
+    
+    def _render_from_atlas(self, text, size, color):
+        """Get text assembled from the glyph atlas; None if it needs TrueType rendering."""
+        key = (text, size, tuple(color))
+        surface = self.text_cache.get(key)
+        if surface is not None:
+            self.text_cache.move_to_end(key)
+            return surface
+        
+        if not self.default_font_resolved:
+            self._init_default_font()
+        try:
+            if not self.glyph_atlas.load_or_build(self.default_font_path, blocking=False):
+                return None  # Still being built by the asset loader
+        except Exception as e:
+            print(f"⚠️ Glyph atlas unavailable: {e}")
+            self.use_glyph_atlas = False
+            return None
+        
+        surface = self.glyph_atlas.render(text, size, color)
+        if surface is None:
+            return None  # Dynamic text such as player names
+        
+        self.text_cache[key] = surface
+        if len(self.text_cache) > self.text_cache_size:
+            self.text_cache.popitem(last=False)
+        return surface
 
 # Global font manager instance
 font_manager = FontManager()
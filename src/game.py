@@ -7,6 +7,7 @@ import sys
 import json
 import os
 import math
+import time
 import threading
 from player import Player
 from enemy import EnemyManager
@@ -17,7 +18,12 @@ from ranking import RankingManager
 from items import ItemManager
 from audio_manager import audio_manager
 from audio_generator import AudioGenerator, check_audio_files_exist
+from asset_loader import AssetLoader
 from space_background import SpaceBackground
+from sprite_atlas import sprite_atlas
+from glow import glow_renderer
+from quality import quality_governor
+from telemetry import telemetry, startup_profiler
 
 class GameState:
     """Game state enumeration."""
@@ -27,11 +33,12 @@ class GameState:
     RANKING = 3
     NAME_INPUT = 4
     AUDIO_GENERATION = 5  # New state for audio generation
+    LOADING = 6  # Assets are loading on the asset loader threads
 
 class Game:
     """Main game class that handles the game loop and state management."""
     
-    def __init__(self):
+    def __init__(self, render_scale=1.0, ranking_backend="json", leaderboard_url=None):
         """Initialize the game."""
         # Screen settings - 修正: 画面サイズを小さく
         self.SCREEN_WIDTH = 1280
@@ -40,16 +47,29 @@ class Game:
         self.UI_AREA_WIDTH = self.SCREEN_WIDTH - self.GAME_AREA_WIDTH  # Right 1/3 for UI
         self.FPS = 60
         
+        # Internal render resolution of the game area (F2 cycles at runtime)
+        self.RENDER_SCALES = (1.0, 0.75, 0.5)
+        self.smooth_scaling = True
+        
+        # Performance monitoring (F3 toggles the debug HUD)
+        self.quality_governor = quality_governor
+        self.quality_governor.frame_budget_ms = 1000.0 / self.FPS
+        self.show_debug_hud = False
+        self.last_frame_time_ms = 0.0
+        self.glows_drawn = 0  # Glow sprites drawn in the last game frame
+        
         # Initialize display
         self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
         pygame.display.set_caption("QGame - スペースサバイバル")
+        self.set_render_scale(render_scale, load_atlas=False)
+        startup_profiler.mark('display')
         
         # Initialize clock
         self.clock = pygame.time.Clock()
         
         # Game state
         self.running = True
-        self.state = GameState.MENU
+        self.state = GameState.LOADING
         self.previous_state = None
         
         # Game objects
@@ -59,9 +79,12 @@ class Game:
         self.effect_manager = None
         self.item_manager = None
         self.ui = None
-        self.ranking_manager = RankingManager()
+        self.ranking_manager = None     # Created by the asset loader
+        self.ranking_backend = ranking_backend
+        self.leaderboard_url = leaderboard_url
+        self.show_online_rankings = False  # Tab on the ranking screen, with a leaderboard server
         self.audio_manager = audio_manager
-        self.space_background = SpaceBackground(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+        self.space_background = None    # Created by the asset loader
         
         # Game variables
         self.score = 0
@@ -69,6 +92,7 @@ class Game:
         self.special_attacks = 2  # 1ライフあたり2個まで
         self.max_special_per_life = 2  # 1ライフあたりの最大爆弾数
         self.game_over_timer = 0
+        self.is_new_high_score = False  # Whether the final score makes the rankings, kept up to date by a subscription
         self.game_time = 0  # ゲーム経過時間
         
         # Audio generation variables
@@ -78,12 +102,13 @@ class Game:
         self.audio_generation_complete = False
         self.audio_generator = None
         
-        # Initialize fonts with Japanese support
+        # Initialize fonts with Japanese support (the loading screen needs them right away)
         from font_manager import font_manager
         self.font_manager = font_manager
         self.font_large = self.font_manager.get_font(72)
         self.font_medium = self.font_manager.get_font(48)
         self.font_small = self.font_manager.get_font(36)
+        startup_profiler.mark('fonts')
         
         # Colors
         self.WHITE = (255, 255, 255)
@@ -94,8 +119,60 @@ class Game:
         self.GRAY = (128, 128, 128)
         self.YELLOW = (255, 255, 0)
         
+        # Everything else loads on worker threads behind the loading screen
+        # (the mixer and sounds are added by audio_manager.start() after the first frame)
+        self.asset_loader = AssetLoader()
+        self.asset_loader.add('sprite atlas', sprite_atlas.load_or_bake, self.render_scale)
+        self.asset_loader.add('glyph atlas', self.font_manager.load_glyph_atlas)
+        self.asset_loader.add('background', self._load_space_background)
+        self.asset_loader.add('ranking', self._load_ranking)
+        # The baked game BGM is only needed without the layered music engine, known once loading is done
+        self.asset_loader.add('audio files', check_audio_files_exist, not self.audio_manager.sfx_in_memory, False)
+        startup_profiler.mark('asset loader')
+    
+    def _load_space_background(self):
+        """Create the space background (asset loader job)."""
+        self.space_background = SpaceBackground(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+    
+    def _load_ranking(self):
+        """Load the rankings (asset loader job)."""
+        self.ranking_manager = RankingManager(backend=self.ranking_backend, leaderboard_url=self.leaderboard_url)
+        self.ranking_manager.subscribe(self._on_rankings_changed)
+    
+    def _on_rankings_changed(self):
+        """Recheck the high score when a score is added or another instance's scores are loaded."""
+        self.is_new_high_score = self.ranking_manager.is_high_score(self.score)
+    
+    def _finish_loading(self):
+        """Leave the loading screen once every asset loader job has finished."""
+        self.asset_loader.shutdown()
+        
+        # A failed job leaves its asset unset; build a default on the main thread instead
+        if self.asset_loader.errors:
+            print(f"⚠️ Using fallbacks for failed loading jobs: {', '.join(self.asset_loader.errors)}")
+        if self.space_background is None:
+            self.space_background = SpaceBackground(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+        if self.ranking_manager is None:
+            # e.g. a corrupt rankings.db: keep this session's scores in the JSON rankings
+            self.ranking_manager = RankingManager()
+            self.ranking_manager.subscribe(self._on_rankings_changed)
+        
         # Check if audio files exist, if not, generate them
-        self._check_and_generate_audio_files()
+        files_exist, missing_files = self.asset_loader.get_result('audio files') or (False, [])
+        if files_exist and (not self.audio_manager.sfx_in_memory or self.audio_manager.music_engine is None):
+            # The mixer fell back to SFX files, or to the game BGM file without stems; those are generated too
+            files_exist, missing_files = check_audio_files_exist(
+                include_sfx=not self.audio_manager.sfx_in_memory,
+                include_game_bgm=self.audio_manager.music_engine is None)
+        self._check_and_generate_audio_files(files_exist, missing_files)
+    
+    def wait_for_loading(self):
+        """Load everything without drawing the loading screen (for benchmarks and tests)."""
+        if self.state != GameState.LOADING:
+            return
+        self.audio_manager.start(loader=self.asset_loader)
+        self.asset_loader.wait()
+        self._finish_loading()
         
     def init_game(self):
         """Initialize game objects for a new game."""
@@ -112,19 +189,54 @@ class Game:
         self.special_attacks = 2  # 1ライフあたり2個まで
         self.game_time = 0
         
-    def _check_and_generate_audio_files(self):
-        """Check if audio files exist and generate them if needed."""
-        files_exist, missing_files = check_audio_files_exist()
+    def set_render_scale(self, scale, load_atlas=True):
+        """Set the internal render resolution of the game area.
+        
+        Gameplay coordinates and collisions always stay at full resolution;
+        only the game area drawing is done on a smaller surface and scaled
+        up to the screen when it is presented. With load_atlas=False the
+        sprite atlas for the scale is left to the asset loader.
+        """
+        self.render_scale = max(0.25, min(1.0, scale))
+        game_rect = pygame.Rect(0, 0, self.GAME_AREA_WIDTH, self.SCREEN_HEIGHT)
+        self.game_area_view = self.screen.subsurface(game_rect)
+        
+        if self.render_scale >= 1.0:
+            # Native resolution: draw straight into the game area of the screen
+            self.render_scale = 1.0
+            self.game_surface = self.game_area_view
+        else:
+            render_size = (int(self.GAME_AREA_WIDTH * self.render_scale),
+                           int(self.SCREEN_HEIGHT * self.render_scale))
+            self.game_surface = pygame.Surface(render_size).convert()
         
+        # Bake (or load from the cache) the sprite atlas for this scale
+        if load_atlas:
+            sprite_atlas.load_or_bake(self.render_scale)
+        
+        print(f"🖥️ Game area render scale: {self.render_scale:.2f} "
+              f"({self.game_surface.get_width()}x{self.game_surface.get_height()})")
+    
+    def cycle_render_scale(self):
+        """Switch to the next internal render resolution."""
+        scales = self.RENDER_SCALES
+        if self.render_scale in scales:
+            next_scale = scales[(scales.index(self.render_scale) + 1) % len(scales)]
+        else:
+            next_scale = scales[0]
+        self.set_render_scale(next_scale)
+    
+    def _check_and_generate_audio_files(self, files_exist, missing_files):
+        """Go to the menu if the audio files exist, generate them otherwise."""
         if not files_exist:
-            print(f"⚠️ Missing audio files: {len(missing_files)} files")
+            print(f"⚠️ Missing or outdated audio files: {len(missing_files)} files")
             print("🎵 Starting audio file generation...")
             self.change_state(GameState.AUDIO_GENERATION)
             self._start_audio_generation()
         else:
             print("✅ All audio files found")
             # Start menu BGM
-            self.audio_manager.play_bgm('menu')
+            self.change_state(GameState.MENU)
     
     def _start_audio_generation(self):
         """Start audio file generation in a separate thread."""
@@ -147,7 +259,9 @@ class Game:
     def _generate_audio_files_thread(self):
         """Generate audio files in a separate thread."""
         try:
-            success = self.audio_generator.generate_all_audio()
+            success = self.audio_generator.generate_all_audio(
+                include_sfx=not self.audio_manager.sfx_in_memory,
+                include_game_bgm=self.audio_manager.music_engine is None)
             if success:
                 self.audio_generation_complete = True
                 print("✅ Audio file generation completed successfully")
@@ -163,12 +277,17 @@ class Game:
             self.previous_state = self.state
             self.state = new_state
             
+            # Pick up scores from other game instances sharing the rankings
+            if new_state in (GameState.MENU, GameState.GAME_OVER, GameState.RANKING):
+                self.ranking_manager.refresh()
+            
             # Change BGM based on new state
             if new_state == GameState.MENU:
                 self.audio_manager.play_bgm('menu')
             elif new_state == GameState.PLAYING:
-                self.audio_manager.play_bgm('game')
+                self.audio_manager.play_layered_music()
             elif new_state == GameState.GAME_OVER:
+                self.is_new_high_score = self.ranking_manager.is_high_score(self.score)
                 self.audio_manager.play_bgm('game_over', loops=0)  # Play once
             elif new_state == GameState.RANKING:
                 self.audio_manager.play_bgm('ranking')
@@ -184,7 +303,13 @@ class Game:
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+                if event.key == pygame.K_F2:
+                    # The loader may still be baking the atlas for the current scale
+                    if self.state != GameState.LOADING:
+                        self.cycle_render_scale()
+                elif event.key == pygame.K_F3:
+                    self.show_debug_hud = not self.show_debug_hud
+                elif event.key == pygame.K_ESCAPE:
                     if self.state == GameState.PLAYING:
                         self.change_state(GameState.MENU)
                     else:
@@ -200,7 +325,7 @@ class Game:
                 elif self.state == GameState.GAME_OVER:
                     if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
                         self.audio_manager.play_sfx('menu_select')
-                        if self.ranking_manager.is_high_score(self.score):
+                        if self.is_new_high_score:
                             self.change_state(GameState.NAME_INPUT)
                         else:
                             self.change_state(GameState.MENU)
@@ -208,6 +333,9 @@ class Game:
                     if event.key == pygame.K_RETURN or event.key == pygame.K_ESCAPE:
                         self.audio_manager.play_sfx('menu_select')
                         self.change_state(GameState.MENU)
+                    elif event.key == pygame.K_TAB and self.ranking_manager.leaderboard is not None:
+                        self.audio_manager.play_sfx('menu_move')
+                        self.show_online_rankings = not self.show_online_rankings
                 elif self.state == GameState.NAME_INPUT:
                     self.ranking_manager.handle_name_input(event, self.score)
                     if self.ranking_manager.name_input_complete:
@@ -225,6 +353,12 @@ class Game:
         """Update game logic."""
         dt = self.clock.get_time() / 1000.0  # Delta time in seconds
         
+        if self.state == GameState.LOADING:
+            # Sounds are only added to the loader once the first frame is on screen
+            if self.audio_manager.started and self.asset_loader.is_done():
+                self._finish_loading()
+            return
+        
         # Update space background
         self.space_background.update(dt)
         
@@ -253,7 +387,7 @@ class Game:
                 if player_bullet:
                     self.bullet_manager.add_player_bullet(player_bullet)
                     # Play shooting sound effect
-                    self.audio_manager.play_sfx('shoot')
+                    self.audio_manager.play_sfx_with_variation('shoot', 0.05)
             
             # Handle special attack - 修正: 爆弾型必殺技
             if keys[pygame.K_x] and self.special_attacks > 0:
@@ -267,8 +401,6 @@ class Game:
                     
                     # Debug: 爆弾使用をコンソールに出力
                     print(f"爆弾使用！残り: {self.special_attacks}/2")
-                    # Play bomb sound effect
-                    self.audio_manager.play_sfx('bomb')
             
             # Enemy shooting
             enemy_bullets = self.enemy_manager.get_bullets()
@@ -278,6 +410,9 @@ class Game:
             # Collision detection
             self.check_collisions()
             
+            # Layered music follows how busy the screen is
+            self.audio_manager.set_music_intensity(self.get_battle_intensity())
+            
             # Check game over
             if self.lives <= 0:
                 self.change_state(GameState.GAME_OVER)
@@ -286,15 +421,23 @@ class Game:
         elif self.state == GameState.GAME_OVER:
             # Auto transition after 3 seconds if not high score
             if pygame.time.get_ticks() - self.game_over_timer > 3000:
-                if not self.ranking_manager.is_high_score(self.score):
+                if not self.is_new_high_score:
                     self.change_state(GameState.MENU)
         
         elif self.state == GameState.AUDIO_GENERATION:
             # Check if audio generation is complete
             if self.audio_generation_complete and not hasattr(self, '_audio_completion_handled'):
                 self._audio_completion_handled = True
+                if not self.audio_manager.sfx_in_memory:
+                    self.audio_manager.reload_sound_effects()
                 print("🎵 Audio generation completed, ready to continue")
     
+    def get_battle_intensity(self):
+        """Get the battle intensity (0.0 to 1.0) from the enemy and bullet counts."""
+        enemy_load = len(self.enemy_manager.enemies) / 6
+        bullet_load = len(self.bullet_manager.enemy_bullets) / 300
+        return min(1.0, 0.5 * min(1.0, enemy_load) + 0.5 * min(1.0, bullet_load))
+    
     def check_collisions(self):
         """Check all collision detections."""
         # Player bullets vs enemies
@@ -307,7 +450,7 @@ class Game:
                     self.effect_manager.add_explosion(enemy.x, enemy.y)
                     self.score += 100
                     # Play explosion sound effect
-                    self.audio_manager.play_sfx('explosion')
+                    self.audio_manager.play_sfx_with_variation('explosion')
                     
                     # 修正: アイテムドロップ追加
                     item_count = enemy.get_item_drop_count()
@@ -328,7 +471,7 @@ class Game:
                     self.effect_manager.add_explosion(enemy.x, enemy.y)
                     self.score += 100
                     # Play explosion sound effect
-                    self.audio_manager.play_sfx('explosion')
+                    self.audio_manager.play_sfx_with_variation('explosion')
                     
                     # アイテムドロップ
                     item_count = enemy.get_item_drop_count()
@@ -401,43 +544,38 @@ class Game:
         # Fill screen with black first
         self.screen.fill((0, 0, 0))
         
-        # Create clipping rectangle for game area
-        game_rect = pygame.Rect(0, 0, self.GAME_AREA_WIDTH, self.SCREEN_HEIGHT)
-        
-        # Set clipping area for game objects
-        self.screen.set_clip(game_rect)
+        # Game objects are drawn on the game area surface, which is either the
+        # game area of the screen itself or a smaller internal render target
+        surface = self.game_surface
+        scale = self.render_scale
+        surface.fill((0, 0, 0))  # Black background
         
-        # Draw space background (clipped to game area)
-        # Create a temporary surface for the game area background
-        game_bg_surface = pygame.Surface((self.GAME_AREA_WIDTH, self.SCREEN_HEIGHT))
-        game_bg_surface.fill((0, 0, 0))  # Black background
+        # Draw space background (only the elements inside the game area)
+        self.space_background.draw_game_area(surface, self.GAME_AREA_WIDTH, scale)
         
-        # Draw stars only in game area
-        for star in self.space_background.stars:
-            if star.x < self.GAME_AREA_WIDTH:  # Only draw stars in game area
-                star.draw(game_bg_surface)
+        # Draw game objects
+        self.player.draw(surface, scale)
+        self.enemy_manager.draw(surface, scale)
+        self.bullet_manager.draw(surface, scale)
         
-        # Draw nebulae in game area
-        for nebula in self.space_background.nebulae:
-            if nebula.x < self.GAME_AREA_WIDTH:
-                nebula.draw(game_bg_surface)
+        # Draw the queued ship and bullet glows in one additive pass, under the effects
+        glow_renderer.flush(surface)
+        self.glows_drawn = glow_renderer.last_batch_size
         
-        # Draw planets in game area
-        for planet in self.space_background.planets:
-            if planet.x < self.GAME_AREA_WIDTH:
-                planet.draw(game_bg_surface)
+        self.effect_manager.draw(surface, scale)
         
-        self.screen.blit(game_bg_surface, (0, 0))
+        # Particle glows of the effects get a second pass on top
+        glow_renderer.flush(surface)
+        self.glows_drawn += glow_renderer.last_batch_size
         
-        # Draw game objects (clipped to game area)
-        self.player.draw(self.screen)
-        self.enemy_manager.draw(self.screen)
-        self.bullet_manager.draw(self.screen)
-        self.effect_manager.draw(self.screen)
-        self.item_manager.draw(self.screen)
+        self.item_manager.draw(surface, scale)
         
-        # Remove clipping
-        self.screen.set_clip(None)
+        # Present the internal render target at full size
+        if surface is not self.game_area_view:
+            if self.smooth_scaling:
+                pygame.transform.smoothscale(surface, self.game_area_view.get_size(), self.game_area_view)
+            else:
+                pygame.transform.scale(surface, self.game_area_view.get_size(), self.game_area_view)
         
         # Draw game area border
         pygame.draw.line(self.screen, (100, 150, 255), 
@@ -473,7 +611,7 @@ class Game:
         self.screen.blit(score_text, score_rect)
         
         # Continue instruction
-        if self.ranking_manager.is_high_score(self.score):
+        if self.is_new_high_score:
             continue_text = self.font_manager.render_text("Enterキーで名前を入力", 28, self.WHITE)
         else:
             continue_text = self.font_manager.render_text("Enterキーで続行", 28, self.WHITE)
@@ -492,17 +630,37 @@ class Game:
         self.screen.blit(overlay, (0, 0))
         
         # Title
-        title = self.font_manager.render_text("ハイスコア", 48, self.WHITE)
+        if self.show_online_rankings:
+            title = self.font_manager.render_text("オンラインランキング", 48, self.WHITE)
+            rankings = self.ranking_manager.get_online_rankings() or []
+        else:
+            title = self.font_manager.render_text("ハイスコア", 48, self.WHITE)
+            rankings = self.ranking_manager.get_rankings()
         title_rect = title.get_rect(center=(self.SCREEN_WIDTH // 2, 80))
         self.screen.blit(title, title_rect)
         
+        if self.show_online_rankings and not self.ranking_manager.leaderboard.online:
+            offline_text = self.font_manager.render_text("サーバーに接続できません", 28, self.YELLOW)
+            offline_rect = offline_text.get_rect(center=(self.SCREEN_WIDTH // 2, 120))
+            self.screen.blit(offline_text, offline_rect)
+        
         # Rankings
-        rankings = self.ranking_manager.get_rankings()
         for i, (name, score) in enumerate(rankings):
             rank_text = self.font_manager.render_text(f"{i+1:2d}位. {name:<10} {score:>6d}点", 32, self.WHITE)
             rank_rect = rank_text.get_rect(center=(self.SCREEN_WIDTH // 2, 150 + i * 35))
             self.screen.blit(rank_text, rank_rect)
         
+        # Online leaderboard status
+        leaderboard = self.ranking_manager.leaderboard
+        if leaderboard is not None:
+            if leaderboard.pending_count > 0:
+                pending_text = self.font_manager.render_text(f"送信待ち: {leaderboard.pending_count}件", 20, self.YELLOW)
+                pending_rect = pending_text.get_rect(center=(self.SCREEN_WIDTH // 2, 490))
+                self.screen.blit(pending_text, pending_rect)
+            switch_text = self.font_manager.render_text("Tabキーでローカル/オンライン切替", 20, self.WHITE)
+            switch_rect = switch_text.get_rect(center=(self.SCREEN_WIDTH // 2, 515))
+            self.screen.blit(switch_text, switch_rect)
+        
         # Back instruction
         back_text = self.font_manager.render_text("EnterまたはESCキーで戻る", 28, self.WHITE)
         back_rect = back_text.get_rect(center=(self.SCREEN_WIDTH // 2, 550))
@@ -598,6 +756,58 @@ class Game:
             wait_rect = wait_text.get_rect(center=(self.SCREEN_WIDTH // 2, 450))
             self.screen.blit(wait_text, wait_rect)
     
+    def draw_loading(self):
+        """Draw the loading screen."""
+        self.screen.fill(self.BLACK)
+        
+        # Title
+        title = self.font_manager.render_text("読み込み中...", 48, self.WHITE)
+        title_rect = title.get_rect(center=(self.SCREEN_WIDTH // 2, 300))
+        self.screen.blit(title, title_rect)
+        
+        # Progress bar
+        completed, total, last = self.asset_loader.get_progress()
+        progress_width = 400
+        progress_height = 20
+        progress_x = (self.SCREEN_WIDTH - progress_width) // 2
+        progress_y = 370
+        pygame.draw.rect(self.screen, self.GRAY, 
+                       (progress_x, progress_y, progress_width, progress_height))
+        if completed > 0:
+            fill_width = int((completed / total) * progress_width)
+            pygame.draw.rect(self.screen, self.GREEN, 
+                           (progress_x, progress_y, fill_width, progress_height))
+        
+        # Last finished job
+        if last:
+            progress_label = self.font_manager.render_text(f"{last} ({completed}/{total})", 20, self.WHITE)
+            progress_label_rect = progress_label.get_rect(center=(self.SCREEN_WIDTH // 2, progress_y + progress_height + 25))
+            self.screen.blit(progress_label, progress_label_rect)
+    
+    def draw_debug_hud(self):
+        """Draw frame timing and detail level information."""
+        lines = [
+            f"FPS: {self.clock.get_fps():.1f}",
+            f"Frame: {self.last_frame_time_ms:.1f} ms (avg {self.quality_governor.get_average_frame_time():.1f})",
+            f"Quality: {self.quality_governor.get_level_name()}",
+            f"Render scale: {self.render_scale:.2f}",
+            f"Glow sprites: {self.glows_drawn}"
+        ]
+        if self.bullet_manager:
+            lines.append(f"Bullets: {len(self.bullet_manager.enemy_bullets)} ({self.bullet_manager.get_enemy_bullet_lod_name()})")
+        
+        sfx_stats = self.audio_manager.get_sfx_stats()
+        lines.append(f"SFX: {sfx_stats['played']} played, {sfx_stats['coalesced']} coalesced, {sfx_stats['dropped']} dropped")
+        
+        hud_panel = pygame.Surface((340, len(lines) * 18 + 10))
+        hud_panel.set_alpha(160)
+        hud_panel.fill(self.BLACK)
+        self.screen.blit(hud_panel, (5, 5))
+        
+        for i, line in enumerate(lines):
+            text = self.font_manager.render_text(line, 16, self.GREEN)
+            self.screen.blit(text, (10, 10 + i * 18))
+    
     def draw(self):
         """Draw everything to the screen."""
         if self.state == GameState.MENU:
@@ -612,6 +822,11 @@ class Game:
             self.draw_name_input()
         elif self.state == GameState.AUDIO_GENERATION:
             self.draw_audio_generation()
+        elif self.state == GameState.LOADING:
+            self.draw_loading()
+        
+        if self.show_debug_hud:
+            self.draw_debug_hud()
         
         # Update display
         pygame.display.flip()
@@ -619,7 +834,28 @@ class Game:
     def run(self):
         """Main game loop."""
         while self.running:
+            frame_start = time.perf_counter()
             self.handle_events()
             self.update()
+            self.audio_manager.flush_sfx()
+            self.audio_manager.update_music()
             self.draw()
+            
+            if not self.audio_manager.started:
+                # The first frame is on screen; open the mixer and load sounds with the other assets
+                startup_profiler.first_frame()
+                self.audio_manager.start(loader=self.asset_loader)
+            
+            # Feed the frame's work time (without the tick wait) to the quality governor
+            self.last_frame_time_ms = (time.perf_counter() - frame_start) * 1000
+            self.quality_governor.record_frame(self.last_frame_time_ms)
+            telemetry.set_gauge('frame_time_ms_avg', round(self.quality_governor.get_average_frame_time(), 2))
+            
             self.clock.tick(self.FPS)
+        
+        for name, value in self.audio_manager.get_sfx_stats().items():
+            telemetry.set_gauge(f'sfx_{name}', value)
+        if self.ranking_manager is not None:
+            # Waits for a score still being written
+            self.ranking_manager.close()
+        telemetry.save()
@@ -0,0 +1,101 @@
+"""
+Glow renderer for QGamen_DanmakuShooting
+Draws glowing objects with pre-computed radial falloff sprites using additive
+blending, batched into a single pass per frame
+"""
+
+import pygame
+from collections import OrderedDict
+
+class GlowRenderer:
+    """Batches additive glow sprites and draws them in one pass."""
+    
+    def __init__(self):
+        """Initialize the glow renderer."""
+        # Pre-computed falloff sprites: (color, size, core size) -> surface, least recent first
+        self.sprite_cache = OrderedDict()
+        self.sprite_cache_size = 256
+        
+        # Glows queued for the current frame
+        self.batch = []
+        
+        # Number of glows drawn by the last flush (one blit each)
+        self.last_batch_size = 0
+    
+    def get_sprite(self, color, size, core_size):
+        """Get a radial falloff sprite, building it on first use.
+        
+        size is the (width, height) of the outer glow and core_size the
+        (width, height) of the solid core. Circles use equal width and
+        height; the player's laser beam uses an elongated glow.
+        """
+        key = (color, size, core_size)
+        sprite = self.sprite_cache.get(key)
+        if sprite is not None:
+            self.sprite_cache.move_to_end(key)
+            return sprite
+        
+        sprite = self._build_sprite(color, size, core_size)
+        self.sprite_cache[key] = sprite
+        if len(self.sprite_cache) > self.sprite_cache_size:
+            self.sprite_cache.popitem(last=False)
+        return sprite
+    
+    def _build_sprite(self, color, size, core_size):
+        """Rasterize a glow sprite from nested ellipses of rising intensity."""
+        width, height = max(1, size[0]), max(1, size[1])
+        core_width, core_height = min(core_size[0], width), min(core_size[1], height)
+        
+        # Black adds nothing under BLEND_ADD, so no alpha channel is needed
+        sprite = pygame.Surface((width, height))
+        sprite.fill((0, 0, 0))
+        center = (width / 2, height / 2)
+        
+        # Halo: smooth falloff from the outer edge towards the core
+        steps = max(1, (max(width - core_width, height - core_height) + 1) // 2)
+        for i in range(steps):
+            t = i / steps  # 0 at the outer edge
+            intensity = 0.8 * t ** 1.5
+            halo_color = tuple(int(c * intensity) for c in color)
+            rect = pygame.Rect(0, 0, width - (width - core_width) * t, height - (height - core_height) * t)
+            rect.center = center
+            pygame.draw.ellipse(sprite, halo_color, rect)
+        
+        # Solid core with a bright center
+        core_rect = pygame.Rect(0, 0, max(1, core_width), max(1, core_height))
+        core_rect.center = center
+        pygame.draw.ellipse(sprite, color, core_rect)
+        
+        bright_color = tuple(min(255, c + 50) for c in color)
+        bright_rect = pygame.Rect(0, 0, max(1, core_width // 2), max(1, core_height // 2))
+        bright_rect.center = center
+        pygame.draw.ellipse(sprite, bright_color, bright_rect)
+        
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()
+        return sprite
+    
+    def add(self, x, y, color, size, core_size):
+        """Queue a glow centered on (x, y) in render coordinates."""
+        sprite = self.get_sprite(color, size, core_size)
+        self.batch.append((sprite, (x - size[0] // 2, y - size[1] // 2), None, pygame.BLEND_ADD))
+    
+    def add_circle(self, x, y, color, glow_radius, core_radius):
+        """Queue a round glow with the given outer and core radius."""
+        glow_diameter = max(1, int(glow_radius * 2))
+        core_diameter = max(1, int(core_radius * 2))
+        self.add(x, y, color, (glow_diameter, glow_diameter), (core_diameter, core_diameter))
+    
+    def flush(self, screen):
+        """Draw every queued glow with a single additive blits() call."""
+        self.last_batch_size = len(self.batch)
+        if self.batch:
+            screen.blits(self.batch, doreturn=False)
+            self.batch = []
+    
+    def clear(self):
+        """Drop queued glows without drawing them."""
+        self.batch = []
+
+# Global glow renderer instance
+glow_renderer = GlowRenderer()
@@ -0,0 +1,243 @@
+"""
+Glyph atlas for QGamen_DanmakuShooting
+Pre-rasterizes the glyphs of the static UI text at the sizes it is drawn in,
+so text is assembled from atlas blits instead of TrueType rendering
+"""
+
+import pygame
+import os
+import ast
+import json
+import hashlib
+import threading
+
+# Bump when the atlas layout or file format changes
+GLYPH_ATLAS_VERSION = 1
+
+# Always baked at every size: digits and ASCII for scores, counters and typed names
+ASCII_CHARS = ''.join(chr(code) for code in range(0x20, 0x7f))
+
+def collect_ui_text(source_dir):
+    """Collect the characters passed to render_text() in the source, per font size.
+    
+    String literals, the literal parts of f-strings and lists of literals
+    iterated by a for loop are collected; the values formatted into
+    f-strings are expected to be covered by ASCII_CHARS.
+    """
+    charsets = {}
+    for filename in sorted(os.listdir(source_dir)):
+        if not filename.endswith('.py'):
+            continue
+        try:
+            with open(os.path.join(source_dir, filename), 'r', encoding='utf-8') as f:
+                source = f.read()
+            if 'render_text' not in source:
+                continue
+            tree = ast.parse(source, filename)
+        except (OSError, SyntaxError):
+            continue
+        
+        # Names bound to lists of strings, and loop variables iterating over them
+        lists = {}
+        loop_sources = {}
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and isinstance(node.value, (ast.List, ast.Tuple)):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        lists[target.id] = node.value.elts
+            elif (isinstance(node, ast.For) and isinstance(node.target, ast.Name)
+                    and isinstance(node.iter, ast.Name)):
+                loop_sources[node.target.id] = node.iter.id
+        
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr == 'render_text' and len(node.args) >= 2
+                    and isinstance(node.args[1], ast.Constant) and isinstance(node.args[1].value, int)):
+                chars = charsets.setdefault(node.args[1].value, set())
+                chars.update(_literal_chars(node.args[0], lists, loop_sources))
+    
+    return {size: ''.join(sorted(chars | set(ASCII_CHARS))) for size, chars in charsets.items()}
+
+def _literal_chars(node, lists, loop_sources):
+    """Get the characters an expression is known to contain."""
+    chars = set()
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        chars.update(node.value)
+    elif isinstance(node, ast.JoinedStr):
+        for value in node.values:
+            chars.update(_literal_chars(value, lists, loop_sources))
+    elif isinstance(node, ast.BinOp):
+        chars.update(_literal_chars(node.left, lists, loop_sources))
+        chars.update(_literal_chars(node.right, lists, loop_sources))
+    elif isinstance(node, ast.Name) and node.id in loop_sources:
+        for element in lists.get(loop_sources[node.id], []):
+            chars.update(_literal_chars(element, lists, loop_sources))
+    return chars
+
+class GlyphAtlas:
+    """Bakes UI glyphs into one cached atlas surface and assembles text from it."""
+    
+    def __init__(self, cache_dir=None, source_dir=None):
+        """Initialize the glyph atlas."""
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache')
+        self.cache_dir = cache_dir
+        self.source_dir = source_dir or os.path.dirname(os.path.abspath(__file__))
+        self.atlas_width = 1024
+        self.padding = 1
+        
+        # Baked atlas: white glyphs with alpha, and size -> {character: area rect}
+        self.sheet = None
+        self.index = {}
+        self.font_path = None
+        self.loaded = False
+        self.lock = threading.Lock()  # Held while an asset loader thread builds the atlas
+    
+    def get_cache_key(self, font_path):
+        """Hash the font file and the UI source files, whose strings make up the atlas."""
+        hasher = hashlib.sha1()
+        hasher.update(f"v{GLYPH_ATLAS_VERSION}:{pygame.version.ver}:{font_path}".encode('utf-8'))
+        
+        paths = [font_path] if font_path else []
+        paths += [os.path.join(self.source_dir, name) for name in sorted(os.listdir(self.source_dir))
+                  if name.endswith('.py')]
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                hasher.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+            except OSError:
+                continue
+        
+        return hasher.hexdigest()[:16]
+    
+    def load_or_build(self, font_path, force=False, blocking=True):
+        """Load the atlas for a font from the cache, building it if needed.
+        
+        With blocking=False, returns False instead of waiting while another
+        thread is building the atlas.
+        """
+        if self.loaded and self.font_path == font_path and not force:
+            return True
+        
+        if not self.lock.acquire(blocking):
+            return False
+        try:
+            if not (self.loaded and self.font_path == font_path and not force):
+                self._load_or_build(font_path, force)
+        finally:
+            self.lock.release()
+        return True
+    
+    def _load_or_build(self, font_path, force):
+        """Load or build the atlas while holding the lock."""
+        cache_key = self.get_cache_key(font_path)
+        image_path = os.path.join(self.cache_dir, f"glyph_atlas_{cache_key}.png")
+        index_path = os.path.join(self.cache_dir, f"glyph_atlas_{cache_key}.json")
+        
+        atlas = None if force else self._load_cached(image_path, index_path, cache_key)
+        if atlas is None:
+            atlas = self._build(font_path)
+            self._save_cached(atlas, image_path, index_path, cache_key)
+            glyph_count = sum(len(glyphs) for glyphs in atlas[1].values())
+            print(f"🔤 Baked glyph atlas ({glyph_count} glyphs, {len(atlas[1])} sizes)")
+        
+        self.sheet, self.index = atlas
+        self.font_path = font_path
+        self.loaded = True
+    
+    def _load_cached(self, image_path, index_path, cache_key):
+        """Load a previously baked atlas if it matches the cache key."""
+        if not (os.path.exists(image_path) and os.path.exists(index_path)):
+            return None
+        
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('key') != cache_key:
+                return None
+            
+            sheet = self._prepare_surface(pygame.image.load(image_path))
+            index = {int(size): {char: pygame.Rect(rect) for char, rect in glyphs.items()}
+                     for size, glyphs in data['glyphs'].items()}
+            return sheet, index
+        except Exception as e:
+            print(f"⚠️ Failed to load cached glyph atlas: {e}")
+            return None
+    
+    def _save_cached(self, atlas, image_path, index_path, cache_key):
+        """Persist a baked atlas as a PNG plus a JSON index."""
+        sheet, index = atlas
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            pygame.image.save(sheet, image_path)
+            data = {
+                'key': cache_key,
+                'glyphs': {str(size): {char: [rect.x, rect.y, rect.width, rect.height]
+                                       for char, rect in glyphs.items()}
+                           for size, glyphs in index.items()}
+            }
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            # A read-only install still works, the atlas is just baked every launch
+            print(f"⚠️ Failed to save glyph atlas cache: {e}")
+    
+    def _build(self, font_path):
+        """Rasterize the glyphs of every UI size into a new atlas surface."""
+        glyphs = []
+        for size, chars in sorted(collect_ui_text(self.source_dir).items()):
+            font = pygame.font.Font(font_path, size)
+            for char in chars:
+                try:
+                    glyphs.append((size, char, font.render(char, True, (255, 255, 255))))
+                except pygame.error:
+                    continue  # Not drawable in this font, render_text falls back to TrueType
+        
+        # Shelf packing in size order; glyphs of one size share a height
+        pad = self.padding
+        index = {}
+        x = y = shelf_height = 0
+        for size, char, glyph in glyphs:
+            width, height = glyph.get_size()
+            if x + width + pad > self.atlas_width:
+                x = 0
+                y += shelf_height + pad
+                shelf_height = 0
+            index.setdefault(size, {})[char] = pygame.Rect(x, y, width, height)
+            x += width + pad
+            shelf_height = max(shelf_height, height)
+        
+        sheet = pygame.Surface((self.atlas_width, max(1, y + shelf_height)), pygame.SRCALPHA)
+        for size, char, glyph in glyphs:
+            sheet.blit(glyph, index[size][char])
+        
+        return self._prepare_surface(sheet), index
+    
+    def _prepare_surface(self, surface):
+        """Convert the atlas to the display format for fast blitting."""
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+    
+    def render(self, text, size, color):
+        """Assemble text from atlas glyphs, or return None if a glyph is missing."""
+        glyphs = self.index.get(size)
+        if not glyphs or not text:
+            return None
+        
+        try:
+            areas = [glyphs[char] for char in text]
+        except KeyError:
+            return None  # Dynamic text with characters outside the atlas
+        
+        surface = pygame.Surface((sum(area.width for area in areas), areas[0].height), pygame.SRCALPHA)
+        x = 0
+        blits = []
+        for area in areas:
+            blits.append((self.sheet, (x, 0), area))
+            x += area.width
+        surface.blits(blits, doreturn=False)
+        
+        # Glyphs are white, so multiplying tints them without touching the alpha
+        surface.fill((*color[:3], 255), special_flags=pygame.BLEND_RGBA_MULT)
+        return surface
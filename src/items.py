@@ -5,6 +5,30 @@ Item system for QGamen_DanmakuShooting
 import pygame
 import random
 import math
+from functools import partial
+from sprite_atlas import sprite_atlas
+
+# Procedural art parameters, baked into the sprite atlas
+SCORE_ITEM_ART = {'color': (255, 255, 0), 'center': (255, 255, 255), 'size': 8}  # Yellow
+
+def draw_score_item(screen, x, y, scale, art):
+    """Draw a score item (small diamond) centered on (x, y)."""
+    half_size = art['size'] // 2 * scale
+    
+    # Draw as a small diamond
+    points = [
+        (x, y - half_size),      # Top
+        (x + half_size, y),      # Right
+        (x, y + half_size),      # Bottom
+        (x - half_size, y)       # Left
+    ]
+    pygame.draw.polygon(screen, art['color'], points)
+    
+    # Add a small white center
+    pygame.draw.circle(screen, art['center'], (x, y), max(1, int(2 * scale)))
+
+sprite_atlas.register('score_item', (-5, -5, 5, 5),
+                      partial(draw_score_item, art=SCORE_ITEM_ART), SCORE_ITEM_ART)
 
 class ScoreItem:
     """Score item that gives points when collected."""
@@ -50,24 +74,19 @@ class ScoreItem:
         """Check if item should be removed."""
         return self.timer >= self.lifetime or self.y > screen_height + 50
     
-    def draw(self, screen):
-        """Draw the score item."""
+    def is_visible(self):
+        """Check if the item is shown this frame."""
         # Blink faster as it approaches expiration
         if self.timer > self.lifetime * 0.8:
-            if (self.blink_timer // 5) % 2 == 0:
-                return  # Don't draw (blinking effect)
-        
-        # Draw as a small diamond
-        points = [
-            (self.x, self.y - self.height // 2),      # Top
-            (self.x + self.width // 2, self.y),       # Right
-            (self.x, self.y + self.height // 2),      # Bottom
-            (self.x - self.width // 2, self.y)        # Left
-        ]
-        pygame.draw.polygon(screen, self.color, points)
+            return (self.blink_timer // 5) % 2 != 0
+        return True
+    
+    def draw(self, screen, scale=1.0):
+        """Draw the score item."""
+        if not self.is_visible():
+            return  # Don't draw (blinking effect)
         
-        # Add a small white center
-        pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), 2)
+        sprite_atlas.blit(screen, 'score_item', self.x * scale, self.y * scale, scale)
 
 class ItemManager:
     """Manages all items in the game."""
@@ -93,10 +112,11 @@ class ItemManager:
             if item.is_expired(self.screen_height):
                 self.score_items.remove(item)
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw all items."""
-        for item in self.score_items:
-            item.draw(screen)
+        sprite_atlas.blit_many(screen, 'score_item',
+                               [(item.x * scale, item.y * scale)
+                                for item in self.score_items if item.is_visible()], scale)
     
     def clear_all(self):
         """Clear all items."""
@@ -0,0 +1,316 @@
+"""
+Leaderboard client for QGamen_DanmakuShooting
+Submits scores to the online leaderboard from a background asyncio loop
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+from telemetry import telemetry
+from ranking_store import RankingWriter, write_json_atomic
+
+class LeaderboardClient:
+    """Sends scores to the leaderboard server in batches without blocking the game loop.
+    
+    The client runs its own event loop on a thread and talks to the server
+    over one keep-alive connection. Submitted scores are kept in a queue
+    file until the server accepts them, so scores made offline (or before
+    a crash) are sent once the server is reachable. Every score carries an
+    id the server deduplicates on, so a batch whose reply was lost is
+    safely sent again. Scores the server refuses outright (HTTP 4xx) are
+    moved to a rejected file instead of blocking the queue.
+    """
+    
+    def __init__(self, url, queue_path, batch_size=20, max_backoff=60.0, timeout=5.0):
+        """Initialize the client and start its thread."""
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.base_path = parts.path.rstrip('/')
+        self.queue_path = queue_path
+        self.rejected_path = os.path.splitext(queue_path)[0] + '_rejected.json'
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        
+        # Touched only by the client thread while it runs (by submit() under submit_lock once it stopped)
+        self.pending = self._load_queue()
+        self.reader = None
+        self.writer = None
+        self.closing = False
+        
+        # Read by the game
+        self.online = False
+        self.top_rankings = None  # (name, score) pairs from the server; None until fetched
+        self.pending_count = len(self.pending)
+        self.sent = 0
+        self.rejected = 0
+        self.last_batch_ms = 0.0
+        
+        self.loop = asyncio.new_event_loop()
+        self.submit_lock = threading.Lock()  # Guards stopped and the hand-over of calls to the loop
+        self.stopped = False
+        self.closed = False
+        self.queue_writer = None     # Saves the queue once the client thread stopped; created on first use
+        self.wakeup = None           # Set on new scores and on close; created on the client thread
+        self.connection_lock = None  # One request at a time on the keep-alive connection
+        self.thread = threading.Thread(target=self._run, name='leaderboard-client', daemon=True)
+        self.thread.start()
+    
+    def submit(self, name, score):
+        """Queue a score for the server (returns immediately)."""
+        entry = {'id': uuid.uuid4().hex, 'name': name, 'score': int(score), 'time': round(time.time(), 3)}
+        with self.submit_lock:
+            if not self.stopped:
+                self.loop.call_soon_threadsafe(self._enqueue, entry)
+                return
+            # The client thread has stopped: keep the score in the queue file for the next run
+            self.pending.append(entry)
+            if self.closed:
+                self._save_queue()  # Shutting down; the game loop is over
+                return
+            
+            # Written on a writer thread so the game loop never waits for fsync
+            self.pending_count = len(self.pending)
+            telemetry.set_gauge('leaderboard_pending', self.pending_count)
+            if self.queue_writer is None:
+                self.queue_writer = RankingWriter(self.queue_path)
+            self.queue_writer.submit({'scores': list(self.pending)})
+    
+    def request_top(self):
+        """Fetch the server's top scores in the background."""
+        with self.submit_lock:
+            if not self.stopped:
+                self.loop.call_soon_threadsafe(self._schedule_top_fetch)
+    
+    def close(self, timeout=2.0):
+        """Stop the client thread; unsent scores stay in the queue file for the next run."""
+        with self.submit_lock:
+            if not self.stopped:
+                self.loop.call_soon_threadsafe(self._begin_close)
+        self.thread.join(timeout)
+        
+        with self.submit_lock:
+            self.closed = True
+            if self.queue_writer is not None:
+                self.queue_writer.close(timeout)
+    
+    def _run(self):
+        """Run the client event loop (client thread)."""
+        asyncio.set_event_loop(self.loop)
+        self.wakeup = asyncio.Event()
+        self.connection_lock = asyncio.Lock()
+        try:
+            self.loop.run_until_complete(self._send_loop())
+            # Top score fetches still in flight
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        except Exception as e:
+            print(f"⚠️ Leaderboard client stopped: {e}")
+        finally:
+            with self.submit_lock:
+                self.stopped = True
+                # Queue the scores handed over just before the loop stopped
+                self.loop.run_until_complete(asyncio.sleep(0))
+            self._disconnect()
+            self.loop.close()
+    
+    def _load_queue(self):
+        """Load scores left unsent by an earlier run."""
+        try:
+            with open(self.queue_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('scores', [])
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"⚠️ Failed to load leaderboard queue: {e}")
+            return []
+    
+    def _save_queue(self):
+        """Persist the unsent scores (client thread)."""
+        self.pending_count = len(self.pending)
+        telemetry.set_gauge('leaderboard_pending', self.pending_count)
+        try:
+            write_json_atomic(self.queue_path, {'scores': self.pending})
+        except Exception as e:
+            print(f"⚠️ Failed to save leaderboard queue: {e}")
+    
+    def _enqueue(self, entry):
+        """Add a submitted score to the queue (client thread)."""
+        self.pending.append(entry)
+        self._save_queue()
+        self.wakeup.set()
+    
+    def _reject_batch(self, batch, status):
+        """Move scores the server refused to the rejected file (client thread)."""
+        print(f"⚠️ Leaderboard rejected {len(batch)} scores (HTTP {status}), moved to {self.rejected_path}")
+        self.rejected += len(batch)
+        telemetry.increment('leaderboard_scores_rejected', len(batch))
+        try:
+            with open(self.rejected_path, 'r', encoding='utf-8') as f:
+                rejected = json.load(f).get('scores', [])
+        except FileNotFoundError:
+            rejected = []
+        except Exception as e:
+            print(f"⚠️ Failed to load rejected leaderboard scores: {e}")
+            rejected = []
+        
+        try:
+            write_json_atomic(self.rejected_path, {'scores': rejected + batch})
+        except Exception as e:
+            print(f"⚠️ Failed to save rejected leaderboard scores: {e}")
+    
+    def _begin_close(self):
+        """Make the send loop exit (client thread)."""
+        self.closing = True
+        self.wakeup.set()
+    
+    def _schedule_top_fetch(self):
+        """Start fetching the top scores (client thread)."""
+        self.loop.create_task(self._fetch_top())
+    
+    async def _send_loop(self):
+        """Send queued scores in batches, backing off while the server is unreachable."""
+        backoff = 1.0
+        singles_left = 0  # Scores of a refused batch still to be sent one at a time
+        last_error = None
+        await self._fetch_top()
+        while not self.closing:
+            if not self.pending:
+                await self.wakeup.wait()
+                self.wakeup.clear()
+                continue
+            
+            batch = self.pending[:1 if singles_left else self.batch_size]
+            try:
+                status = await self._send_batch(batch)
+            except Exception as e:
+                # Anything else (a garbled reply, a bug) is retried too rather than ending the loop
+                if not isinstance(e, (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError)):
+                    if repr(e) != last_error:
+                        print(f"⚠️ Leaderboard send failed: {e!r}")
+                    last_error = repr(e)
+                elif self.online:
+                    print(f"🌐 Leaderboard unreachable, keeping {len(self.pending)} scores queued: {e}")
+                self.online = False
+                telemetry.increment('leaderboard_retries')
+                
+                # Exponential backoff with jitter; a new score or shutdown cuts the wait short
+                delay = backoff * random.uniform(0.5, 1.0)
+                backoff = min(self.max_backoff, backoff * 2)
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self.wakeup.clear()
+                continue
+            
+            backoff = 1.0
+            last_error = None
+            self.online = True
+            if status != 200:
+                if len(batch) > 1:
+                    # One bad score refuses the whole batch; find it by sending them one at a time
+                    singles_left = len(batch)
+                    continue
+                self._reject_batch(batch, status)
+            singles_left = max(0, singles_left - 1)
+            
+            # Only the front of the queue was sent; new scores are appended at the end
+            del self.pending[:len(batch)]
+            self._save_queue()
+            if status == 200:
+                await self._fetch_top()
+    
+    async def _send_batch(self, batch):
+        """Post one batch of scores; returns 200, or the 4xx status of a batch the server refused.
+        
+        Other statuses raise ValueError so the batch is sent again later.
+        """
+        start_time = time.perf_counter()
+        body = json.dumps({'scores': batch}, ensure_ascii=False).encode('utf-8')
+        status, _ = await asyncio.wait_for(self._request('POST', '/scores', body), self.timeout)
+        if 400 <= status < 500:
+            return status
+        if status != 200:
+            raise ValueError(f"HTTP {status}")
+        
+        self.sent += len(batch)
+        self.last_batch_ms = (time.perf_counter() - start_time) * 1000
+        telemetry.increment('leaderboard_scores_sent', len(batch))
+        telemetry.set_gauge('leaderboard_batch_ms', round(self.last_batch_ms, 2))
+        return status
+    
+    async def _fetch_top(self, limit=10):
+        """Fetch the server's top scores; failures leave the last fetched list."""
+        try:
+            status, payload = await asyncio.wait_for(self._request('GET', f'/top?limit={limit}'), self.timeout)
+            if status == 200:
+                self.top_rankings = [(name, score) for name, score in payload['rankings']]
+                self.online = True
+        except Exception:
+            self.online = False
+    
+    async def _request(self, method, path, body=b''):
+        """Send a request on the keep-alive connection and return (status, JSON payload)."""
+        async with self.connection_lock:
+            while True:
+                reused = self.writer is not None
+                if not reused:
+                    self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+                try:
+                    return await self._exchange(method, path, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    self._disconnect()
+                    if not reused:
+                        raise
+                    # The server closed the idle connection; retry once on a new one
+                except BaseException:
+                    # Cancelled by a timeout halfway through: the connection is out of step
+                    self._disconnect()
+                    raise
+    
+    async def _exchange(self, method, path, body):
+        """Write one HTTP/1.1 request and read its response."""
+        head = (f"{method} {self.base_path}{path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: keep-alive\r\n\r\n")
+        self.writer.write(head.encode('latin-1') + body)
+        await self.writer.drain()
+        
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by the server")
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ValueError(f"malformed status line {status_line[:40]!r}")
+        status = int(parts[1])
+        
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        
+        payload = await self.reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            self._disconnect()
+        return status, json.loads(payload) if payload else None
+    
+    def _disconnect(self):
+        """Drop the keep-alive connection."""
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = None
+        self.writer = None
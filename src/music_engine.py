@@ -0,0 +1,163 @@
+"""
+Layered music engine for QGamen_DanmakuShooting
+Mixes short looping stems of the in-game music in real time, bringing layers
+in and out with the intensity of the battle
+"""
+
+import pygame
+import time
+from telemetry import telemetry
+from audio_generator import AudioGenerator, ACTION_STEMS, ACTION_LOOP_SECONDS
+
+# Intensity at which each stem starts fading in, and the intensity span of the fade
+STEM_THRESHOLDS = {
+    'drone': 0.0,
+    'bass': 0.15,
+    'rhythm': 0.35,
+    'arpeggio': 0.6
+}
+STEM_FADE_SPAN = 0.2
+
+class LayeredMusicEngine:
+    """Mixes looping stems into small buffers queued on a dedicated channel.
+    
+    One block plays while the next one waits in the channel queue, so a
+    change of intensity is heard within two blocks and a late frame has a
+    full block of slack before the music runs dry.
+    """
+    
+    def __init__(self, channel_id, base_freq=440, block_seconds=0.25):
+        """Initialize the layered music engine; check available before use."""
+        self.available = False
+        self.active = False
+        self.channel = None
+        self.intensity = 0.0
+        self.volume = 1.0
+        self.position = 0                     # Frame of the loop where the next block starts
+        self.gains = {stem: 0.0 for stem in ACTION_STEMS}
+        self.underruns = 0                    # Times the queue ran dry before update() refilled it
+        self.last_mix_ms = 0.0
+        
+        mixer_format = pygame.mixer.get_init()
+        if mixer_format is None:
+            return
+        
+        generator = AudioGenerator(synthesis_only=True)
+        if not generator.numpy_available:
+            return  # Stems are mixed with NumPy; play_layered_music() falls back to the WAV
+        
+        self.np = generator.np
+        sample_rate, size, self.output_channels = mixer_format
+        if abs(size) != 16:
+            return
+        generator.sample_rate = sample_rate
+        
+        # Stems live only in memory: one loop each, already scaled to the final mix level
+        start_time = time.perf_counter()
+        self.stems = {
+            stem: (generator._generate_action_stem_numpy(ACTION_LOOP_SECONDS, base_freq, stem) * 0.7
+                   ).astype(self.np.float32)
+            for stem in ACTION_STEMS
+        }
+        self.loop_frames = len(self.stems[ACTION_STEMS[0]])
+        self.block_frames = int(block_seconds * sample_rate)
+        self.block_seconds = block_seconds
+        self.channel = pygame.mixer.Channel(channel_id)
+        self.silence = pygame.mixer.Sound(buffer=bytes(64 * self.output_channels * 2))
+        self.available = True
+        
+        synthesis_ms = (time.perf_counter() - start_time) * 1000
+        print(f"🎼 Layered music ready ({len(self.stems)} stems, {ACTION_LOOP_SECONDS}s loop, {synthesis_ms:.0f} ms)")
+    
+    def get_target_gain(self, stem):
+        """Get the gain a stem fades towards at the current intensity."""
+        threshold = STEM_THRESHOLDS[stem]
+        if threshold <= 0:
+            return 1.0
+        return max(0.0, min(1.0, (self.intensity - threshold) / STEM_FADE_SPAN))
+    
+    def set_intensity(self, intensity):
+        """Set the battle intensity (0.0 calm to 1.0 hectic)."""
+        self.intensity = max(0.0, min(1.0, intensity))
+    
+    def _mix_block(self):
+        """Mix the next block of the loop into a Sound, ramping stem gains across it."""
+        start_time = time.perf_counter()
+        np = self.np
+        indices = (self.position + np.arange(self.block_frames)) % self.loop_frames
+        
+        mix = np.zeros(self.block_frames, dtype=np.float32)
+        for stem, samples in self.stems.items():
+            gain = self.gains[stem]
+            target = self.get_target_gain(stem)
+            if gain == 0.0 and target == 0.0:
+                continue
+            # A linear ramp over the block avoids clicks when a layer comes in or out
+            mix += samples[indices] * np.linspace(gain, target, self.block_frames, dtype=np.float32)
+            self.gains[stem] = target
+        
+        self.position = (self.position + self.block_frames) % self.loop_frames
+        
+        pcm = (np.clip(mix, -1.0, 1.0) * 32767).astype(np.int16)
+        if self.output_channels > 1:
+            pcm = np.repeat(pcm, self.output_channels)
+        sound = pygame.mixer.Sound(buffer=pcm.tobytes())
+        
+        self.last_mix_ms = (time.perf_counter() - start_time) * 1000
+        return sound
+    
+    def start(self, volume, fade_ms=0):
+        """Start the music from the beginning of the loop."""
+        if not self.available:
+            return
+        
+        self.position = 0
+        self.gains = {stem: self.get_target_gain(stem) for stem in ACTION_STEMS}
+        self.volume = volume
+        self.channel.set_volume(volume)
+        self.channel.play(self._mix_block(), fade_ms=fade_ms)
+        self.channel.queue(self._mix_block())
+        self.active = True
+    
+    def update(self):
+        """Keep one block queued behind the playing one; call once per frame."""
+        if not self.active:
+            return
+        
+        if not self.channel.get_busy():
+            # The main loop stalled for longer than the queued audio
+            self.underruns += 1
+            telemetry.increment('music_underruns')
+            self.channel.play(self._mix_block())
+        
+        if self.channel.get_queue() is None:
+            self.channel.queue(self._mix_block())
+    
+    def set_volume(self, volume):
+        """Set the music volume (0.0 to 1.0)."""
+        self.volume = volume
+        if self.channel is not None:
+            self.channel.set_volume(volume)
+    
+    def stop(self, fade_ms=0):
+        """Stop the music, fading out the queued audio."""
+        if not self.active:
+            return
+        
+        self.active = False
+        if fade_ms > 0:
+            # The queued block would start once the fade halts the channel; swap in silence
+            self.channel.queue(self.silence)
+            self.channel.fadeout(fade_ms)
+        else:
+            self.channel.stop()
+    
+    def pause(self):
+        """Pause the music."""
+        if self.active:
+            self.channel.pause()
+    
+    def resume(self):
+        """Resume paused music."""
+        if self.active:
+            self.channel.unpause()
@@ -4,6 +4,103 @@ Player class for QGamen_DanmakuShooting
 
 import pygame
 import math
+from functools import partial
+from sprite_atlas import sprite_atlas
+from glow import glow_renderer
+from quality import quality_governor
+
+# Procedural art parameters, baked into the sprite atlas
+PLAYER_COLORS = {
+    'normal': {
+        'hull': (200, 220, 255),      # Light blue-white
+        'engine': (100, 150, 255),    # Blue engine glow
+        'cockpit': (150, 200, 255)    # Lighter blue
+    },
+    'invulnerable': {
+        'hull': (255, 200, 200),      # Reddish when invulnerable
+        'engine': (255, 100, 100),
+        'cockpit': (255, 150, 150)
+    }
+}
+
+PLAYER_BULLET_COLORS = {
+    'glow': (50, 100, 150),   # Blue glow
+    'beam': (100, 200, 255),  # Blue laser
+    'core': (200, 230, 255)   # Bright blue core
+}
+
+def draw_player_ship(screen, x, y, scale, colors):
+    """Draw the player spaceship centered on (x, y)."""
+    hull_color = colors['hull']
+    engine_color = colors['engine']
+    cockpit_color = colors['cockpit']
+    
+    def point(dx, dy):
+        return (x + dx * scale, y + dy * scale)
+    
+    def radius(r):
+        return max(1, int(r * scale))
+    
+    # Draw spaceship body (main hull)
+    hull_points = [
+        point(0, -15),   # Nose
+        point(-8, 5),    # Left wing
+        point(-5, 10),   # Left engine mount
+        point(5, 10),    # Right engine mount
+        point(8, 5)      # Right wing
+    ]
+    pygame.draw.polygon(screen, hull_color, hull_points)
+    
+    # Draw engine glow
+    left_engine = point(-5, 12)
+    right_engine = point(5, 12)
+    pygame.draw.circle(screen, engine_color, left_engine, radius(3))
+    pygame.draw.circle(screen, engine_color, right_engine, radius(3))
+    
+    # Draw bright engine core
+    bright_engine = tuple(min(255, c + 50) for c in engine_color)
+    pygame.draw.circle(screen, bright_engine, left_engine, radius(1))
+    pygame.draw.circle(screen, bright_engine, right_engine, radius(1))
+    
+    # Draw cockpit
+    pygame.draw.circle(screen, cockpit_color, point(0, -5), radius(4))
+    
+    # Draw wing details
+    wing_detail_color = tuple(max(0, c - 20) for c in hull_color)
+    pygame.draw.line(screen, wing_detail_color, point(-6, 2), point(-4, 8), radius(2))
+    pygame.draw.line(screen, wing_detail_color, point(6, 2), point(4, 8), radius(2))
+    
+    # Draw precise hitbox center (small dot)
+    pygame.draw.circle(screen, (255, 255, 255), (x, y), radius(1))
+
+def draw_player_bullet(screen, x, y, scale, colors):
+    """Draw a player laser beam centered on (x, y)."""
+    width = max(1, int(6 * scale))
+    height = max(1, int(12 * scale))
+    rect = pygame.Rect(0, 0, width, height)
+    rect.center = (x, y)
+    
+    # Draw outer glow
+    pygame.draw.rect(screen, colors['glow'], rect.inflate(2, 2))
+    
+    # Draw main beam
+    pygame.draw.rect(screen, colors['beam'], rect)
+    
+    # Draw bright core
+    if rect.width > 2 and rect.height > 2:
+        core_rect = pygame.Rect(rect.x + 1, rect.y, rect.width - 2, rect.height)
+        pygame.draw.rect(screen, colors['core'], core_rect)
+
+sprite_atlas.register('player', (-9, -16, 9, 16),
+                      partial(draw_player_ship, colors=PLAYER_COLORS['normal']),
+                      PLAYER_COLORS['normal'])
+sprite_atlas.register('player_invulnerable', (-9, -16, 9, 16),
+                      partial(draw_player_ship, colors=PLAYER_COLORS['invulnerable']),
+                      PLAYER_COLORS['invulnerable'])
+# Bullets normally draw as glows; the atlas sprite is the fallback when glows are off
+sprite_atlas.register('player_bullet', (-4, -7, 4, 7),
+                      partial(draw_player_bullet, colors=PLAYER_BULLET_COLORS),
+                      PLAYER_BULLET_COLORS)
 
 class Player:
     """Player character class."""
@@ -106,52 +203,16 @@ class Player:
         self.invulnerable_timer = self.invulnerable_duration
         self.blink_timer = 0
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the player."""
         # Blinking effect during invulnerability
         if self.invulnerable and (self.blink_timer // 10) % 2 == 0:
             # Don't draw (blinking effect)
             return
         
-        # Spaceship colors
-        if self.invulnerable:
-            hull_color = (255, 200, 200)  # Reddish when invulnerable
-            engine_color = (255, 100, 100)
-            cockpit_color = (255, 150, 150)
-        else:
-            hull_color = (200, 220, 255)  # Light blue-white
-            engine_color = (100, 150, 255)  # Blue engine glow
-            cockpit_color = (150, 200, 255)  # Lighter blue
-        
-        # Draw spaceship body (main hull)
-        hull_points = [
-            (self.x, self.y - 15),      # Nose
-            (self.x - 8, self.y + 5),   # Left wing
-            (self.x - 5, self.y + 10),  # Left engine mount
-            (self.x + 5, self.y + 10),  # Right engine mount
-            (self.x + 8, self.y + 5)    # Right wing
-        ]
-        pygame.draw.polygon(screen, hull_color, hull_points)
-        
-        # Draw engine glow
-        pygame.draw.circle(screen, engine_color, (int(self.x - 5), int(self.y + 12)), 3)
-        pygame.draw.circle(screen, engine_color, (int(self.x + 5), int(self.y + 12)), 3)
-        
-        # Draw bright engine core
-        bright_engine = tuple(min(255, c + 50) for c in engine_color)
-        pygame.draw.circle(screen, bright_engine, (int(self.x - 5), int(self.y + 12)), 1)
-        pygame.draw.circle(screen, bright_engine, (int(self.x + 5), int(self.y + 12)), 1)
-        
-        # Draw cockpit
-        pygame.draw.circle(screen, cockpit_color, (int(self.x), int(self.y - 5)), 4)
-        
-        # Draw wing details
-        wing_detail_color = tuple(max(0, c - 20) for c in hull_color)
-        pygame.draw.line(screen, wing_detail_color, (self.x - 6, self.y + 2), (self.x - 4, self.y + 8), 2)
-        pygame.draw.line(screen, wing_detail_color, (self.x + 6, self.y + 2), (self.x + 4, self.y + 8), 2)
-        
-        # Draw precise hitbox center (small dot)
-        pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), 1)
+        # Gameplay coordinates stay at full precision; only the drawing is scaled
+        sprite_name = 'player_invulnerable' if self.invulnerable else 'player'
+        sprite_atlas.blit(screen, sprite_name, self.x * scale, self.y * scale, scale)
 
 class PlayerBullet:
     """Player bullet class."""
@@ -175,17 +236,14 @@ class PlayerBullet:
         """Check if bullet is off screen."""
         return self.y < 0
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the bullet."""
-        # Player laser beam
-        # Draw outer glow
-        glow_rect = pygame.Rect(self.rect.x - 1, self.rect.y - 1, self.rect.width + 2, self.rect.height + 2)
-        pygame.draw.rect(screen, (50, 100, 150), glow_rect)  # Blue glow
-        
-        # Draw main beam
-        pygame.draw.rect(screen, (100, 200, 255), self.rect)  # Blue laser
-        
-        # Draw bright core
-        if self.rect.width > 2 and self.rect.height > 2:
-            core_rect = pygame.Rect(self.rect.x + 1, self.rect.y, self.rect.width - 2, self.rect.height)
-            pygame.draw.rect(screen, (200, 230, 255), core_rect)  # Bright blue core
+        # Player laser beam: one additive glow sprite with a solid core
+        glow_layers = quality_governor.get('glow_layers')
+        if glow_layers > 0:
+            glow_size = (int((self.width + 3 * glow_layers) * scale), int((self.height + 4 * glow_layers) * scale))
+            core_size = (max(1, int(self.width * scale)), max(1, int(self.height * scale)))
+            glow_renderer.add(self.rect.centerx * scale, self.rect.centery * scale,
+                              PLAYER_BULLET_COLORS['beam'], glow_size, core_size)
+        else:
+            sprite_atlas.blit(screen, 'player_bullet', self.rect.centerx * scale, self.rect.centery * scale, scale)
@@ -0,0 +1,112 @@
+"""
+Adaptive quality governor for QGamen_DanmakuShooting
+Steps visual detail up and down to keep frame time within budget
+"""
+
+from collections import deque
+from telemetry import telemetry
+
+# Detail settings per quality level, from cheapest to full detail
+QUALITY_LEVELS = [
+    {
+        'name': 'LOW',
+        'explosion_particles': 6,   # Particles per Explosion
+        'glow_layers': 0,           # 0: plain sprite, 1: tight glow, 2: full glow
+        'star_density': 0.4,        # Fraction of background stars drawn
+        'nebula_count': 1,          # Maximum nebulae drawn
+        'shockwave_rings': 1        # Shockwave rings per BombExplosion
+    },
+    {
+        'name': 'MEDIUM',
+        'explosion_particles': 10,
+        'glow_layers': 1,
+        'star_density': 0.7,
+        'nebula_count': 2,
+        'shockwave_rings': 2
+    },
+    {
+        'name': 'HIGH',
+        'explosion_particles': 15,
+        'glow_layers': 2,
+        'star_density': 1.0,
+        'nebula_count': 4,
+        'shockwave_rings': 3
+    }
+]
+
+class QualityGovernor:
+    """Watches recent frame times and adjusts the quality level with hysteresis."""
+    
+    def __init__(self, frame_budget_ms=1000.0 / 60):
+        """Initialize the quality governor."""
+        self.frame_budget_ms = frame_budget_ms
+        self.frame_times = deque(maxlen=60)  # About one second of frames
+        self.level = len(QUALITY_LEVELS) - 1
+        self.enabled = True
+        
+        # Hysteresis: drop quickly when over budget, recover only with headroom
+        self.downgrade_ratio = 1.0    # Average frame time above 100% of budget
+        self.upgrade_ratio = 0.6      # Average frame time below 60% of budget
+        self.downgrade_delay = 30     # Frames to wait after a change before dropping again
+        self.upgrade_delay = 180      # Frames to wait after a change before raising
+        self.frames_since_change = 0
+        
+        telemetry.set_gauge('quality_level', self.get_level_name())
+    
+    @property
+    def settings(self):
+        """Get the detail settings of the current quality level."""
+        return QUALITY_LEVELS[self.level]
+    
+    def get(self, setting):
+        """Get a single detail setting of the current quality level."""
+        return QUALITY_LEVELS[self.level][setting]
+    
+    def get_level_name(self):
+        """Get the name of the current quality level."""
+        return QUALITY_LEVELS[self.level]['name']
+    
+    def get_average_frame_time(self):
+        """Get the average of the recent frame times in milliseconds."""
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+    
+    def record_frame(self, frame_time_ms):
+        """Record the work time of one frame and adjust the quality level."""
+        self.frame_times.append(frame_time_ms)
+        self.frames_since_change += 1
+        
+        if not self.enabled or len(self.frame_times) < self.frame_times.maxlen:
+            return
+        
+        average = self.get_average_frame_time()
+        if (average > self.frame_budget_ms * self.downgrade_ratio
+                and self.frames_since_change >= self.downgrade_delay and self.level > 0):
+            self.set_level(self.level - 1, average)
+        elif (average < self.frame_budget_ms * self.upgrade_ratio
+                and self.frames_since_change >= self.upgrade_delay
+                and self.level < len(QUALITY_LEVELS) - 1):
+            self.set_level(self.level + 1, average)
+    
+    def set_level(self, level, average_frame_time=None):
+        """Switch to a quality level."""
+        level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        if level == self.level:
+            return
+        
+        previous_name = self.get_level_name()
+        self.level = level
+        self.frames_since_change = 0
+        self.frame_times.clear()
+        
+        if average_frame_time is None:
+            average_frame_time = 0.0
+        print(f"🎚️ Quality {previous_name} -> {self.get_level_name()} (avg {average_frame_time:.1f} ms)")
+        telemetry.set_gauge('quality_level', self.get_level_name())
+        telemetry.increment('quality_changes')
+        telemetry.record_event('quality_change', previous=previous_name, level=self.get_level_name(),
+                               average_frame_ms=round(average_frame_time, 2))
+
+# Global quality governor instance
+quality_governor = QualityGovernor()
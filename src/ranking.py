@@ -3,73 +3,126 @@ Ranking system for QGamen_DanmakuShooting
 """
 
 import pygame
-import json
 import os
+from telemetry import telemetry
+from ranking_store import JsonRankingStore, SQLiteRankingStore, JournalRankingStore
+from leaderboard_client import LeaderboardClient
+
+# Ranking backends selectable with --ranking-backend
+RANKING_BACKENDS = ('json', 'sqlite', 'journal')
 
 class RankingManager:
     """Manages high scores and rankings."""
     
-    def __init__(self, filename="rankings.json"):
-        """Initialize the ranking manager."""
+    def __init__(self, filename="rankings.json", backend="json", leaderboard_url=None):
+        """Initialize the ranking manager.
+        
+        The sqlite backend keeps every score in a database next to the JSON
+        file and the journal backend shares the rankings between game
+        instances; both import the JSON rankings when first created.
+        With a leaderboard_url, scores are also sent to the online leaderboard.
+        """
         self.filename = filename
+        self.backend = backend
         self.rankings = []
         self.max_rankings = 10
         self.current_name = ""
         self.name_input_complete = False
+        
+        # Score to beat, queried from the store only after the rankings change
+        self.cutoff_score = None
+        self.cutoff_valid = False
+        self.listeners = []  # Called with no arguments whenever the rankings change
+        
+        if backend == 'sqlite':
+            self.store = SQLiteRankingStore(os.path.splitext(filename)[0] + '.db', import_filename=filename)
+        elif backend == 'journal':
+            self.store = JournalRankingStore(os.path.splitext(filename)[0] + '.journal', self.max_rankings,
+                                             import_filename=filename)
+        else:
+            self.store = JsonRankingStore(filename, self.max_rankings)
         self.load_rankings()
+        
+        # Online leaderboard; unsent scores wait in a queue file next to the rankings
+        self.leaderboard = None
+        if leaderboard_url:
+            queue_path = os.path.splitext(filename)[0] + '_upload_queue.json'
+            self.leaderboard = LeaderboardClient(leaderboard_url, queue_path)
     
     def load_rankings(self):
-        """Load rankings from file."""
-        try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.rankings = data.get('rankings', [])
-            else:
-                # Create default rankings
-                self.rankings = [
-                    ("PLAYER", 1000),
-                    ("PLAYER", 900),
-                    ("PLAYER", 800),
-                    ("PLAYER", 700),
-                    ("PLAYER", 600),
-                    ("PLAYER", 500),
-                    ("PLAYER", 400),
-                    ("PLAYER", 300),
-                    ("PLAYER", 200),
-                    ("PLAYER", 100)
-                ]
-                self.save_rankings()
-        except Exception as e:
-            print(f"Error loading rankings: {e}")
-            # Create default rankings on error
-            self.rankings = [("PLAYER", 100 * (10 - i)) for i in range(10)]
+        """Load rankings from the store."""
+        self.store.load()
+        self._rankings_changed()
+    
+    def refresh(self):
+        """Pick up scores added by other game instances since the last load."""
+        if self.store.reload():
+            self._rankings_changed()
+        if self.leaderboard is not None:
+            self.leaderboard.request_top()
+    
+    def subscribe(self, callback):
+        """Call callback() whenever the rankings change (a new score or a reload)."""
+        self.listeners.append(callback)
+    
+    def unsubscribe(self, callback):
+        """Stop calling a subscribed callback."""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
+    def _rankings_changed(self):
+        """Refresh the top rankings, drop the cached cutoff and notify subscribers."""
+        self.rankings = self.store.get_rankings(0, self.max_rankings)
+        self.cutoff_valid = False
+        for callback in list(self.listeners):
+            callback()
     
     def save_rankings(self):
-        """Save rankings to file."""
-        try:
-            data = {'rankings': self.rankings}
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving rankings: {e}")
+        """Save rankings to file in the background (the SQLite store commits every score as it is added)."""
+        if isinstance(self.store, JsonRankingStore):
+            self.store.save()
+    
+    def get_cutoff_score(self):
+        """Get the score to beat for the high score list, or None if it is not full."""
+        if not self.cutoff_valid:
+            self.cutoff_score = self.store.get_cutoff_score(self.max_rankings)
+            self.cutoff_valid = True
+            telemetry.increment('ranking_cutoff_queries')
+        return self.cutoff_score
     
     def is_high_score(self, score):
         """Check if score qualifies for high score list."""
-        if len(self.rankings) < self.max_rankings:
-            return True
-        return score > self.rankings[-1][1]
+        cutoff = self.get_cutoff_score()
+        return cutoff is None or score > cutoff
     
     def add_score(self, name, score):
         """Add a new score to rankings."""
-        self.rankings.append((name, score))
-        self.rankings.sort(key=lambda x: x[1], reverse=True)
-        self.rankings = self.rankings[:self.max_rankings]
-        self.save_rankings()
-    
-    def get_rankings(self):
-        """Get current rankings."""
-        return self.rankings
+        self.store.add_score(name, score)
+        self._rankings_changed()
+        if self.leaderboard is not None:
+            self.leaderboard.submit(name, score)
+    
+    def get_rankings(self, offset=0, limit=None):
+        """Get current rankings, or a page of them from the given rank on."""
+        if offset == 0 and limit is None:
+            return self.rankings
+        return self.store.get_rankings(offset, limit or self.max_rankings)
+    
+    def get_online_rankings(self):
+        """Get the top scores last fetched from the online leaderboard, or None."""
+        if self.leaderboard is None:
+            return None
+        return self.leaderboard.top_rankings
+    
+    def flush(self, timeout=None):
+        """Block until saved rankings are on disk; False on timeout."""
+        return self.store.flush(timeout)
+    
+    def close(self):
+        """Write pending rankings and release the ranking store."""
+        if self.leaderboard is not None:
+            self.leaderboard.close()
+        self.store.close()
     
     def handle_name_input(self, event, score):
         """Handle name input for high score."""
@@ -0,0 +1,500 @@
+"""
+Ranking storage backends for QGamen_DanmakuShooting
+JSON file with the top scores, an SQLite database with the full score history,
+or a score journal shared by several game instances
+"""
+
+import json
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
+from telemetry import telemetry
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: the journal is only safe for a single game instance
+
+# Bump when the SQLite schema changes
+RANKING_SCHEMA_VERSION = 1
+
+# Rankings of a fresh install
+DEFAULT_RANKINGS = [("PLAYER", 100 * (10 - i)) for i in range(10)]
+
+def load_json_rankings(filename):
+    """Load (name, score) pairs from a rankings.json file; None if it does not exist."""
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [(name, score) for name, score in data.get('rankings', [])]
+
+def write_json_atomic(filename, data):
+    """Write JSON to a file atomically."""
+    write_text_atomic(filename, json.dumps(data, indent=2, ensure_ascii=False))
+
+def write_text_atomic(filename, text):
+    """Write text to a temporary file, fsync it and rename it over the target.
+    
+    Readers and crashes see either the old file or the new one, never a
+    partly written one.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.rankings-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private to the user; keep the mode of the file being replaced
+        try:
+            mode = os.stat(filename).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, filename)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    
+    # Persist the rename itself (not possible on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+class RankingWriter:
+    """Writes ranking snapshots to a JSON file on a background thread.
+    
+    Only the newest pending snapshot is written, so a burst of saves
+    costs one write.
+    """
+    
+    def __init__(self, filename):
+        """Initialize the writer and start its thread."""
+        self.filename = filename
+        self.pending = None        # Newest snapshot not yet written
+        self.writing = False
+        self.closed = False
+        self.condition = threading.Condition()
+        
+        # Statistics
+        self.writes = 0
+        self.coalesced = 0         # Snapshots replaced by a newer one before being written
+        self.last_write_ms = 0.0
+        self.max_write_ms = 0.0
+        
+        self.thread = threading.Thread(target=self._run, name='ranking-writer', daemon=True)
+        self.thread.start()
+    
+    def submit(self, data):
+        """Queue a snapshot to be written, replacing any snapshot still waiting."""
+        with self.condition:
+            if self.pending is not None:
+                self.coalesced += 1
+                telemetry.increment('ranking_saves_coalesced')
+            self.pending = data
+            self.condition.notify_all()
+    
+    def flush(self, timeout=None):
+        """Block until every submitted snapshot is on disk; False on timeout."""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout)
+    
+    def close(self, timeout=5.0):
+        """Flush and stop the writer thread."""
+        self.flush(timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+    
+    def _run(self):
+        """Write snapshots as they arrive (runs on the writer thread)."""
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or self.closed)
+                if self.pending is None:
+                    return
+                data = self.pending
+                self.pending = None
+                self.writing = True
+            
+            try:
+                start_time = time.perf_counter()
+                write_json_atomic(self.filename, data)
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                
+                self.writes += 1
+                self.last_write_ms = elapsed_ms
+                self.max_write_ms = max(self.max_write_ms, elapsed_ms)
+                telemetry.increment('ranking_writes')
+                telemetry.set_gauge('ranking_write_ms', round(elapsed_ms, 2))
+                telemetry.set_gauge('ranking_write_ms_max', round(self.max_write_ms, 2))
+            except Exception as e:
+                print(f"Error saving rankings: {e}")
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
+
+class JsonRankingStore:
+    """Keeps the top scores in memory and rewrites the JSON file on every change."""
+    
+    def __init__(self, filename, max_rankings=10, background_writes=True):
+        """Initialize the JSON ranking store; background_writes saves on a writer thread."""
+        self.filename = filename
+        self.max_rankings = max_rankings
+        self.rankings = []
+        self.writer = RankingWriter(filename) if background_writes else None
+    
+    def load(self):
+        """Load rankings from the file, creating it with the defaults if missing."""
+        try:
+            rankings = load_json_rankings(self.filename)
+            if rankings is None:
+                # Create default rankings
+                self.rankings = list(DEFAULT_RANKINGS)
+                self.save()
+            else:
+                self.rankings = rankings
+        except Exception as e:
+            print(f"Error loading rankings: {e}")
+            # Create default rankings on error
+            self.rankings = list(DEFAULT_RANKINGS)
+    
+    def save(self):
+        """Save rankings to the file, or queue them for the writer thread."""
+        data = {'rankings': list(self.rankings)}
+        if self.writer is not None:
+            self.writer.submit(data)
+            return
+        
+        try:
+            write_json_atomic(self.filename, data)
+        except Exception as e:
+            print(f"Error saving rankings: {e}")
+    
+    def add_score(self, name, score):
+        """Add a score, keeping only the top max_rankings."""
+        self.rankings.append((name, score))
+        self.rankings.sort(key=lambda x: x[1], reverse=True)
+        self.rankings = self.rankings[:self.max_rankings]
+        self.save()
+    
+    def reload(self):
+        """Rankings only change through this instance; nothing to reload."""
+        return False
+    
+    def get_rankings(self, offset=0, limit=10):
+        """Get (name, score) pairs from the given rank on, best first."""
+        return self.rankings[offset:offset + limit]
+    
+    def get_cutoff_score(self, rank):
+        """Get the score at a rank (1-based), or None if fewer scores are stored."""
+        if len(self.rankings) < rank:
+            return None
+        return self.rankings[rank - 1][1]
+    
+    def flush(self, timeout=None):
+        """Block until queued saves are on disk; False on timeout."""
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+    
+    def close(self):
+        """Write any queued save and stop the writer thread."""
+        if self.writer is not None:
+            self.writer.close()
+
+class SQLiteRankingStore:
+    """Keeps every submitted score in an SQLite database in WAL mode.
+    
+    Ranks come from an index on (score, id), so top-N pages and the high
+    score cutoff are index range scans, and per-player bests use an index
+    on (name, score). Ties keep submission order, like the JSON store.
+    """
+    
+    def __init__(self, filename, import_filename=None):
+        """Initialize the SQLite ranking store; import_filename seeds a new database."""
+        self.filename = filename
+        self.import_filename = import_filename
+        self.connection = None
+        # The connection is opened by the asset loader and used from the main thread
+        self.lock = threading.Lock()
+        self.data_version = None  # PRAGMA data_version at the last check; changes on other connections' commits
+    
+    def load(self):
+        """Open the database, creating the schema and importing the JSON rankings if new."""
+        self.connection = sqlite3.connect(self.filename, check_same_thread=False)
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # WAL with synchronous=NORMAL only fsyncs at checkpoints; a crash may lose the last score, never the file
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            self.data_version = cursor.execute("PRAGMA data_version").fetchone()[0]
+            if version >= RANKING_SCHEMA_VERSION:
+                return
+            
+            with self.connection:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS scores (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        score INTEGER NOT NULL,
+                        created_at REAL NOT NULL
+                    )""")
+                cursor.execute("CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS scores_by_name ON scores (name, score DESC)")
+                cursor.execute(f"PRAGMA user_version={RANKING_SCHEMA_VERSION}")
+        
+        rankings = None
+        if self.import_filename:
+            try:
+                rankings = load_json_rankings(self.import_filename)
+            except Exception as e:
+                print(f"Error importing rankings: {e}")
+        if rankings is None:
+            rankings = DEFAULT_RANKINGS
+        self.add_scores(rankings)
+        print(f"🏆 Created ranking database {self.filename} ({len(rankings)} scores)")
+    
+    def reload(self):
+        """Check whether another process committed scores since the last check.
+        
+        Queries always read the latest committed data; this only tells the
+        ranking manager when its cached list and cutoff are out of date.
+        """
+        with self.lock:
+            data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        changed = data_version != self.data_version
+        self.data_version = data_version
+        return changed
+    
+    def import_json(self, filename):
+        """Add every score of a rankings.json file; returns the number of scores added."""
+        rankings = load_json_rankings(filename) or []
+        self.add_scores(rankings)
+        return len(rankings)
+    
+    def add_score(self, name, score):
+        """Add a score to the history."""
+        self.add_scores([(name, score)])
+    
+    def add_scores(self, scores):
+        """Add many scores in one transaction."""
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT INTO scores (name, score, created_at) VALUES (?, ?, ?)",
+                                        [(name, int(score), now) for name, score in scores])
+    
+    def get_rankings(self, offset=0, limit=10):
+        """Get (name, score) pairs from the given rank on, best first."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT name, score FROM scores ORDER BY score DESC, id LIMIT ? OFFSET ?",
+                (limit, offset)).fetchall()
+    
+    def get_cutoff_score(self, rank):
+        """Get the score at a rank (1-based), or None if fewer scores are stored."""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT score FROM scores ORDER BY score DESC, id LIMIT 1 OFFSET ?",
+                (rank - 1,)).fetchone()
+        return row[0] if row else None
+    
+    def get_player_best(self, name):
+        """Get the best score of a player, or None if they never submitted one."""
+        with self.lock:
+            return self.connection.execute("SELECT MAX(score) FROM scores WHERE name = ?",
+                                           (name,)).fetchone()[0]
+    
+    def get_player_bests(self, offset=0, limit=10):
+        """Get (name, best score) pairs with one entry per player, best first."""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT name, MAX(score) AS best FROM scores GROUP BY name ORDER BY best DESC, name LIMIT ? OFFSET ?",
+                (limit, offset)).fetchall()
+    
+    def flush(self, timeout=None):
+        """Nothing to wait for; every score is committed as it is added."""
+        return True
+    
+    def get_score_count(self):
+        """Get the number of scores in the history."""
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+    
+    def close(self):
+        """Close the database."""
+        if self.connection is not None:
+            with self.lock:
+                self.connection.close()
+            self.connection = None
+
+class JournalRankingStore:
+    """Shares the top scores between game instances through an append-only journal.
+    
+    Each score is appended as one JSON line while holding an exclusive
+    flock on a side lock file, and every instance reads the journal on
+    from the offset it last read. Past compact_every lines the journal is
+    rewritten with only the top scores and renamed into place; readers
+    notice the new file by its inode and read it from the start. Each
+    reader keeps its journal file open, so a replaced journal's inode
+    cannot be reused by a later one while it is being compared.
+    """
+    
+    def __init__(self, filename, max_rankings=10, compact_every=1000, import_filename=None):
+        """Initialize the journal ranking store; import_filename seeds a new journal."""
+        self.filename = filename
+        self.lock_filename = filename + '.lock'
+        self.max_rankings = max_rankings
+        self.compact_every = compact_every
+        self.import_filename = import_filename
+        self.rankings = []
+        
+        # Journal file being read and the read position in it
+        self.journal = None
+        self.offset = 0
+        self.line_count = 0
+        self.compactions = 0
+        # Opened by the asset loader and used from the main thread
+        self.lock = threading.Lock()
+    
+    @contextmanager
+    def _file_lock(self, exclusive):
+        """Hold the flock shared by all instances (the journal itself gets replaced)."""
+        with open(self.lock_filename, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            # Closing the file releases the lock
+            yield
+    
+    def load(self):
+        """Read the journal, creating it from the JSON rankings if missing."""
+        with self.lock, self._file_lock(exclusive=True):
+            if not os.path.exists(self.filename):
+                rankings = None
+                if self.import_filename:
+                    try:
+                        rankings = load_json_rankings(self.import_filename)
+                    except Exception as e:
+                        print(f"Error importing rankings: {e}")
+                if rankings is None:
+                    rankings = DEFAULT_RANKINGS
+                self._append(rankings)
+                print(f"🏆 Created ranking journal {self.filename} ({len(rankings)} scores)")
+            self._read_tail()
+    
+    def reload(self):
+        """Read the scores other instances appended since the last read; True if the rankings changed."""
+        with self.lock, self._file_lock(exclusive=False):
+            return self._read_tail()
+    
+    def add_score(self, name, score):
+        """Append a score to the journal, compacting it when it has grown too long."""
+        with self.lock, self._file_lock(exclusive=True):
+            self._append([(name, score)])
+            self._read_tail()
+            if self.line_count > self.compact_every:
+                self._compact()
+    
+    def _format_lines(self, scores):
+        """Format scores as journal lines."""
+        now = round(time.time(), 3)
+        return ''.join(json.dumps({'name': name, 'score': int(score), 'time': now}, ensure_ascii=False) + '\n'
+                       for name, score in scores)
+    
+    def _append(self, scores):
+        """Append scores to the journal (exclusive file lock held)."""
+        # Opened under the lock, so the append never lands in a journal that was just compacted away
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.write(self._format_lines(scores))
+    
+    def _read_tail(self):
+        """Merge the journal lines after the read offset into the rankings (file lock held)."""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return False
+        
+        changed = False
+        if self.journal is None or os.fstat(self.journal.fileno()).st_ino != stat.st_ino:
+            # Compacted by another instance: start over with the new file
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = open(self.filename, 'rb')
+            self.offset = 0
+            self.line_count = 0
+            self.rankings = []
+            changed = True
+        
+        self.journal.seek(self.offset)
+        data = self.journal.read()
+        if not data:
+            return changed
+        
+        # Only whole lines; a line cut short by a crash is skipped
+        end = data.rfind(b'\n') + 1
+        lines = data[:end].splitlines()
+        self.offset += end
+        self.line_count += len(lines)
+        
+        entries = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                entries.append((entry['name'], entry['score']))
+            except (ValueError, KeyError, TypeError):
+                continue
+        if not entries:
+            return changed
+        
+        # Stable sort: ties keep journal order, the same in every instance
+        rankings = self.rankings + entries
+        rankings.sort(key=lambda x: x[1], reverse=True)
+        rankings = rankings[:self.max_rankings]
+        if rankings != self.rankings:
+            self.rankings = rankings
+            changed = True
+        return changed
+    
+    def _compact(self):
+        """Rewrite the journal with only the top scores (exclusive file lock held, rankings up to date)."""
+        start_time = time.perf_counter()
+        write_text_atomic(self.filename, self._format_lines(self.rankings))
+        
+        self.journal.close()
+        self.journal = open(self.filename, 'rb')
+        self.offset = os.fstat(self.journal.fileno()).st_size
+        self.line_count = len(self.rankings)
+        self.compactions += 1
+        telemetry.increment('ranking_compactions')
+        telemetry.set_gauge('ranking_compaction_ms', round((time.perf_counter() - start_time) * 1000, 2))
+    
+    def get_rankings(self, offset=0, limit=10):
+        """Get (name, score) pairs from the given rank on, best first."""
+        return self.rankings[offset:offset + limit]
+    
+    def get_cutoff_score(self, rank):
+        """Get the score at a rank (1-based), or None if fewer scores are stored."""
+        if len(self.rankings) < rank:
+            return None
+        return self.rankings[rank - 1][1]
+    
+    def flush(self, timeout=None):
+        """Nothing to wait for; every score is appended as it is added."""
+        return True
+    
+    def close(self):
+        """Close the journal file."""
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
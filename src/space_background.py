@@ -6,6 +6,7 @@ Creates dynamic space backgrounds with stars, nebulae, and planets
 import pygame
 import random
 import math
+from quality import quality_governor
 
 class Star:
     """Individual star in the background."""
@@ -28,7 +29,7 @@ class Star:
         # Update twinkling
         self.twinkle_phase += self.twinkle_speed * dt
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the star."""
         # Calculate twinkling brightness
         twinkle_factor = 0.7 + 0.3 * math.sin(self.twinkle_phase)
@@ -38,10 +39,12 @@ class Star:
         color = (current_brightness, current_brightness, min(255, current_brightness + 20))
         
         # Draw star
-        if self.size <= 1:
-            screen.set_at((int(self.x), int(self.y)), color)
+        position = (int(self.x * scale), int(self.y * scale))
+        size = int(self.size * scale)
+        if size <= 1:
+            screen.set_at(position, color)
         else:
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), int(self.size))
+            pygame.draw.circle(screen, color, position, size)
 
 class Nebula:
     """Nebula cloud in the background."""
@@ -63,19 +66,21 @@ class Nebula:
         self.y += self.speed * dt
         self.pulse_phase += self.pulse_speed * dt
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the nebula."""
         # Create pulsing effect
         pulse_factor = 0.8 + 0.2 * math.sin(self.pulse_phase)
         current_alpha = int(self.alpha * pulse_factor)
         
         # Create nebula surface
-        nebula_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        width = max(2, int(self.width * scale))
+        height = max(2, int(self.height * scale))
+        nebula_surface = pygame.Surface((width, height), pygame.SRCALPHA)
         
         # Draw gradient circles for nebula effect
-        center_x = self.width // 2
-        center_y = self.height // 2
-        max_radius = min(self.width, self.height) // 2
+        center_x = width // 2
+        center_y = height // 2
+        max_radius = min(width, height) // 2
         
         for i in range(max_radius, 0, -2):
             alpha = int(current_alpha * (1 - i / max_radius) * 0.5)
@@ -88,7 +93,7 @@ class Nebula:
             nebula_surface.blit(temp_surface, (center_x - i, center_y - i), special_flags=pygame.BLEND_ALPHA_SDL2)
         
         # Blit nebula to screen
-        screen.blit(nebula_surface, (int(self.x), int(self.y)), special_flags=pygame.BLEND_ADD)
+        screen.blit(nebula_surface, (int(self.x * scale), int(self.y * scale)), special_flags=pygame.BLEND_ADD)
 
 class Planet:
     """Distant planet in the background."""
@@ -108,19 +113,24 @@ class Planet:
         self.y += self.speed * dt
         self.rotation += self.rotation_speed * dt
     
-    def draw(self, screen):
+    def draw(self, screen, scale=1.0):
         """Draw the planet."""
+        x = self.x * scale
+        y = self.y * scale
+        radius = max(1, int(self.radius * scale))
+        
         # Main planet body
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
+        pygame.draw.circle(screen, self.color, (int(x), int(y)), radius)
         
         # Add some surface details (darker bands)
+        band_height = max(1, int(4 * scale))
         for i in range(2, 4):
-            band_y = int(self.y + math.sin(self.rotation + i) * self.radius * 0.3)
-            if abs(band_y - self.y) < self.radius:
-                band_width = int(math.sqrt(self.radius**2 - (band_y - self.y)**2) * 2)
+            band_y = int(y + math.sin(self.rotation + i) * radius * 0.3)
+            if abs(band_y - y) < radius:
+                band_width = int(math.sqrt(radius**2 - (band_y - y)**2) * 2)
                 darker_color = tuple(max(0, c - 30) for c in self.color)
                 
-                band_rect = pygame.Rect(int(self.x - band_width // 2), band_y - 2, band_width, 4)
+                band_rect = pygame.Rect(int(x - band_width // 2), band_y - band_height // 2, band_width, band_height)
                 pygame.draw.rect(screen, darker_color, band_rect)
 
 class ShootingStar:
@@ -343,13 +353,23 @@ class SpaceBackground:
         self._spawn_new_elements(dt)
         self._cleanup_elements()
     
+    def get_visible_stars(self):
+        """Get the stars drawn at the current quality level."""
+        # Stars are spawned in random order, so a prefix is an even thinning
+        star_count = int(len(self.stars) * quality_governor.get('star_density'))
+        return self.stars[:star_count]
+    
+    def get_visible_nebulae(self):
+        """Get the nebulae drawn at the current quality level."""
+        return self.nebulae[:quality_governor.get('nebula_count')]
+    
     def draw(self, screen):
         """Draw the space background."""
         # Fill with deep space color
         screen.fill(self.space_colors['deep_space'])
         
         # Draw nebulae first (background layer)
-        for nebula in self.nebulae:
+        for nebula in self.get_visible_nebulae():
             nebula.draw(screen)
         
         # Draw planets
@@ -357,13 +377,30 @@ class SpaceBackground:
             planet.draw(screen)
         
         # Draw stars
-        for star in self.stars:
+        for star in self.get_visible_stars():
             star.draw(screen)
         
         # Draw shooting stars (foreground layer)
         for shooting_star in self.shooting_stars:
             shooting_star.draw(screen)
     
+    def draw_game_area(self, surface, area_width, scale=1.0):
+        """Draw the background elements inside the game area."""
+        # Draw stars only in game area
+        for star in self.get_visible_stars():
+            if star.x < area_width:
+                star.draw(surface, scale)
+        
+        # Draw nebulae in game area
+        for nebula in self.get_visible_nebulae():
+            if nebula.x < area_width:
+                nebula.draw(surface, scale)
+        
+        # Draw planets in game area
+        for planet in self.planets:
+            if planet.x < area_width:
+                planet.draw(surface, scale)
+    
     def get_parallax_offset(self, layer_speed=1.0):
         """Get parallax scrolling offset for UI elements."""
         # This can be used to create parallax effects for UI elements
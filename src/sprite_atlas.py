@@ -0,0 +1,179 @@
+"""
+Sprite atlas for QGamen_DanmakuShooting
+Bakes the procedural ship, bullet, item and icon art into a single atlas
+surface that is cached on disk, so every draw becomes an atlas blit
+"""
+
+import pygame
+import os
+import json
+import math
+import hashlib
+
+# Bump when the atlas layout or file format changes
+ATLAS_VERSION = 1
+
+class SpriteAtlas:
+    """Rasterizes registered procedural sprites into one cached atlas."""
+    
+    def __init__(self, cache_dir=None):
+        """Initialize the sprite atlas."""
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cache')
+        self.cache_dir = cache_dir
+        self.atlas_width = 512
+        self.padding = 2
+        
+        # Registered sprite definitions: name -> (bounds, draw function, art parameters)
+        self.definitions = {}
+        
+        # Baked atlas sheets per render scale: scale -> (surface, index)
+        # The index maps a sprite name to (area rect, anchor x, anchor y)
+        self.sheets = {}
+    
+    def register(self, name, bounds, draw_function, params):
+        """Register a procedural sprite.
+        
+        bounds is (left, top, right, bottom) relative to the sprite's anchor
+        in full resolution pixels. draw_function(surface, x, y, scale) draws
+        the art centered on (x, y). params are the art parameters that,
+        together with the drawing code, key the on-disk cache.
+        """
+        self.definitions[name] = (bounds, draw_function, params)
+        self.sheets.clear()
+    
+    def get_cache_key(self, scale):
+        """Get the hash of all art parameters for the given render scale."""
+        hasher = hashlib.sha1()
+        hasher.update(f"v{ATLAS_VERSION}:scale{scale:.3f}:pad{self.padding}".encode('utf-8'))
+        
+        for name in sorted(self.definitions):
+            bounds, draw_function, params = self.definitions[name]
+            hasher.update(name.encode('utf-8'))
+            hasher.update(json.dumps([bounds, params], sort_keys=True).encode('utf-8'))
+            self._hash_code(hasher, getattr(draw_function, 'func', draw_function).__code__)
+        
+        return hasher.hexdigest()[:16]
+    
+    def _hash_code(self, hasher, code):
+        """Hash a drawing function's bytecode so geometry edits invalidate the cache."""
+        hasher.update(code.co_code)
+        for const in code.co_consts:
+            if hasattr(const, 'co_code'):
+                # Nested helper functions
+                self._hash_code(hasher, const)
+            elif isinstance(const, frozenset):
+                hasher.update(repr(sorted(const, key=repr)).encode('utf-8'))
+            else:
+                hasher.update(repr(const).encode('utf-8'))
+    
+    def load_or_bake(self, scale=1.0):
+        """Load the atlas for a render scale from the cache, baking it if needed."""
+        if scale in self.sheets:
+            return self.sheets[scale]
+        
+        cache_key = self.get_cache_key(scale)
+        image_path = os.path.join(self.cache_dir, f"sprite_atlas_{cache_key}.png")
+        index_path = os.path.join(self.cache_dir, f"sprite_atlas_{cache_key}.json")
+        
+        sheet = self._load_cached(image_path, index_path, cache_key)
+        if sheet is None:
+            sheet = self._bake(scale)
+            self._save_cached(sheet, image_path, index_path, cache_key)
+            print(f"🎨 Baked sprite atlas ({len(sheet[1])} sprites, scale {scale:.2f})")
+        
+        self.sheets[scale] = sheet
+        return sheet
+    
+    def _load_cached(self, image_path, index_path, cache_key):
+        """Load a previously baked atlas if it matches the cache key."""
+        if not (os.path.exists(image_path) and os.path.exists(index_path)):
+            return None
+        
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('key') != cache_key or set(data['sprites']) != set(self.definitions):
+                return None
+            
+            surface = self._prepare_surface(pygame.image.load(image_path))
+            index = {name: (pygame.Rect(entry[:4]), entry[4], entry[5])
+                     for name, entry in data['sprites'].items()}
+            return surface, index
+        except Exception as e:
+            print(f"⚠️ Failed to load cached sprite atlas: {e}")
+            return None
+    
+    def _save_cached(self, sheet, image_path, index_path, cache_key):
+        """Persist a baked atlas as a PNG plus a JSON index."""
+        surface, index = sheet
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            pygame.image.save(surface, image_path)
+            data = {
+                'key': cache_key,
+                'sprites': {name: [rect.x, rect.y, rect.width, rect.height, anchor_x, anchor_y]
+                            for name, (rect, anchor_x, anchor_y) in index.items()}
+            }
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            # A read-only install still works, the atlas is just baked every launch
+            print(f"⚠️ Failed to save sprite atlas cache: {e}")
+    
+    def _bake(self, scale):
+        """Rasterize all registered sprites into a new atlas surface."""
+        pad = self.padding
+        sprites = []
+        for name in sorted(self.definitions):
+            (left, top, right, bottom), draw_function, params = self.definitions[name]
+            width = int(math.ceil((right - left) * scale)) + pad * 2
+            height = int(math.ceil((bottom - top) * scale)) + pad * 2
+            anchor_x = -left * scale + pad
+            anchor_y = -top * scale + pad
+            
+            sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+            draw_function(sprite, anchor_x, anchor_y, scale)
+            sprites.append((name, sprite, anchor_x, anchor_y))
+        
+        # Simple shelf packing, tallest sprites first
+        sprites.sort(key=lambda entry: entry[1].get_height(), reverse=True)
+        index = {}
+        x = y = shelf_height = 0
+        for name, sprite, anchor_x, anchor_y in sprites:
+            width, height = sprite.get_size()
+            if x + width > self.atlas_width:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            index[name] = (pygame.Rect(x, y, width, height), anchor_x, anchor_y)
+            x += width
+            shelf_height = max(shelf_height, height)
+        
+        surface = pygame.Surface((self.atlas_width, max(1, y + shelf_height)), pygame.SRCALPHA)
+        for name, sprite, anchor_x, anchor_y in sprites:
+            surface.blit(sprite, index[name][0])
+        
+        return self._prepare_surface(surface), index
+    
+    def _prepare_surface(self, surface):
+        """Convert the atlas to the display format for fast blitting."""
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+    
+    def blit(self, screen, name, x, y, scale=1.0):
+        """Draw a sprite with its anchor at (x, y) in render coordinates."""
+        surface, index = self.sheets.get(scale) or self.load_or_bake(scale)
+        area, anchor_x, anchor_y = index[name]
+        screen.blit(surface, (x - anchor_x, y - anchor_y), area)
+    
+    def blit_many(self, screen, name, positions, scale=1.0):
+        """Draw the same sprite at many positions with a single blits() call."""
+        surface, index = self.sheets.get(scale) or self.load_or_bake(scale)
+        area, anchor_x, anchor_y = index[name]
+        screen.blits([(surface, (x - anchor_x, y - anchor_y), area) for x, y in positions],
+                     doreturn=False)
+
+# Global sprite atlas instance
+sprite_atlas = SpriteAtlas()
@@ -0,0 +1,118 @@
+"""
+Telemetry for QGamen_DanmakuShooting
+Collects counters, gauges and events about runtime performance
+"""
+
+import json
+import time
+import threading
+
+class Telemetry:
+    """Collects performance counters, gauges and events."""
+    
+    def __init__(self):
+        """Initialize telemetry."""
+        self.counters = {}
+        self.gauges = {}
+        self.events = []
+        self.max_events = 1000
+        self.start_time = time.time()
+        self.output_path = None  # Set to write a report on shutdown
+        self.lock = threading.Lock()
+    
+    def increment(self, name, amount=1):
+        """Increase a counter."""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def set_gauge(self, name, value):
+        """Set the current value of a gauge."""
+        with self.lock:
+            self.gauges[name] = value
+    
+    def record_event(self, name, **fields):
+        """Record a timestamped event."""
+        event = {'time': round(time.time() - self.start_time, 3), 'event': name}
+        event.update(fields)
+        with self.lock:
+            self.events.append(event)
+            if len(self.events) > self.max_events:
+                del self.events[0]
+    
+    def snapshot(self):
+        """Get a copy of all collected telemetry."""
+        with self.lock:
+            return {
+                'uptime': round(time.time() - self.start_time, 3),
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'events': list(self.events)
+            }
+    
+    def save(self, path=None):
+        """Write the collected telemetry to a JSON file."""
+        path = path or self.output_path
+        if not path:
+            return
+        
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+            print(f"📊 Telemetry saved: {path}")
+        except Exception as e:
+            print(f"⚠️ Failed to save telemetry: {e}")
+
+class StartupProfiler:
+    """Times the startup phases up to the first frame and the loads deferred past it."""
+    
+    def __init__(self):
+        """Initialize the startup profiler."""
+        self.start_time = time.perf_counter()
+        self.last_mark = self.start_time
+        self.phases = []              # (phase name, milliseconds) up to the first frame
+        self.background_phases = []   # (phase name, milliseconds) of loads after the first frame
+        self.first_frame_ms = None
+        self.enabled = False          # Print the report (--startup-profile)
+        self.lock = threading.Lock()
+    
+    def begin(self, start_time):
+        """Measure from an earlier point, e.g. before the entry point imported pygame."""
+        self.start_time = start_time
+        self.last_mark = start_time
+    
+    def mark(self, phase):
+        """End the current phase under the given name."""
+        if self.first_frame_ms is not None:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last_mark) * 1000))
+        self.last_mark = now
+    
+    def first_frame(self):
+        """Record that the first frame is on screen and report time-to-first-frame."""
+        if self.first_frame_ms is not None:
+            return
+        self.mark('first frame')
+        self.first_frame_ms = (self.last_mark - self.start_time) * 1000
+        
+        telemetry.set_gauge('time_to_first_frame_ms', round(self.first_frame_ms, 1))
+        telemetry.record_event('startup', first_frame_ms=round(self.first_frame_ms, 1),
+                               phases={name: round(ms, 1) for name, ms in self.phases})
+        if self.enabled:
+            print(f"🚀 Time to first frame: {self.first_frame_ms:.1f} ms")
+            for name, ms in self.phases:
+                print(f"   {name:<24} {ms:8.1f} ms")
+    
+    def record_background(self, phase, ms):
+        """Record a load that runs after the first frame, possibly on another thread."""
+        with self.lock:
+            self.background_phases.append((phase, ms))
+        telemetry.set_gauge(f'startup_{phase.replace(" ", "_")}_ms', round(ms, 1))
+        if self.enabled:
+            print(f"   (background) {phase:<11} {ms:8.1f} ms")
+
+# Global telemetry instance
+telemetry = Telemetry()
+
+# Global startup profiler instance
+startup_profiler = StartupProfiler()
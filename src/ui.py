@@ -3,7 +3,42 @@ UI system for QGamen_DanmakuShooting
 """
 
 import pygame
+from functools import partial
 from font_manager import font_manager
+from sprite_atlas import sprite_atlas
+
+# Procedural icon art parameters, baked into the sprite atlas
+LIFE_ICON_ART = {'hull': (100, 200, 255), 'engine': (50, 150, 255)}
+BOMB_ICON_ART = {
+    'glow': (100, 50, 150),     # Outer glow
+    'orb': (255, 100, 255),     # Main orb
+    'core': (255, 200, 255),    # Inner core
+    'spark': (255, 255, 255)    # Energy spark
+}
+
+def draw_life_icon(screen, x, y, scale, art):
+    """Draw a mini spaceship life icon with its top-left corner at (x, y)."""
+    def point(dx, dy):
+        return (x + dx * scale, y + dy * scale)
+    
+    pygame.draw.polygon(screen, art['hull'], [
+        point(8, 0),    # Nose
+        point(2, 8),    # Left wing
+        point(14, 8)    # Right wing
+    ])
+    # Mini engines
+    pygame.draw.circle(screen, art['engine'], point(5, 10), 1)
+    pygame.draw.circle(screen, art['engine'], point(11, 10), 1)
+
+def draw_bomb_icon(screen, x, y, scale, art):
+    """Draw an energy bomb (glowing orb) icon centered on (x, y)."""
+    for color, radius in ((art['glow'], 10), (art['orb'], 8), (art['core'], 4), (art['spark'], 2)):
+        pygame.draw.circle(screen, color, (x, y), max(1, int(radius * scale)))
+
+sprite_atlas.register('ui_life', (0, 0, 16, 12),
+                      partial(draw_life_icon, art=LIFE_ICON_ART), LIFE_ICON_ART)
+sprite_atlas.register('ui_bomb', (-11, -11, 11, 11),
+                      partial(draw_bomb_icon, art=BOMB_ICON_ART), BOMB_ICON_ART)
 
 class UI:
     """User interface class for displaying game information."""
@@ -64,17 +99,7 @@ class UI:
         
         # Draw mini spaceships for lives (smaller icons)
         for i in range(lives):
-            life_x = ui_x + i * 25
-            life_y = y_offset
-            # Draw mini spaceship for each life (smaller)
-            pygame.draw.polygon(screen, (100, 200, 255), [
-                (life_x + 8, life_y),       # Nose
-                (life_x + 2, life_y + 8),   # Left wing
-                (life_x + 14, life_y + 8)   # Right wing
-            ])
-            # Mini engines
-            pygame.draw.circle(screen, (50, 150, 255), (life_x + 5, life_y + 10), 1)
-            pygame.draw.circle(screen, (50, 150, 255), (life_x + 11, life_y + 10), 1)
+            sprite_atlas.blit(screen, 'ui_life', ui_x + i * 25, y_offset)
         
         y_offset += 50
         
@@ -91,18 +116,7 @@ class UI:
         
         # Draw energy bomb icons (smaller)
         for i in range(min(special_attacks, 2)):  # Show max 2 icons
-            icon_x = ui_x + i * 30
-            icon_y = y_offset
-            
-            # Draw energy bomb (glowing orb) - smaller
-            # Outer glow
-            pygame.draw.circle(screen, (100, 50, 150), (icon_x + 8, icon_y + 8), 10)
-            # Main orb
-            pygame.draw.circle(screen, (255, 100, 255), (icon_x + 8, icon_y + 8), 8)
-            # Inner core
-            pygame.draw.circle(screen, (255, 200, 255), (icon_x + 8, icon_y + 8), 4)
-            # Energy spark
-            pygame.draw.circle(screen, (255, 255, 255), (icon_x + 8, icon_y + 8), 2)
+            sprite_atlas.blit(screen, 'ui_bomb', ui_x + i * 30 + 8, y_offset + 8)
         
         y_offset += 60
         